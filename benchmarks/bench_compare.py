@@ -0,0 +1,170 @@
+"""Benchmark comparisons and hashing of Date, Time and Duration.
+
+Sorts, builds sets and fills dicts with the current classes, and with
+subclasses that compare and hash the way the classes did before: Date
+through a three-way _cmp() of the ordinals, Time and Duration by
+building tuples of their stored fields.
+
+Run with:
+
+    python benchmarks/bench_compare.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tider import Date, Duration, Time
+
+N = 200000
+
+
+def _cmp(x, y):
+    return 0 if x == y else 1 if x > y else -1
+
+
+class LegacyDate(Date):
+    __slots__ = ()
+
+    def _cmp(self, other):
+        return _cmp(self._ordinal, other._ordinal)
+
+    def __eq__(self, other):
+        if isinstance(other, Date):
+            return self._cmp(other) == 0
+        return False
+
+    def __lt__(self, other):
+        if isinstance(other, Date):
+            return self._cmp(other) < 0
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._ordinal)
+
+
+class LegacyTime(Time):
+    # The fields are stored, and the hash cached, like Time did.
+    __slots__ = '_hour', '_minute', '_second', '_microsecond', '_hash'
+
+    def __new__(cls, hour=0, minute=0, second=0, microsecond=0):
+        self = Time.__new__(cls, hour, minute, second, microsecond)
+        self._hour = hour
+        self._minute = minute
+        self._second = second
+        self._microsecond = microsecond
+        self._hash = -1
+        return self
+
+    def _cmp(self, other):
+        return _cmp((self._hour, self._minute, self._second,
+                     self._microsecond),
+                    (other._hour, other._minute, other._second,
+                     other._microsecond))
+
+    def __eq__(self, other):
+        if isinstance(other, Time):
+            return self._cmp(other) == 0
+        return False
+
+    def __lt__(self, other):
+        if isinstance(other, Time):
+            return self._cmp(other) < 0
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash == -1:
+            us2, us3 = divmod(self._microsecond, 256)
+            us1, us2 = divmod(us2, 256)
+            self._hash = hash(bytes([self._hour, self._minute,
+                                     self._second, us1, us2, us3]))
+        return self._hash
+
+
+class LegacyDuration(Duration):
+    # The fields are stored, and the hash cached, like Duration did.
+    __slots__ = '_days', '_seconds', '_microseconds', '_hash'
+
+    def __new__(cls, days=0, seconds=0, microseconds=0):
+        self = Duration.__new__(cls, days, seconds, microseconds)
+        self._days = self.days
+        self._seconds = self.seconds
+        self._microseconds = self.microseconds
+        self._hash = -1
+        return self
+
+    def _getstate(self):
+        return (self._days, self._seconds, self._microseconds)
+
+    def __eq__(self, other):
+        if isinstance(other, Duration):
+            return _cmp(self._getstate(), other._getstate()) == 0
+        return False
+
+    def __lt__(self, other):
+        if isinstance(other, Duration):
+            return _cmp(self._getstate(), other._getstate()) < 0
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash == -1:
+            self._hash = hash(self._getstate())
+        return self._hash
+
+
+def _timeit(func, make):
+    best = None
+    for i in range(5):
+        # Fresh objects for every run, so no hashes are cached already.
+        values = make()
+        start = time.perf_counter()
+        func(values)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _dict(values):
+    d = {}
+    for value in values:
+        d[value] = value
+    for value in values:
+        d[value]
+
+
+WORKLOADS = [('sort', sorted), ('set', set), ('dict', _dict)]
+
+
+def main():
+    rnd = random.Random(42)
+    # The dates repeat, so the set and dict have to compare them for
+    # equality as well as hash them.
+    ordinals = [rnd.randrange(730000, 740000) for i in range(N)]
+    times = [(rnd.randrange(24), rnd.randrange(60), rnd.randrange(60),
+              rnd.randrange(0, 1000000, 1000)) for i in range(N)]
+    durations = [(rnd.randrange(-1000, 1000), rnd.randrange(86400),
+                  rnd.randrange(0, 1000000, 1000)) for i in range(N)]
+
+    classes = [
+        ('Date', lambda: [Date.fromordinal(n) for n in ordinals],
+         lambda: [LegacyDate(*Date.fromordinal(n)._getstate())
+                  for n in ordinals]),
+        ('Time', lambda: [Time(*args) for args in times],
+         lambda: [LegacyTime(*args) for args in times]),
+        ('Duration', lambda: [Duration(*args) for args in durations],
+         lambda: [LegacyDuration(*args) for args in durations]),
+    ]
+    print("%d values" % N)
+    for name, make, make_legacy in classes:
+        for workload, func in WORKLOADS:
+            old_time = _timeit(func, make_legacy)
+            new_time = _timeit(func, make)
+            print("%-8s %-4s: legacy %.3fs, current %.3fs, %.2fx faster" % (
+                name, workload, old_time, new_time, old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
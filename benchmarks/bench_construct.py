@@ -0,0 +1,181 @@
+"""Benchmark constructing the results of Duration, Date and Time operations.
+
+Compares the operators, which build their results with the trusted
+internal constructors, with the previous implementations, which read the
+stored fields and built the results through the public constructors,
+checking and normalizing the fields again.
+
+Run with:
+
+    python benchmarks/bench_construct.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tider import Date, Duration, Time
+from tider._utils import _check_date_fields
+from tider.time import _check_time_fields
+
+N = 200000
+
+
+# The previous implementations, kept here as the baseline.  Duration and
+# Time stored their fields, and built every result through the public
+# constructor, which checked and normalized the fields again.
+
+class LegacyDuration(object):
+    __slots__ = '_days', '_seconds', '_microseconds', '_us', '_hashcode'
+
+    def __new__(cls, days=0, seconds=0, microseconds=0,
+                milliseconds=0, minutes=0, hours=0, weeks=0):
+        # The int arguments path of the old Duration.__new__.
+        days += weeks*7
+        seconds += minutes*60 + hours*3600
+        microseconds += milliseconds*1000
+        if not isinstance(days, int):
+            raise ValueError('The "days" argument must be int or float.')
+        d = days
+        secondsfrac = 0.0
+        if not isinstance(seconds, int):
+            raise ValueError('The "seconds" argument must be int or float.')
+        days, seconds = divmod(seconds, 86400)
+        d += days
+        s = seconds
+        us = secondsfrac * 1e6
+        if not isinstance(microseconds, int):
+            raise ValueError(
+                'The "microseconds" argument must be int or float.')
+        seconds, microseconds = divmod(microseconds, 1000000)
+        days, seconds = divmod(seconds, 86400)
+        d += days
+        s += seconds
+        microseconds = round(microseconds + us)
+        seconds, us = divmod(microseconds, 1000000)
+        s += int(seconds)
+        days, s = divmod(s, 86400)
+        d += days
+        assert isinstance(d, int)
+        assert isinstance(s, int) and 0 <= s < 86400
+        assert isinstance(us, int) and 0 <= us < 1000000
+        self = object.__new__(cls)
+        self._days = d
+        self._seconds = s
+        self._microseconds = us
+        self._us = (d * 86400 + s) * 1000000 + us
+        self._hashcode = -1
+        return self
+
+    def __add__(self, other):
+        return LegacyDuration(self._days + other._days,
+                              self._seconds + other._seconds,
+                              self._microseconds + other._microseconds)
+
+    def __neg__(self):
+        return LegacyDuration(-self._days, -self._seconds,
+                              -self._microseconds)
+
+    def __mul__(self, other):
+        return LegacyDuration(self._days * other, self._seconds * other,
+                              self._microseconds * other)
+
+    def __floordiv__(self, other):
+        return LegacyDuration(0, 0, self._us // other)
+
+
+class LegacyTime(object):
+    __slots__ = ('_hour', '_minute', '_second', '_microsecond', '_us',
+                 '_hashcode')
+
+    def __new__(cls, hour=0, minute=0, second=0, microsecond=0):
+        hour, minute, second, microsecond = _check_time_fields(
+            hour, minute, second, microsecond)
+        self = object.__new__(cls)
+        self._hour = hour
+        self._minute = minute
+        self._second = second
+        self._microsecond = microsecond
+        self._us = (((hour * 60 + minute) * 60 + second) * 1000000 +
+                    microsecond)
+        self._hashcode = -1
+        return self
+
+    @property
+    def hour(self):
+        return self._hour
+
+    @property
+    def minute(self):
+        return self._minute
+
+    @property
+    def second(self):
+        return self._second
+
+    @property
+    def microsecond(self):
+        return self._microsecond
+
+    def replace(self, hour=None, minute=None, second=None, microsecond=None):
+        if hour is None:
+            hour = self.hour
+        if minute is None:
+            minute = self.minute
+        if second is None:
+            second = self.second
+        if microsecond is None:
+            microsecond = self.microsecond
+        return LegacyTime(hour, minute, second, microsecond)
+
+
+def date_replace_legacy(self, year=None, month=None, day=None):
+    # Date is unchanged apart from replace(), which checked the fields
+    # and then went through __init__, which checked them again.
+    y, m, d = self._getymd()
+    if year is None:
+        year = y
+    if month is None:
+        month = m
+    if day is None:
+        day = d
+    _check_date_fields(year, month, day)
+    return self.__class__(year, month, day)
+
+
+d1 = Duration(3, 7200, 500)
+d2 = Duration(-1, 60, 999999)
+legacy_d1 = LegacyDuration(3, 7200, 500)
+legacy_d2 = LegacyDuration(-1, 60, 999999)
+date = Date(2016, 2, 29)
+time = Time(12, 30, 15, 5000)
+legacy_time = LegacyTime(12, 30, 15, 5000)
+
+
+CASES = [
+    ('Duration + Duration', 'legacy_d1 + legacy_d2', 'd1 + d2'),
+    ('-Duration', '-legacy_d1', '-d1'),
+    ('Duration * int', 'legacy_d1 * 3', 'd1 * 3'),
+    ('Duration // int', 'legacy_d1 // 7', 'd1 // 7'),
+    ('Date.replace', 'date_replace_legacy(date, day=1)',
+     'date.replace(day=1)'),
+    ('Time.replace', 'legacy_time.replace(minute=1)',
+     'time.replace(minute=1)'),
+]
+
+
+def main():
+    print("%d operations" % N)
+    for name, old, new in CASES:
+        old_time = min(timeit.repeat(old, globals=globals(), number=N,
+                                     repeat=5))
+        new_time = min(timeit.repeat(new, globals=globals(), number=N,
+                                     repeat=5))
+        print("%-20s: legacy %.0fns, current %.0fns, %.2fx faster" % (
+            name, old_time / N * 1e9, new_time / N * 1e9,
+            old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark Datetime.now() and Datetime.fromtimestamp().
+
+Compares the integer implementations, driven by time.time_ns(), with
+going through a float timestamp and time.localtime(), like Date.today()
+does.
+
+Run with:
+
+    python benchmarks/bench_now.py
+"""
+import os
+import sys
+import time
+import timeit
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tider import Datetime
+
+N = 100000
+
+timestamps = array('q', range(1600000000, 1600000000 + 86400 * 100, 86))
+
+
+# The float and struct_time path, kept here as the baseline.
+
+def fromtimestamp_struct(t):
+    tm = time.localtime(t)
+    return Datetime(tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour,
+                    tm.tm_min, tm.tm_sec, round(t % 1 * 1e6) % 1000000)
+
+
+def now_struct():
+    return fromtimestamp_struct(time.time())
+
+
+CASES = [
+    ('now()', 'now_struct()', 'Datetime.now()'),
+    ('fromtimestamp()', 'fromtimestamp_struct(1600000000.5)',
+     'Datetime.fromtimestamp(1600000000.5)'),
+    ('fromtimestamps()', '[fromtimestamp_struct(t) for t in timestamps]',
+     'Datetime.fromtimestamps(timestamps)'),
+]
+
+
+def main():
+    print("%d calls, fromtimestamps() with %d timestamps" % (
+        N, len(timestamps)))
+    for name, old, new in CASES:
+        number = N if name != 'fromtimestamps()' else 10
+        old_time = min(timeit.repeat(old, globals=globals(), number=number,
+                                     repeat=3))
+        new_time = min(timeit.repeat(new, globals=globals(), number=number,
+                                     repeat=3))
+        print("%-20s: struct_time %.0fns, integer %.0fns, %.2fx faster" % (
+            name, old_time / number * 1e9, new_time / number * 1e9,
+            old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the ordinal <-> (year, month, day) conversions.
+
+Compares the conversions in tider._utils with the divmod based
+implementation they replaced, over the whole supported range of ordinals.
+
+Run with:
+
+    python benchmarks/bench_ordinal.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tider._utils import _ymd2ord, _ord2ymd, _MAXORDINAL
+from tider._utils import _DAYS_IN_MONTH, _DAYS_BEFORE_MONTH
+from tider._utils import _DI400Y, _DI100Y, _DI4Y
+from tider._utils import _is_leap, _days_before_year, _days_in_month
+from tider._utils import _days_before_month
+
+
+# The previous implementations, kept here as the baseline.
+
+def _ymd2ord_divmod(year, month, day):
+    assert 1 <= month <= 12, 'month must be in 1..12'
+    dim = _days_in_month(year, month)
+    assert 1 <= day <= dim, ('day must be in 1..%d' % dim)
+    return (_days_before_year(year) +
+            _days_before_month(year, month) +
+            day)
+
+
+def _ord2ymd_divmod(n):
+    n -= 1
+    n400, n = divmod(n, _DI400Y)
+    year = n400 * 400 + 1
+    n100, n = divmod(n, _DI100Y)
+    n4, n = divmod(n, _DI4Y)
+    n1, n = divmod(n, 365)
+    year += n100 * 100 + n4 * 4 + n1
+    if n1 == 4 or n100 == 4:
+        assert n == 0
+        return year-1, 12, 31
+    leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
+    assert leapyear == _is_leap(year)
+    month = (n + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month] + (month > 2 and leapyear)
+    if preceding > n:
+        month -= 1
+        preceding -= _DAYS_IN_MONTH[month] + (month == 2 and leapyear)
+    n -= preceding
+    assert 0 <= n < _days_in_month(year, month)
+    return year, month, n+1
+
+
+def _timeit(func, args):
+    start = time.perf_counter()
+    for arg in args:
+        func(*arg)
+    return time.perf_counter() - start
+
+
+def main():
+    ordinals = [(n,) for n in range(1, _MAXORDINAL + 1)]
+    dates = [_ord2ymd(n) for n in range(1, _MAXORDINAL + 1)]
+    _ymd2ord(1, 1, 1)  # Build the lookup table outside of the timing.
+
+    print("%d ordinals (the full range)" % _MAXORDINAL)
+    for name, old, new, args in (
+            ("_ord2ymd", _ord2ymd_divmod, _ord2ymd, ordinals),
+            ("_ymd2ord", _ymd2ord_divmod, _ymd2ord, dates)):
+        old_time = min(_timeit(old, args) for i in range(3))
+        new_time = min(_timeit(new, args) for i in range(3))
+        print("%s: old %.3fs (%.0f ns/call), new %.3fs (%.0f ns/call),"
+              " %.2fx faster" % (name,
+                                 old_time, old_time * 1e9 / _MAXORDINAL,
+                                 new_time, new_time * 1e9 / _MAXORDINAL,
+                                 old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark offset lookups in timezones given by POSIX TZ strings.
+
+Compares PosixTimezone, which works out the transitions once for each
+year, with the previous implementation, which worked out the year's
+transitions again for every lookup.
+
+Run with:
+
+    python benchmarks/bench_posix.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tider import PosixTimezone
+from tider._tzif import _parse_posix_tz
+from tider._utils import _ymd2ord, _days_in_month, _EPOCH_ORDINAL
+from tider.timezone import _year
+
+N = 200000
+
+TZSTRINGS = ['EST5EDT,M3.2.0,M11.1.0', 'AEST-10AEDT,M10.1.0,M4.1.0/3']
+
+# An instant in the summer of 2030.
+SECONDS = (_ymd2ord(2030, 7, 1) - _EPOCH_ORDINAL) * 86400
+
+
+# The previous implementation, kept here as the baseline.
+
+def rule_ordinal_loop(rule, year):
+    kind, a, b, c, seconds = rule
+    jan1 = _ymd2ord(year, 1, 1)
+    if kind == 'N':
+        return jan1 + a
+    if kind == 'J':
+        return jan1 + a - 1 + (a >= 60 and _days_in_month(year, 2) == 29)
+    first = _ymd2ord(year, a, 1)
+    day = first + (c - first % 7) % 7 + (b - 1) * 7
+    last = first + _days_in_month(year, a) - 1
+    while day > last:
+        day -= 7
+    return day
+
+
+def find_utc_naive(rule, seconds):
+    std, dst, start, end = rule
+    year = _year(seconds + std)
+    start = ((rule_ordinal_loop(start, year) - _EPOCH_ORDINAL) * 86400 +
+             start[4] - std)
+    end = ((rule_ordinal_loop(end, year) - _EPOCH_ORDINAL) * 86400 +
+           end[4] - dst)
+    if start < end:
+        return start <= seconds < end
+    return not end <= seconds < start
+
+
+def main():
+    print("%d lookups" % N)
+    for tzstring in TZSTRINGS:
+        _, std, _, dst, start, end = _parse_posix_tz(tzstring)
+        rule = (std, dst, start, end)
+        tz = PosixTimezone(tzstring)
+        env = dict(globals(), rule=rule, tz=tz)
+        old_time = min(timeit.repeat('find_utc_naive(rule, SECONDS)',
+                                     globals=env, number=N, repeat=3))
+        new_time = min(timeit.repeat('tz._find_utc(SECONDS)',
+                                     globals=env, number=N, repeat=3))
+        print("%-30s: per lookup %.0fns, memoized %.0fns, %.2fx faster" % (
+            tzstring, old_time / N * 1e9, new_time / N * 1e9,
+            old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -28,5 +28,8 @@ setup(
     author_email='regebro@gmail.com',
     url="https://github.com/regebro/tider/",
     license='MIT',
+    extras_require={
+        'numpy': ['numpy'],
+    },
     test_suite='tests'
 )
@@ -7,6 +7,13 @@ requires_IEEE_754 = unittest.skipUnless(
     float.__getformat__("double").startswith("IEEE"),
     "test requires IEEE 754 doubles")
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+requires_numpy = unittest.skipIf(numpy is None, "test requires numpy")
+
 
 # Common variables
 pickle_choices = [(pickle, pickle, proto)
@@ -50,3 +57,24 @@ class HarmlessMixedComparison:
         self.assertRaises(TypeError, lambda: () <= me)
         self.assertRaises(TypeError, lambda: () > me)
         self.assertRaises(TypeError, lambda: () >= me)
+
+    def test_reflected_comparison(self):
+        # Comparisons with other types return NotImplemented, so the other
+        # operand's reflected methods get their turn.
+        me = self.theclass(1, 1, 1)
+        for name in ('__eq__', '__ne__', '__lt__', '__le__', '__gt__',
+                     '__ge__'):
+            self.assertIs(getattr(me, name)(()), NotImplemented)
+
+        class Other:
+            def __eq__(self, other):
+                return 'eq'
+            __ne__ = __lt__ = __le__ = __gt__ = __ge__ = __eq__
+
+        other = Other()
+        self.assertEqual(me == other, 'eq')
+        self.assertEqual(me != other, 'eq')
+        self.assertEqual(me < other, 'eq')
+        self.assertEqual(me <= other, 'eq')
+        self.assertEqual(me > other, 'eq')
+        self.assertEqual(me >= other, 'eq')
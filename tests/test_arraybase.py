@@ -0,0 +1,54 @@
+import unittest
+import tests
+
+from tider._arraybase import _ArraySequence
+
+if tests.numpy is not None:
+    import numpy as np
+
+
+class IntArray(_ArraySequence):
+    # The elements of an IntArray are the strings of its values.
+    __slots__ = '_ints',
+
+    def __init__(self, ints):
+        self._ints = np.asarray(ints, dtype=np.int64)
+
+    _values = '_ints'
+    _item = str
+    _from_values_unchecked = classmethod(lambda cls, ints: cls(ints))
+
+
+@tests.requires_numpy
+class TestArraySequence(unittest.TestCase):
+
+    def setUp(self):
+        self.array = IntArray([4, -1, 7, 0, 2])
+        self.items = ['4', '-1', '7', '0', '2']
+
+    def test_sequence(self):
+        self.assertEqual(len(self.array), 5)
+        self.assertEqual(list(self.array), self.items)
+        self.assertEqual(self.array[1], '-1')
+        self.assertEqual(self.array[-1], '2')
+        self.assertEqual(self.array[np.int64(2)], '7')
+        self.assertEqual(list(self.array[1:3]), self.items[1:3])
+        self.assertEqual(len(IntArray([])), 0)
+        self.assertEqual(list(IntArray([])), [])
+
+    def test_indexing(self):
+        # Slices, boolean masks and arrays of indexes give a new array.
+        mask = self.array._ints > 1
+        filtered = self.array[mask]
+        self.assertIsInstance(filtered, IntArray)
+        self.assertEqual(list(filtered), ['4', '7', '2'])
+        self.assertEqual(list(self.array[mask.tolist()]), list(filtered))
+        self.assertEqual(list(self.array[~mask]), ['-1', '0'])
+        self.assertEqual(list(self.array[[3, 0, 3]]), ['0', '4', '0'])
+        self.assertEqual(list(self.array[np.array([-1, 1])]), ['2', '-1'])
+        self.assertEqual(len(self.array[[]]), 0)
+        self.assertEqual(list(self.array[...]), self.items)
+        self.assertRaises(IndexError, lambda: self.array[5])
+        self.assertRaises(IndexError, lambda: self.array[[True, False]])
+        self.assertRaises(IndexError, lambda: self.array[None])
+        self.assertRaises(IndexError, lambda: self.array[[[0, 1]]])
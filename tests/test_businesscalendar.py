@@ -0,0 +1,173 @@
+import unittest
+import tests
+
+from tider import BusinessCalendar, Date, DateRange, Duration
+
+if tests.numpy is not None:
+    import numpy as np
+
+# 1970-01-01, the epoch of numpy.datetime64
+EPOCH = 719163
+
+HOLIDAYS = [Date(2016, 1, 1), Date(2016, 3, 25), Date(2016, 3, 28),
+            Date(2016, 5, 2), Date(2016, 5, 30), Date(2016, 8, 29),
+            Date(2016, 12, 26), Date(2016, 12, 27), Date(2016, 4, 30)]
+ROLLS = ('forward', 'following', 'backward', 'preceding',
+         'modifiedfollowing', 'modifiedpreceding')
+
+
+class TestBusinessCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.calendar = BusinessCalendar(holidays=HOLIDAYS,
+                                         start=Date(2015, 12, 1),
+                                         end=Date(2017, 1, 31))
+
+    def test_is_busday(self):
+        cal = self.calendar
+        self.assertTrue(cal.is_busday(Date(2016, 3, 24)))
+        self.assertFalse(cal.is_busday(Date(2016, 3, 25)))  # Holiday
+        self.assertFalse(cal.is_busday(Date(2016, 3, 26)))  # Saturday
+        self.assertFalse(cal.is_busday(Date(2016, 3, 27)))  # Sunday
+        self.assertFalse(cal.is_busday(Date(2016, 3, 28)))  # Holiday
+        self.assertTrue(cal.is_busday(Date(2016, 3, 29)))
+        self.assertTrue(cal.is_busday(Date(2017, 1, 31)))
+        self.assertRaises(ValueError, cal.is_busday, Date(2017, 2, 1))
+        self.assertRaises(ValueError, cal.is_busday, Date(2015, 11, 30))
+        self.assertRaises(TypeError, cal.is_busday, 736047)
+
+    def test_busday_count(self):
+        cal = self.calendar
+        self.assertEqual(cal.busday_count(Date(2016, 3, 21),
+                                          Date(2016, 4, 4)), 8)
+        self.assertEqual(cal.busday_count(Date(2016, 4, 4),
+                                          Date(2016, 3, 21)), -8)
+        self.assertEqual(cal.busday_count(Date(2016, 3, 21),
+                                          Date(2016, 3, 21)), 0)
+        self.assertEqual(cal.busday_count(Date(2017, 1, 2),
+                                          Date(2017, 2, 1)), 22)
+        self.assertRaises(ValueError, cal.busday_count, Date(2017, 1, 2),
+                          Date(2017, 2, 2))
+
+    def test_busday_offset(self):
+        cal = self.calendar
+        self.assertEqual(cal.busday_offset(Date(2016, 3, 24), 1),
+                         Date(2016, 3, 29))
+        self.assertEqual(cal.busday_offset(Date(2016, 3, 29), -1),
+                         Date(2016, 3, 24))
+        self.assertEqual(cal.busday_offset(Date(2016, 3, 24), 0),
+                         Date(2016, 3, 24))
+        self.assertRaises(ValueError, cal.busday_offset, Date(2016, 3, 25), 1)
+        self.assertEqual(cal.busday_offset(Date(2016, 3, 25), 0, 'forward'),
+                         Date(2016, 3, 29))
+        self.assertEqual(cal.busday_offset(Date(2016, 3, 25), 0, 'backward'),
+                         Date(2016, 3, 24))
+        # April 30th and May 1st are weekend days, and May 2nd a holiday.
+        self.assertEqual(cal.busday_offset(Date(2016, 4, 30), 0,
+                                           'modifiedfollowing'),
+                         Date(2016, 4, 29))
+        self.assertEqual(cal.busday_offset(Date(2016, 5, 1), 0,
+                                           'modifiedpreceding'),
+                         Date(2016, 5, 3))
+        self.assertRaises(ValueError, cal.busday_offset, Date(2017, 1, 31), 1)
+        self.assertRaises(ValueError, cal.busday_offset, Date(2016, 3, 24), 1,
+                          'sideways')
+        self.assertRaises(TypeError, cal.busday_offset, Date(2016, 3, 24),
+                          1.0)
+
+    def test_weekmask(self):
+        cal = BusinessCalendar('0111110', start=Date(2016, 1, 1),
+                               end=Date(2016, 1, 31))
+        self.assertEqual(cal.weekmask, (False, True, True, True, True, True,
+                                        False))
+        self.assertFalse(cal.is_busday(Date(2016, 1, 4)))  # Monday
+        self.assertTrue(cal.is_busday(Date(2016, 1, 9)))  # Saturday
+        cal = BusinessCalendar([1, 1, 1, 1, 0, 0, 0], start=Date(2016, 1, 1),
+                               end=Date(2016, 1, 31))
+        self.assertFalse(cal.is_busday(Date(2016, 1, 8)))  # Friday
+        for bad in '111110', '11111a0', [1, 1]:
+            self.assertRaises(ValueError, BusinessCalendar, bad)
+
+    def test_no_business_days(self):
+        cal = BusinessCalendar('0000000', start=Date(2016, 1, 1),
+                               end=Date(2016, 1, 31))
+        self.assertEqual(cal.busday_count(Date(2016, 1, 1),
+                                          Date(2016, 2, 1)), 0)
+        for roll in ROLLS:
+            self.assertRaises(ValueError, cal.busday_offset,
+                              Date(2016, 1, 1), 0, roll)
+
+    def test_attributes(self):
+        self.assertEqual(self.calendar.start, Date(2015, 12, 1))
+        self.assertEqual(self.calendar.end, Date(2017, 1, 31))
+        self.assertEqual(self.calendar.holidays, tuple(sorted(HOLIDAYS)))
+        # holidays may be any iterable, including a generator.
+        calendar = BusinessCalendar(holidays=(d for d in HOLIDAYS),
+                                    start=self.calendar.start,
+                                    end=self.calendar.end)
+        self.assertEqual(calendar.holidays, self.calendar.holidays)
+        default = BusinessCalendar()
+        self.assertEqual(default.start, Date(1900, 1, 1))
+        self.assertEqual(default.end, Date(2100, 12, 31))
+        self.assertRaises(ValueError, BusinessCalendar, start=Date(2000, 1, 2),
+                          end=Date(2000, 1, 1))
+        self.assertRaises(TypeError, BusinessCalendar, holidays=[1])
+
+    @tests.requires_numpy
+    def test_compare_to_numpy(self):
+        cal = self.calendar
+        holidays = np.array([d.toordinal() - EPOCH for d in HOLIDAYS],
+                            dtype='datetime64[D]')
+        days = DateRange(Date(2016, 1, 1), Date(2016, 12, 31))
+        for d in days:
+            np_day = np.datetime64(d.toordinal() - EPOCH, 'D')
+            self.assertEqual(cal.is_busday(d),
+                             np.is_busday(np_day, holidays=holidays))
+            self.assertEqual(cal.busday_count(Date(2016, 6, 15), d),
+                             np.busday_count(np.datetime64('2016-06-15'),
+                                             np_day, holidays=holidays))
+            for roll in ROLLS:
+                for offset in -3, 0, 4:
+                    expected = np.busday_offset(np_day, offset, roll,
+                                                holidays=holidays)
+                    self.assertEqual(
+                        cal.busday_offset(d, offset, roll).toordinal(),
+                        int(expected.astype(int)) + EPOCH, (d, roll, offset))
+
+    @tests.requires_numpy
+    def test_vectorized(self):
+        cal = self.calendar
+        dates = list(DateRange(Date(2016, 1, 1), Date(2016, 12, 31)))
+        ordinals = np.array([d.toordinal() for d in dates])
+        self.assertEqual(cal.is_busday_ordinals(ordinals).tolist(),
+                         [cal.is_busday(d) for d in dates])
+        end = Date(2016, 6, 15)
+        self.assertEqual(cal.busday_count_ordinals(ordinals,
+                                                   end.toordinal()).tolist(),
+                         [cal.busday_count(d, end) for d in dates])
+        self.assertEqual(cal.busday_count_ordinals(end.toordinal(),
+                                                   ordinals).tolist(),
+                         [cal.busday_count(end, d) for d in dates])
+        for roll in ROLLS:
+            for offset in -3, 0, 4:
+                self.assertEqual(
+                    cal.busday_offset_ordinals(ordinals, offset,
+                                               roll).tolist(),
+                    [cal.busday_offset(d, offset, roll).toordinal()
+                     for d in dates])
+        self.assertRaises(ValueError, cal.busday_offset_ordinals, ordinals, 0)
+        busdays = ordinals[cal.is_busday_ordinals(ordinals)]
+        offsets = np.arange(len(busdays)) % 5
+        self.assertEqual(cal.busday_offset_ordinals(busdays, offsets).tolist(),
+                         [cal.busday_offset(Date.fromordinal(int(n)),
+                                            int(o)).toordinal()
+                          for n, o in zip(busdays, offsets)])
+        self.assertRaises(ValueError, cal.is_busday_ordinals,
+                          [Date(2017, 2, 1).toordinal()])
+
+    @tests.requires_numpy
+    def test_datearray(self):
+        from tider import DateArray
+        dates = DateRange(Date(2016, 3, 20), Date(2016, 4, 5)).todatearray()
+        self.assertEqual(self.calendar.is_busday_ordinals(dates).tolist(),
+                         [self.calendar.is_busday(d) for d in dates])
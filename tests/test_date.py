@@ -1,11 +1,14 @@
+import datetime
+import os
 import pickle
 import tests
 import time
 import unittest
 
-from tider import Duration, Datetime
-from tider._utils import _ymd2ord, _ord2ymd, MINYEAR, MAXYEAR
+from tider import Duration, Datetime, parse_dates
+from tider._utils import _ymd2ord, _ord2ymd, MINYEAR, MAXYEAR, _MAXORDINAL
 
+from tider import date as date_module
 from tider.date import BaseDate
 
 pickle_choices = [(pickle, pickle, proto)
@@ -21,6 +24,33 @@ class SubclassDate(BaseDate):
 OTHERSTUFF = (10, 34.5, "abc", {}, [], ())
 
 
+class TestOrdinalConversions(unittest.TestCase):
+
+    def check(self, n):
+        d = datetime.date.fromordinal(n)
+        ymd = d.year, d.month, d.day
+        self.assertEqual(_ord2ymd(n), ymd)
+        self.assertEqual(_ymd2ord(*ymd), n)
+
+    def test_limits(self):
+        self.check(1)
+        self.check(_MAXORDINAL)
+
+    def test_every_day_of_a_400_year_cycle(self):
+        for n in range(datetime.date(1601, 1, 1).toordinal(),
+                       datetime.date(2001, 1, 1).toordinal()):
+            self.check(n)
+
+    def test_year_boundaries(self):
+        for year in range(MINYEAR + 1, MAXYEAR + 1):
+            n = datetime.date(year, 1, 1).toordinal()
+            self.check(n - 1)
+            self.check(n)
+            # The days around the leap day.
+            self.check(n + 58)
+            self.check(n + 59)
+
+
 class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
     # Tests here should pass for both dates and datetimes, except for a
     # few tests that TestDateTime overrides.
@@ -94,6 +124,24 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
                     self.assertEqual(d, self.theclass.fromordinal(n))
                     n += 1
 
+    def test_fromordinal_bounds(self):
+        self.theclass.fromordinal(1)  # no exception
+        self.theclass.fromordinal(3652059)  # no exception
+        self.assertRaises(ValueError, self.theclass.fromordinal, 0)
+        self.assertRaises(ValueError, self.theclass.fromordinal, 3652060)
+        self.assertRaises(TypeError, self.theclass.fromordinal, 1.0)
+
+    def test_fields_from_ordinal(self):
+        # Dates made from ordinals calculate their fields on demand.
+        d = self.theclass.fromordinal(730120)
+        self.assertEqual((d.year, d.month, d.day), (2000, 1, 1))
+        d = self.theclass(2000, 2, 28) + Duration(1)
+        self.assertEqual((d.year, d.month, d.day), (2000, 2, 29))
+        self.assertEqual(d.isoformat(), "2000-02-29")
+        d = self.theclass(2000, 3, 1) - Duration(1)
+        self.assertEqual(d, self.theclass(2000, 2, 29))
+        self.assertRaises(OverflowError, lambda: d - Duration(730179))
+
     def test_bad_constructor_arguments(self):
         # bad years
         self.theclass(MINYEAR, 1, 1)  # no exception
@@ -200,6 +248,68 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
         self.assertEqual(d.month, month)
         self.assertEqual(d.day, day)
 
+    def test_utcfromtimestamp(self):
+        for ts, args in [(0, (1970, 1, 1)), (-1, (1969, 12, 31)),
+                         (-0.5, (1969, 12, 31)), (86399.999, (1970, 1, 1)),
+                         (86400, (1970, 1, 2)), (951782400, (2000, 2, 29)),
+                         (-62135596800, (1, 1, 1)),
+                         (253402300799, (9999, 12, 31))]:
+            self.assertEqual(self.theclass.utcfromtimestamp(ts),
+                             self.theclass(*args))
+        for ts in -62135596801, 253402300800:
+            self.assertRaises(OverflowError,
+                              self.theclass.utcfromtimestamp, ts)
+
+    def test_fromtimestamp_timezones(self):
+        old_tz = os.environ.get('TZ')
+        try:
+            for tz in ['UTC', 'America/New_York', 'Australia/Lord_Howe',
+                       'Asia/Kathmandu', 'Pacific/Apia']:
+                os.environ['TZ'] = tz
+                time.tzset()
+                # Every 28 minutes and 53 seconds over two years.
+                for ts in range(1293840000, 1356998400, 1733):
+                    expected = time.localtime(ts)[:3]
+                    d = self.theclass.fromtimestamp(ts)
+                    self.assertEqual((d.year, d.month, d.day), expected)
+        finally:
+            if old_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = old_tz
+            time.tzset()
+
+    def test_fromtimestamp_same_tznames(self):
+        # Europe/Berlin and Europe/Paris are both ('CET', 'CEST'), but
+        # Paris was on CET in the summer of 1977.
+        old_tz = os.environ.get('TZ')
+        try:
+            for tz in ['Europe/Berlin', 'Europe/Paris', 'Europe/Berlin']:
+                os.environ['TZ'] = tz
+                time.tzset()
+                for ts in range(236600000, 236700000, 1800):
+                    d = self.theclass.fromtimestamp(ts)
+                    self.assertEqual((d.year, d.month, d.day),
+                                     time.localtime(ts)[:3])
+        finally:
+            if old_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = old_tz
+            time.tzset()
+
+    def test_fromtimestamps(self):
+        timestamps = [0, 951782400, 1e9, -86400 * 365]
+        self.assertEqual(self.theclass.fromtimestamps(timestamps),
+                         [self.theclass.fromtimestamp(ts)
+                          for ts in timestamps])
+        self.assertEqual(self.theclass.fromtimestamps(timestamps, utc=True),
+                         [self.theclass.utcfromtimestamp(ts)
+                          for ts in timestamps])
+        self.assertEqual(self.theclass.fromtimestamps([]), [])
+        self.assertRaises(OverflowError, self.theclass.fromtimestamps,
+                          [0, 1e200])
+
     def test_insane_fromtimestamp(self):
         # It's possible that some platform maps time_t to double,
         # and that this test will fail there.  This test should
@@ -263,6 +373,35 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
             d = self.theclass(2010, 1, 4+i)
             self.assertEqual(d.isocalendar(), (2010, 1, i+1))
 
+    def test_isocalendar_every_day(self):
+        # Compare to the standard library over a whole 400 year cycle, and
+        # round-trip through fromisocalendar().
+        for n in range(datetime.date(1600, 12, 20).toordinal(),
+                       datetime.date(2001, 1, 10).toordinal()):
+            d = self.theclass.fromordinal(n)
+            iso = d.isocalendar()
+            self.assertEqual(iso,
+                             tuple(datetime.date.fromordinal(n).isocalendar()))
+            self.assertEqual(self.theclass.fromisocalendar(*iso), d)
+
+    def test_fromisocalendar(self):
+        self.assertEqual(self.theclass.fromisocalendar(1, 1, 1),
+                         self.theclass(1, 1, 1))
+        self.assertEqual(self.theclass.fromisocalendar(2004, 53, 7),
+                         self.theclass(2005, 1, 2))
+        self.assertEqual(self.theclass.fromisocalendar(9999, 52, 5),
+                         self.theclass(9999, 12, 31))
+        self.assertIsInstance(SubclassDate.fromisocalendar(2004, 1, 1),
+                              SubclassDate)
+
+        for args in [(0, 1, 1), (10000, 1, 1), (2003, 0, 1), (2003, 53, 1),
+                     (2004, 54, 1), (2004, 1, 0), (2004, 1, 8),
+                     (9999, 52, 6)]:
+            self.assertRaises(ValueError, self.theclass.fromisocalendar,
+                              *args)
+        self.assertRaises(TypeError, self.theclass.fromisocalendar,
+                          2004, 1.0, 1)
+
     def test_iso_long_years(self):
         # Calculate long ISO years and compare to table from
         # http://www.phys.uu.nl/~vgent/calendar/isocalendar.htm
@@ -305,6 +444,44 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
         t = self.theclass(2, 3, 2)
         self.assertEqual(t.isoformat(), "0002-03-02")
 
+    def test_fromisoformat(self):
+        for args in (1, 1, 1), (2, 3, 2), (2000, 2, 29), (9999, 12, 31):
+            d = self.theclass(*args)
+            self.assertEqual(self.theclass.fromisoformat(d.isoformat()), d)
+        self.assertIsInstance(SubclassDate.fromisoformat('2002-03-02'),
+                              SubclassDate)
+
+        for bad in ['', '2002-3-2', '2002-03-02 ', '02002-03-02',
+                    '2002/03/02', '2002-03-0x', '+002-03-02', '0000-01-01',
+                    '2002-00-01', '2002-13-01', '2002-01-00', '2002-01-32',
+                    '2001-02-29', '1900-02-29', '2002-04-31',
+                    '\u0662002-03-02']:
+            self.assertRaises(ValueError, self.theclass.fromisoformat, bad)
+        self.assertRaises(TypeError, self.theclass.fromisoformat,
+                          b'2002-03-02')
+
+    def test_parse_dates(self):
+        rows = ['2002-03-02', '2001-02-29', '9999-12-31', 'garbage']
+        dates, errors = parse_dates(rows)
+        self.assertEqual(dates, [self.theclass(2002, 3, 2), None,
+                                 self.theclass(9999, 12, 31), None])
+        self.assertEqual([index for index, e in errors], [1, 3])
+        for index, e in errors:
+            self.assertIsInstance(e, ValueError)
+
+        buffer = b'2002-03-02\r\n2001-02-29\r\n9999-12-31\r\ngarbage\r\n'
+        ordinals, errors = parse_dates(buffer, ordinals=True)
+        self.assertEqual(list(ordinals), [730911, 0, 3652059, 0])
+        self.assertEqual([index for index, e in errors], [1, 3])
+        self.assertEqual(list(parse_dates(bytearray(buffer), True)[0]),
+                         list(ordinals))
+        self.assertEqual(parse_dates('\n'.join(rows))[0], dates)
+
+        dates, errors = parse_dates([b'2002-03-02', 20020302])
+        self.assertEqual(dates, [self.theclass(2002, 3, 2), None])
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][1], TypeError)
+
     def test_ctime(self):
         t = self.theclass(2002, 3, 2)
         self.assertEqual(t.ctime(), "Sat Mar  2 00:00:00 2002")
@@ -342,6 +519,29 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
         #check that this standard extension works
         t.strftime("%f")
 
+    def test_strftime_directives(self):
+        # The compiled formats must give the same result as the C library
+        # in the C locale.  %Y isn't zero-padded by all C libraries.
+        fmt = ("%a %A %b %B %c %C %d %D %e %F %G %h %H %I %j %m %M %n %p "
+               "%r %R %S %t %T %u %U %V %w %W %x %X %y %% %")
+        for args in [(1900, 1, 1), (1970, 1, 4), (2000, 2, 29),
+                     (2003, 12, 29), (2004, 12, 31), (2010, 1, 3),
+                     (2016, 7, 31), (2038, 6, 15), (2100, 3, 1)]:
+            d = self.theclass(*args)
+            for i in range(7):
+                day = d + Duration(i)
+                self.assertEqual(day.strftime(fmt),
+                                 time.strftime(fmt, day.timetuple()))
+
+    def test_strftime_cache(self):
+        from tider._utils import _compile_strftime
+        t = self.theclass(2005, 3, 2)
+        fmt = "cache test %Y-%m-%d"
+        t.strftime(fmt)
+        hits = _compile_strftime.cache_info().hits
+        self.assertEqual(t.strftime(fmt), "cache test 2005-03-02")
+        self.assertEqual(_compile_strftime.cache_info().hits, hits + 1)
+        self.assertTrue(_compile_strftime.cache_info().maxsize)
 
     def test_format(self):
         dt = self.theclass(2007, 9, 10)
@@ -527,11 +727,13 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
             expected = cls(*newargs)
             got = base.replace(**{name: newval})
             self.assertEqual(expected, got)
+            self.assertEqual(expected.timetuple(), got.timetuple())
             i += 1
 
         # Out of bounds.
         base = cls(2000, 2, 29)
         self.assertRaises(ValueError, base.replace, year=2001)
+        self.assertRaises(TypeError, base.replace, year=2001.0)
 
     def test_subclass_date(self):
 
@@ -558,6 +760,26 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
         self.assertEqual(dt1.toordinal(), dt2.toordinal())
         self.assertEqual(dt2.newmeth(-7), dt1.year + dt1.month - 7)
 
+    def test_subclass_alternate_constructors(self):
+        # The alternate constructors go through the subclass __init__.
+
+        class C(self.theclass):
+            def __init__(self, *args):
+                self.__class__.__bases__[0].__init__(self, *args)
+                self.extra = 7
+
+        d = self.theclass(2003, 4, 14)
+        for dt in (C.fromordinal(d.toordinal()),
+                   C.fromisoformat('2003-04-14'),
+                   C.fromisocalendar(*d.isocalendar()),
+                   C(2003, 4, 13).replace(day=14)):
+            self.assertIs(type(dt), C)
+            self.assertEqual(dt.extra, 7)
+            self.assertEqual(dt, d)
+        for dt in [C.fromtimestamp(0)] + C.fromtimestamps([0, 86400]):
+            self.assertIs(type(dt), C)
+            self.assertEqual(dt.extra, 7)
+
     def test_pickling_subclass_date(self):
         args = 6, 7, 23
         orig = SubclassDate(*args)
@@ -565,3 +787,48 @@ class TestDate(tests.HarmlessMixedComparison, unittest.TestCase):
             green = pickler.dumps(orig, proto)
             derived = unpickler.loads(green)
             self.assertEqual(orig, derived)
+
+
+class TestDateCache(unittest.TestCase):
+
+    def setUp(self):
+        date_module.cache_clear()
+        date_module.set_cache_size(3)
+
+    def tearDown(self):
+        date_module.set_cache_size(0)
+        date_module.cache_clear()
+
+    def test_shared(self):
+        d = BaseDate.fromordinal(730120)
+        self.assertIs(BaseDate.fromordinal(730120), d)
+        self.assertIs(BaseDate(1999, 12, 31) + Duration(1), d)
+        self.assertIs(BaseDate.fromisoformat('2000-01-01'), d)
+        self.assertEqual(d, BaseDate(2000, 1, 1))
+        self.assertEqual(date_module.cache_info(),
+                         date_module.CacheInfo(hits=3, misses=1, maxsize=3,
+                                               currsize=1))
+        # Subclasses are not shared
+        self.assertIsNot(SubclassDate.fromordinal(730120), d)
+
+    def test_eviction(self):
+        first = BaseDate.fromordinal(1)
+        for n in 2, 3, 1, 4:
+            BaseDate.fromordinal(n)
+        # 2 was the least recently used.
+        self.assertIs(BaseDate.fromordinal(1), first)
+        self.assertEqual(date_module.cache_info().currsize, 3)
+        self.assertEqual(date_module.cache_info().misses, 4)
+        BaseDate.fromordinal(2)
+        self.assertEqual(date_module.cache_info().misses, 5)
+
+        date_module.set_cache_size(1)
+        self.assertEqual(date_module.cache_info().currsize, 1)
+
+    def test_disabled(self):
+        date_module.set_cache_size(0)
+        self.assertEqual(date_module.cache_info().currsize, 0)
+        self.assertIsNot(BaseDate.fromordinal(1), BaseDate.fromordinal(1))
+        self.assertEqual(date_module.cache_info().misses, 0)
+        self.assertRaises(ValueError, date_module.set_cache_size, -1)
+        self.assertRaises(TypeError, date_module.set_cache_size, 1.5)
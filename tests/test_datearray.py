@@ -0,0 +1,107 @@
+import datetime
+import unittest
+import tests
+
+from tider import Date, Duration
+from tider._utils import _MAXORDINAL
+
+if tests.numpy is not None:
+    import numpy as np
+    from tider import DateArray
+
+
+@tests.requires_numpy
+class TestDateArray(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = [Date(1, 1, 1), Date(2000, 2, 29), Date(2003, 12, 29),
+                      Date(2010, 1, 3), Date(9999, 12, 31)]
+        self.array = DateArray(self.dates)
+
+    def test_indexing(self):
+        # The indexing itself is tested in test_arraybase.
+        mask = self.array > Date(2003, 12, 29)
+        filtered = self.array[mask]
+        self.assertIsInstance(filtered, DateArray)
+        self.assertEqual(filtered.tolist(),
+                         [x for x in self.dates if x > Date(2003, 12, 29)])
+        self.assertIsInstance(self.array[np.int64(2)], Date)
+        self.assertEqual(self.array[[3, 0]].tolist(),
+                         [self.dates[3], self.dates[0]])
+
+    def test_roundtrip(self):
+        self.assertEqual(len(self.array), 5)
+        self.assertEqual(self.array.tolist(), self.dates)
+        self.assertEqual(list(self.array), self.dates)
+        self.assertEqual(self.array[1], Date(2000, 2, 29))
+        self.assertEqual(self.array[-1], Date(9999, 12, 31))
+        self.assertEqual(self.array[1:3].tolist(), self.dates[1:3])
+        self.assertEqual(len(DateArray()), 0)
+
+    def test_ordinals(self):
+        ordinals = self.array.toordinal()
+        self.assertEqual(ordinals.dtype, np.int32)
+        self.assertEqual(ordinals.tolist(),
+                         [d.toordinal() for d in self.dates])
+        self.assertFalse(ordinals.flags.writeable)
+        other = DateArray.fromordinal(ordinals)
+        self.assertEqual(other.tolist(), self.dates)
+
+        self.assertRaises(ValueError, DateArray.fromordinal, [0])
+        self.assertRaises(ValueError, DateArray.fromordinal,
+                          [_MAXORDINAL + 1])
+        self.assertRaises(TypeError, DateArray.fromordinal, [1.0])
+
+    def test_fields(self):
+        # Compare to the standard library over a 400 year cycle.
+        ordinals = np.arange(datetime.date(1601, 1, 1).toordinal(),
+                             datetime.date(2001, 1, 2).toordinal())
+        array = DateArray.fromordinal(ordinals)
+        years, months, days = array.year, array.month, array.day
+        weekdays = array.weekday()
+        isoyears, isoweeks, isodays = array.isocalendar()
+        for i in range(0, len(ordinals), 13):
+            d = datetime.date.fromordinal(int(ordinals[i]))
+            self.assertEqual((years[i], months[i], days[i]),
+                             (d.year, d.month, d.day))
+            self.assertEqual(weekdays[i], d.weekday())
+            self.assertEqual((isoyears[i], isoweeks[i], isodays[i]),
+                             tuple(d.isocalendar()))
+
+    def test_isocalendar(self):
+        years, weeks, days = self.array.isocalendar()
+        for i, d in enumerate(self.dates):
+            self.assertEqual((years[i], weeks[i], days[i]), d.isocalendar())
+        self.assertEqual(self.array.isoweekday().tolist(),
+                         [d.isoweekday() for d in self.dates])
+
+    def test_isoformat(self):
+        self.assertEqual(self.array.isoformat().tolist(),
+                         [d.isoformat() for d in self.dates])
+
+    def test_computations(self):
+        array = DateArray(self.dates[1:4])
+        self.assertEqual((array + Duration(1)).tolist(),
+                         [d + Duration(1) for d in self.dates[1:4]])
+        self.assertEqual((Duration(7) + array).tolist(),
+                         [d + Duration(7) for d in self.dates[1:4]])
+        self.assertEqual((array - Duration(400)).tolist(),
+                         [d - Duration(400) for d in self.dates[1:4]])
+        self.assertRaises(OverflowError, lambda: self.array + Duration(1))
+        self.assertRaises(OverflowError, lambda: self.array - Duration(1))
+        self.assertRaises(TypeError, lambda: array + 1)
+        self.assertRaises(TypeError, lambda: array - 1)
+
+    def test_compare(self):
+        d = Date(2003, 12, 29)
+        self.assertEqual((self.array < d).tolist(),
+                         [True, True, False, False, False])
+        self.assertEqual((self.array >= d).tolist(),
+                         [False, False, True, True, True])
+        self.assertEqual((self.array == d).tolist(),
+                         [False, False, True, False, False])
+        self.assertEqual((self.array != self.array).tolist(), [False] * 5)
+        self.assertEqual((self.array <= self.array).tolist(), [True] * 5)
+        self.assertEqual((self.array > self.array).tolist(), [False] * 5)
+        self.assertRaises(TypeError, lambda: self.array < 1)
+        self.assertRaises(TypeError, hash, self.array)
@@ -0,0 +1,136 @@
+import pickle
+import unittest
+import tests
+import tider  # Must be imported for eval to work in the roundtrip test.
+
+from tider import Date, DateRange, Duration
+from tider._utils import _MAXORDINAL
+
+DAY = Duration(1)
+WEEK = Duration(7)
+
+
+class TestDateRange(unittest.TestCase):
+
+    def setUp(self):
+        self.start = Date(2000, 2, 20)
+        self.stop = Date(2000, 3, 20)
+        self.days = DateRange(self.start, self.stop)
+        self.weeks = DateRange(self.start, self.stop, WEEK)
+
+    def expected(self, start, stop, step):
+        dates = []
+        d = start
+        while (d < stop) if step > Duration(0) else (d > stop):
+            dates.append(d)
+            d = d + step
+        return dates
+
+    def test_iteration(self):
+        self.assertEqual(list(self.days),
+                         self.expected(self.start, self.stop, DAY))
+        self.assertEqual(list(self.weeks),
+                         self.expected(self.start, self.stop, WEEK))
+        backwards = DateRange(self.stop, self.start, -WEEK)
+        self.assertEqual(list(backwards),
+                         self.expected(self.stop, self.start, -WEEK))
+        self.assertEqual(list(reversed(self.weeks)), list(self.weeks)[::-1])
+        self.assertEqual(list(DateRange(self.stop, self.start)), [])
+
+    def test_attributes(self):
+        self.assertEqual(self.weeks.start, self.start)
+        self.assertEqual(self.weeks.stop, self.stop)
+        self.assertEqual(self.weeks.step, WEEK)
+        self.assertEqual(self.days.step, DAY)
+
+    def test_len(self):
+        self.assertEqual(len(self.days), 29)
+        self.assertEqual(len(self.weeks), 5)
+        everything = DateRange(Date(1, 1, 1), Date(9999, 12, 31))
+        self.assertEqual(len(everything), _MAXORDINAL - 1)
+
+    def test_indexing(self):
+        dates = list(self.weeks)
+        for i in range(-len(dates), len(dates)):
+            self.assertEqual(self.weeks[i], dates[i])
+        self.assertRaises(IndexError, lambda: self.weeks[5])
+        self.assertRaises(IndexError, lambda: self.weeks[-6])
+
+        for s in [slice(1, 3), slice(None, None, 2), slice(None, None, -1),
+                  slice(-2, None), slice(4, 1, -2)]:
+            self.assertEqual(list(self.weeks[s]), dates[s])
+        self.assertIsInstance(self.weeks[1:3], DateRange)
+
+    def test_contains(self):
+        self.assertIn(Date(2000, 2, 27), self.weeks)
+        self.assertNotIn(Date(2000, 2, 28), self.weeks)
+        self.assertNotIn(self.stop, self.weeks)
+        self.assertIn(Date(2000, 2, 29), self.days)
+        self.assertNotIn(1, self.days)
+        self.assertEqual(self.weeks.index(Date(2000, 3, 5)), 2)
+        self.assertRaises(ValueError, self.weeks.index, Date(2000, 3, 6))
+        self.assertRaises(ValueError, self.weeks.index, 3)
+        self.assertEqual(self.weeks.count(Date(2000, 3, 5)), 1)
+        self.assertEqual(self.weeks.count(Date(2000, 3, 6)), 0)
+
+    def test_equality(self):
+        self.assertEqual(self.weeks,
+                         DateRange(self.start, Date(2000, 3, 21), WEEK))
+        self.assertNotEqual(self.weeks, self.days)
+        self.assertEqual(hash(self.weeks),
+                         hash(DateRange(self.start, Date(2000, 3, 21), WEEK)))
+        self.assertEqual(DateRange(self.stop, self.start),
+                         DateRange(self.start, self.start))
+        self.assertNotEqual(self.days, range(29))
+
+    def test_repr(self):
+        for r in self.days, self.weeks:
+            self.assertEqual(eval(repr(r).replace('Datetime.BaseDate', 'Date')), r)
+
+    def test_pickling(self):
+        for r in self.weeks, self.days[::-3]:
+            for pickler, unpickler, proto in tests.pickle_choices:
+                self.assertEqual(unpickler.loads(pickler.dumps(r, proto)), r)
+
+    def test_bad_arguments(self):
+        self.assertRaises(TypeError, DateRange, 1, self.stop)
+        self.assertRaises(TypeError, DateRange, self.start, self.stop, 1)
+        self.assertRaises(ValueError, DateRange, self.start, self.stop,
+                          Duration(0))
+        self.assertRaises(ValueError, DateRange, self.start, self.stop,
+                          Duration(hours=36))
+
+    def test_slice_out_of_range(self):
+        r = DateRange(Date(1, 1, 1), Date(1, 1, 10))[::-1]
+        self.assertEqual(r[-1], Date(1, 1, 1))
+        self.assertRaises(OverflowError, lambda: r.stop)
+
+    def test_repr_out_of_range(self):
+        # Reversed and negative step slices that reach the first or last
+        # supported Date stop outside of the supported Dates.
+        low = DateRange(Date(1, 1, 1), Date(1, 1, 10))
+        high = DateRange(Date(9999, 12, 20), Date(9999, 12, 31))
+        down = DateRange(Date(9999, 12, 31), Date(9999, 12, 20), -DAY)
+        ranges = [low[::-1], low[::-2], low[::-3], low[4::-1], low[::-1][::-1],
+                  high[::2], down[::-1], down[::-1][::-2], low[::-1][20:],
+                  DateRange(Date(9999, 12, 31), Date(1, 1, 1), -DAY)[::-1]]
+        for r in ranges:
+            s = repr(r).replace('Datetime.BaseDate', 'Date')
+            self.assertTrue(s.startswith('tider.DateRange('), s)
+            derived = eval(s)
+            self.assertEqual(derived, r)
+            self.assertEqual(len(derived), len(r))
+            self.assertEqual(list(derived[:20]), list(r[:20]))
+        self.assertEqual(repr(low[::-1]).replace('Datetime.BaseDate', 'Date'),
+                         'tider.DateRange(Date(1, 1, 1), Date(1, 1, 10))'
+                         '[::-1]')
+
+    def test_toordinal(self):
+        ordinals = self.weeks.toordinal()
+        self.assertEqual(ordinals.typecode, 'i')
+        self.assertEqual(list(ordinals), [d.toordinal() for d in self.weeks])
+
+    @tests.requires_numpy
+    def test_todatearray(self):
+        for r in self.weeks, self.days[::-2]:
+            self.assertEqual(r.todatearray().tolist(), list(r))
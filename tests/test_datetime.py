@@ -0,0 +1,383 @@
+import datetime
+import os
+import time
+import unittest
+import tests
+from array import array
+import tider  # Must be imported for eval to work in the roundtrip test.
+
+from tider import Date, Datetime, Duration, FixedTimezone, PosixTimezone, Time
+
+UTC = FixedTimezone.utc
+EST = FixedTimezone(Duration(hours=-5), 'EST')
+HOUR = Duration(hours=1)
+EASTERN = PosixTimezone('EST5EDT,M3.2.0,M11.1.0')
+
+
+class SubclassDatetime(Datetime):
+    sub_var = 1
+
+
+class TestDatetime(tests.HarmlessMixedComparison, unittest.TestCase):
+
+    theclass = Datetime
+
+    def test_basic_attributes(self):
+        dt = self.theclass(2002, 3, 1, 12, 59, 59, 8000)
+        self.assertEqual(dt.year, 2002)
+        self.assertEqual(dt.month, 3)
+        self.assertEqual(dt.day, 1)
+        self.assertEqual(dt.hour, 12)
+        self.assertEqual(dt.minute, 59)
+        self.assertEqual(dt.second, 59)
+        self.assertEqual(dt.microsecond, 8000)
+        self.assertIsNone(dt.tzinfo)
+        self.assertEqual(dt._us, 1014987599008000)
+
+    def test_fields_from_microseconds(self):
+        # The fields are calculated from the microseconds when needed.
+        for dt in (Datetime.min, Datetime.max, Datetime(1969, 12, 31, 23),
+                   Datetime(2000, 2, 29, 1, 2, 3, 4)):
+            copy = Datetime._from_microseconds(dt._us)
+            self.assertIsNone(copy._fields)
+            self.assertEqual(copy._getfields(), dt._fields)
+
+    def test_bad_constructor_arguments(self):
+        self.assertRaises(ValueError, self.theclass, 0, 1, 1)
+        self.assertRaises(ValueError, self.theclass, 10000, 1, 1)
+        self.assertRaises(ValueError, self.theclass, 2000, 13, 1)
+        self.assertRaises(ValueError, self.theclass, 2001, 2, 29)
+        self.assertRaises(ValueError, self.theclass, 2000, 1, 1, 24)
+        self.assertRaises(ValueError, self.theclass, 2000, 1, 1, 0, 60)
+        self.assertRaises(ValueError, self.theclass, 2000, 1, 1, 0, 0, 60)
+        self.assertRaises(ValueError, self.theclass, 2000, 1, 1, 0, 0, 0,
+                          1000000)
+        self.assertRaises(TypeError, self.theclass, 2000, 1, 1, 1.5)
+        self.assertRaises(TypeError, self.theclass, 2000, 1, 1, tzinfo=1)
+
+    def test_roundtrip(self):
+        for dt in (self.theclass(1, 2, 3, 4, 5, 6, 7),
+                   self.theclass(2010, 1, 1),
+                   self.theclass(2010, 1, 1, 12, 30, tzinfo=EST),
+                   self.theclass(2010, 1, 1, 12, 30, tzinfo=EASTERN)):
+            s = repr(dt)
+            self.assertTrue(s.startswith('tider.'))
+            self.assertEqual(eval(s), dt)
+            self.assertEqual(self.theclass(dt.year, dt.month, dt.day,
+                                           dt.hour, dt.minute, dt.second,
+                                           dt.microsecond, dt.tzinfo), dt)
+        self.assertEqual(repr(self.theclass(2010, 1, 1, 0, 0, 0, 5)),
+                         'tider.Datetime(2010, 1, 1, 0, 0, 0, 5)')
+        self.assertEqual(repr(self.theclass(2010, 1, 1, 12, tzinfo=UTC)),
+                         'tider.Datetime(2010, 1, 1, 12, '
+                         'tzinfo=tider.FixedTimezone.utc)')
+
+    def test_isoformat(self):
+        dt = self.theclass(2002, 3, 1, 12, 0, 0, 5000)
+        self.assertEqual(dt.isoformat(), '2002-03-01T12:00:00.005000')
+        self.assertEqual(dt.isoformat(' '), '2002-03-01 12:00:00.005000')
+        self.assertEqual(str(dt), '2002-03-01 12:00:00.005000')
+        dt = self.theclass(2002, 3, 1, 12, tzinfo=EST)
+        self.assertEqual(dt.isoformat(), '2002-03-01T12:00:00-05:00')
+        dt = self.theclass(2002, 7, 1, 12, tzinfo=EASTERN)
+        self.assertEqual(dt.isoformat(), '2002-07-01T12:00:00-04:00')
+        dt = self.theclass(2002, 3, 1, tzinfo=UTC)
+        self.assertEqual(str(dt), '2002-03-01 00:00:00+00:00')
+        self.assertEqual(format(dt), str(dt))
+
+    def test_strftime(self):
+        dt = self.theclass(2002, 3, 4, 18, 45, 3, 1234, tzinfo=EST)
+        self.assertEqual(dt.strftime('%Y-%m-%d %H:%M:%S.%f %a %j'),
+                         '2002-03-04 18:45:03.001234 Mon 063')
+        self.assertEqual(dt.strftime('%z %Z'), '-0500 EST')
+        self.assertEqual(format(dt, '%H'), '18')
+        self.assertEqual(self.theclass(2002, 3, 4).strftime('%z%Z'), '')
+
+    def test_date_and_time(self):
+        dt = self.theclass(2002, 3, 4, 18, 45, 3, 1234)
+        self.assertEqual(dt.date(), Date(2002, 3, 4))
+        self.assertEqual(dt.time(), Time(18, 45, 3, 1234))
+        self.assertEqual(Datetime.combine(dt.date(), dt.time()), dt)
+        aware = Datetime.combine(dt.date(), dt.time(), EST)
+        self.assertEqual(aware, dt.replace(tzinfo=EST))
+        self.assertEqual(aware.date(), Date(2002, 3, 4))
+        self.assertEqual(aware.time(), Time(18, 45, 3, 1234))
+        self.assertEqual(self.theclass(1969, 12, 31, 23, 59).date(),
+                         Date(1969, 12, 31))
+        self.assertRaises(TypeError, Datetime.combine, dt, dt.time())
+        self.assertRaises(TypeError, Datetime.combine, dt.date(), dt)
+
+    def test_comparing(self):
+        dt1 = self.theclass(2000, 1, 1, 12)
+        dt2 = self.theclass(2000, 1, 1, 12, 0, 0, 1)
+        self.assertTrue(dt1 < dt2)
+        self.assertTrue(dt1 <= dt2)
+        self.assertTrue(dt2 > dt1)
+        self.assertTrue(dt2 >= dt1)
+        self.assertTrue(dt1 != dt2)
+        self.assertFalse(dt1 == dt2)
+        self.assertEqual(dt1, self.theclass(2000, 1, 1, 12))
+        self.assertEqual(hash(dt1), hash(self.theclass(2000, 1, 1, 12)))
+
+        # Aware Datetimes are compared by their instants.
+        est = self.theclass(2000, 1, 1, 7, tzinfo=EST)
+        utc = self.theclass(2000, 1, 1, 12, tzinfo=UTC)
+        self.assertEqual(est, utc)
+        self.assertEqual(hash(est), hash(utc))
+        self.assertTrue(est < self.theclass(2000, 1, 1, 12, 1, tzinfo=UTC))
+
+        # Naive and aware Datetimes are never equal, and can't be ordered.
+        self.assertFalse(dt1 == utc)
+        self.assertTrue(dt1 != utc)
+        self.assertRaises(TypeError, lambda: dt1 < utc)
+        self.assertRaises(TypeError, lambda: utc >= dt1)
+        self.assertRaises(TypeError, lambda: dt1 < Date(2000, 1, 1))
+        self.assertFalse(dt1 == Date(2000, 1, 1))
+
+    def test_arithmetic(self):
+        dt = self.theclass(2002, 3, 1, 12)
+        self.assertEqual(dt + Duration(1, 3600, 5),
+                         self.theclass(2002, 3, 2, 13, 0, 0, 5))
+        self.assertEqual(Duration(1) + dt, self.theclass(2002, 3, 2, 12))
+        self.assertEqual(dt - Duration(1), self.theclass(2002, 2, 28, 12))
+        self.assertEqual(dt - self.theclass(2002, 2, 28),
+                         Duration(1, 12 * 3600))
+        self.assertEqual(self.theclass(2002, 2, 28) - dt,
+                         -Duration(1, 12 * 3600))
+        self.assertEqual(self.theclass(2002, 3, 1, tzinfo=EST) -
+                         self.theclass(2002, 3, 1, tzinfo=UTC), 5 * HOUR)
+
+        self.assertRaises(OverflowError, lambda: Datetime.max + Duration(0, 0, 1))
+        self.assertRaises(OverflowError, lambda: Datetime.min - Duration(0, 0, 1))
+        self.assertEqual(Datetime.max - Datetime.min,
+                         Duration(3652058, 86399, 999999))
+        self.assertRaises(TypeError, lambda: dt + dt)
+        self.assertRaises(TypeError, lambda: dt - 1)
+        self.assertRaises(TypeError,
+                          lambda: dt - self.theclass(2002, 3, 1, tzinfo=UTC))
+
+    def test_range_with_offset(self):
+        # The range applies to the wall time, not to the UTC time.
+        east = FixedTimezone(5 * HOUR)
+        last = self.theclass(9999, 12, 31, 23, tzinfo=east)
+        self.assertRaises(OverflowError, lambda: last + 4 * HOUR)
+        self.assertEqual(last + Duration(0, 3599, 999999),
+                         self.theclass(9999, 12, 31, 23, 59, 59, 999999,
+                                       tzinfo=east))
+        first = self.theclass(1, 1, 1, tzinfo=east)
+        self.assertEqual(first + Duration(0), first)
+        self.assertEqual(first - Duration(0), first)
+        self.assertRaises(OverflowError, lambda: first - Duration(0, 0, 1))
+        self.assertRaises(OverflowError, lambda: first + -Duration(0, 0, 1))
+        self.assertEqual(first.astimezone(east), first)
+        self.assertEqual(first.astimezone(FixedTimezone(6 * HOUR)).hour, 1)
+        self.assertRaises(OverflowError, first.astimezone, UTC)
+        self.assertRaises(OverflowError, first.astimezone, EST)
+        late = self.theclass(9999, 12, 31, 20, tzinfo=EST)
+        self.assertEqual((late + 3 * HOUR).hour, 23)
+        self.assertRaises(OverflowError, late.astimezone, UTC)
+        self.assertEqual((late - 2 * HOUR).astimezone(UTC),
+                         self.theclass(9999, 12, 31, 23, tzinfo=UTC))
+        self.assertRaises(OverflowError, (late - 2 * HOUR).astimezone, east)
+
+    def test_dst_arithmetic(self):
+        # Adding a Duration gives the time that much later, so the wall
+        # time jumps over the daylight saving time transitions.
+        dt = self.theclass(2024, 3, 10, 1, 59, tzinfo=EASTERN)
+        later = dt + Duration(minutes=1)
+        self.assertEqual(later.isoformat(), '2024-03-10T03:00:00-04:00')
+        self.assertEqual(later.tzname(), 'EDT')
+        self.assertEqual(later.dst(), HOUR)
+        self.assertEqual(later - dt, Duration(minutes=1))
+
+        # 01:30 happens twice in November, and is EDT the first time.
+        dt = self.theclass(2024, 11, 3, 1, 30, tzinfo=EASTERN)
+        self.assertEqual(dt.tzname(), 'EDT')
+        later = dt + HOUR
+        self.assertEqual((later.hour, later.minute), (1, 30))
+        self.assertEqual(later.tzname(), 'EST')
+        self.assertEqual(later.dst(), Duration(0))
+        self.assertEqual(later.utcoffset(), -5 * HOUR)
+
+    def test_timezones(self):
+        naive = self.theclass(2002, 3, 1, 12)
+        self.assertIsNone(naive.utcoffset())
+        self.assertIsNone(naive.dst())
+        self.assertIsNone(naive.tzname())
+        self.assertRaises(ValueError, naive.astimezone, UTC)
+
+        dt = naive.replace(tzinfo=EST)
+        self.assertIs(dt.tzinfo, EST)
+        self.assertEqual(dt.utcoffset(), -5 * HOUR)
+        self.assertEqual(dt.tzname(), 'EST')
+        self.assertEqual(dt.replace(tzinfo=None), naive)
+        utc = dt.astimezone(UTC)
+        self.assertEqual(utc, dt)
+        self.assertEqual(utc.hour, 17)
+        self.assertEqual(utc.astimezone(EASTERN).isoformat(),
+                         '2002-03-01T12:00:00-05:00')
+        self.assertEqual(self.theclass(2002, 7, 1, tzinfo=UTC).astimezone(
+            EASTERN).isoformat(), '2002-06-30T20:00:00-04:00')
+        self.assertRaises(TypeError, dt.astimezone, None)
+
+    def test_replace(self):
+        dt = self.theclass(2002, 3, 1, 12, 30, 15, 5, tzinfo=EST)
+        self.assertEqual(dt.replace(year=2003), self.theclass(
+            2003, 3, 1, 12, 30, 15, 5, tzinfo=EST))
+        self.assertEqual(dt.replace(minute=0, second=0, microsecond=0),
+                         self.theclass(2002, 3, 1, 12, tzinfo=EST))
+        self.assertRaises(ValueError, dt.replace, month=2, day=30)
+        self.assertRaises(ValueError, dt.replace, hour=24)
+
+    def test_pickling(self):
+        for dt in (self.theclass(2002, 3, 1, 12, 30, 15, 5),
+                   self.theclass(2024, 11, 3, 1, 30, tzinfo=EASTERN) + HOUR,
+                   self.theclass(2002, 3, 1, tzinfo=EST)):
+            for pickler, unpickler, proto in tests.pickle_choices:
+                derived = unpickler.loads(pickler.dumps(dt, proto))
+                self.assertEqual(derived, dt)
+                self.assertEqual(derived.isoformat(), dt.isoformat())
+
+    def test_subclass(self):
+        dt = SubclassDatetime(2002, 3, 1, 12)
+        self.assertEqual(dt.sub_var, 1)
+        self.assertIs(type(dt + HOUR), SubclassDatetime)
+        self.assertIs(type(dt.replace(hour=1)), SubclassDatetime)
+        for pickler, unpickler, proto in tests.pickle_choices:
+            derived = unpickler.loads(pickler.dumps(dt, proto))
+            self.assertIs(type(derived), SubclassDatetime)
+            self.assertEqual(derived, dt)
+
+    def test_class_members(self):
+        self.assertEqual(Datetime.min, self.theclass(1, 1, 1))
+        self.assertEqual(Datetime.max,
+                         self.theclass(9999, 12, 31, 23, 59, 59, 999999))
+        self.assertEqual(Datetime.resolution, Duration(microseconds=1))
+
+    def test_now(self):
+        before = time.time_ns() // 1000
+        utc = self.theclass.utcnow()
+        aware = self.theclass.now(UTC)
+        after = time.time_ns() // 1000
+        self.assertIsNone(utc.tzinfo)
+        self.assertIs(aware.tzinfo, UTC)
+        self.assertTrue(before <= utc._us <= aware._us <= after)
+        local = self.theclass.now()
+        self.assertIsNone(local.tzinfo)
+        offset = local.replace(tzinfo=UTC) - self.theclass.now(UTC)
+        self.assertLess(abs(offset - Duration(0, time.localtime().tm_gmtoff)),
+                        Duration(0, 1))
+        self.assertIs(type(SubclassDatetime.now()), SubclassDatetime)
+        self.assertRaises(TypeError, self.theclass.now, 'UTC')
+
+    def test_fromtimestamp(self):
+        for ts, args in [(0, (1970, 1, 1)), (-1, (1969, 12, 31, 23, 59, 59)),
+                         (-0.5, (1969, 12, 31, 23, 59, 59, 500000)),
+                         (86399.999, (1970, 1, 1, 23, 59, 59, 999000)),
+                         (1.000001, (1970, 1, 1, 0, 0, 1, 1)),
+                         (1699999999.9999996, (2023, 11, 14, 22, 13, 20)),
+                         (951782400, (2000, 2, 29)),
+                         (-62135596800, (1, 1, 1)),
+                         (253402300799, (9999, 12, 31, 23, 59, 59))]:
+            self.assertEqual(self.theclass.fromtimestamp(ts, UTC),
+                             self.theclass(*args, tzinfo=UTC))
+        # Nothing is lost to floats.
+        ns = 1700000000123456789
+        self.assertEqual(self.theclass.fromtimestamp_ns(ns, UTC),
+                         self.theclass(2023, 11, 14, 22, 13, 20, 123456,
+                                       tzinfo=UTC))
+        self.assertEqual(self.theclass.fromtimestamp_ns(-1, UTC),
+                         self.theclass(1969, 12, 31, 23, 59, 59, 999999,
+                                       tzinfo=UTC))
+        self.assertEqual(self.theclass.fromtimestamp(1, EASTERN).isoformat(),
+                         '1969-12-31T19:00:01-05:00')
+        for ts in -62135596801, 253402300800, 1e200:
+            self.assertRaises(OverflowError, self.theclass.fromtimestamp,
+                              ts, UTC)
+        self.assertRaises(TypeError, self.theclass.fromtimestamp_ns, 1.5)
+        self.assertRaises(TypeError, self.theclass.fromtimestamp, 1, 'UTC')
+
+    def test_fromtimestamp_timezones(self):
+        old_tz = os.environ.get('TZ')
+        try:
+            for tz in ['UTC', 'America/New_York', 'Australia/Lord_Howe',
+                       'Asia/Kathmandu', 'Pacific/Apia']:
+                os.environ['TZ'] = tz
+                time.tzset()
+                # Every 28 minutes and 53 seconds over two years.
+                for ts in range(1293840000, 1356998400, 1733):
+                    expected = datetime.datetime.fromtimestamp(ts + 0.25)
+                    dt = self.theclass.fromtimestamp(ts + 0.25)
+                    self.assertEqual(dt.isoformat(), expected.isoformat())
+                    dt = self.theclass.fromtimestamp_ns(ts * 10 ** 9 + 250000000)
+                    self.assertEqual(dt.isoformat(), expected.isoformat())
+        finally:
+            if old_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = old_tz
+            time.tzset()
+
+    def test_fromtimestamp_same_tznames(self):
+        # Europe/Berlin and Europe/Paris are both ('CET', 'CEST'), but
+        # Paris was on CET in the summer of 1977.
+        old_tz = os.environ.get('TZ')
+        try:
+            for tz in ['Europe/Berlin', 'Europe/Paris', 'Europe/Berlin']:
+                os.environ['TZ'] = tz
+                time.tzset()
+                timestamps = range(236600000, 236700000, 1800)
+                expected = [time.localtime(ts)[:6] for ts in timestamps]
+                for ts, fields in zip(timestamps, expected):
+                    dt = self.theclass.fromtimestamp(ts)
+                    self.assertEqual(dt._getfields()[:6], fields)
+                    dt = self.theclass.fromtimestamp_ns(ts * 10 ** 9)
+                    self.assertEqual(dt._getfields()[:6], fields)
+                self.assertEqual(
+                    [dt._getfields()[:6] for dt in
+                     self.theclass.fromtimestamps(array('q', timestamps))],
+                    expected)
+                ts = time.time_ns() // 10 ** 9
+                dt = self.theclass.now()
+                self.assertIn(dt._getfields()[:6],
+                              [time.localtime(ts)[:6],
+                               time.localtime(ts + 1)[:6]])
+        finally:
+            if old_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = old_tz
+            time.tzset()
+
+    def test_fromtimestamps(self):
+        timestamps = [0, 951782400, 10 ** 9, -86400 * 365]
+        expected = [self.theclass.fromtimestamp(ts) for ts in timestamps]
+        buffer = array('q', timestamps)
+        self.assertEqual(self.theclass.fromtimestamps(buffer), expected)
+        self.assertEqual(self.theclass.fromtimestamps(buffer.tobytes()),
+                         expected)
+        self.assertEqual(self.theclass.fromtimestamps(buffer, UTC),
+                         [self.theclass.fromtimestamp(ts, UTC)
+                          for ts in timestamps])
+        ns = array('q', [ts * 10 ** 9 + 999 for ts in timestamps])
+        self.assertEqual(self.theclass.fromtimestamps(ns, ns=True), expected)
+        self.assertEqual(self.theclass.fromtimestamps(b''), [])
+
+        self.assertRaises(OverflowError, self.theclass.fromtimestamps,
+                          array('q', [0, 2 ** 62]))
+        self.assertRaises(TypeError, self.theclass.fromtimestamps,
+                          array('i', [0]))
+        self.assertRaises(TypeError, self.theclass.fromtimestamps,
+                          array('d', [0]))
+        self.assertRaises(ValueError, self.theclass.fromtimestamps, b'1234')
+        self.assertRaises(TypeError, self.theclass.fromtimestamps, [0])
+
+    @tests.requires_numpy
+    def test_fromtimestamps_numpy(self):
+        import numpy as np
+        timestamps = np.array([0, 951782400, 10 ** 9], dtype=np.int64)
+        self.assertEqual(self.theclass.fromtimestamps(timestamps, UTC),
+                         [self.theclass.fromtimestamp(int(ts), UTC)
+                          for ts in timestamps])
+        self.assertRaises(TypeError, self.theclass.fromtimestamps,
+                          timestamps.astype(np.int32))
@@ -3,7 +3,7 @@ import tests
 import tider  # Must be imported for eval to work in the roundtrip test.
 
 from operator import truediv, floordiv, mod, mul
-from tider import Duration
+from tider import Duration, parse_durations
 
 NAN = float("nan")
 INF = float("inf")
@@ -175,6 +175,16 @@ class TestDuration(tests.HarmlessMixedComparison, unittest.TestCase):
         t2 = Duration(microseconds=1)
         self.assertEqual(t1, t2)
 
+    def test_hash_cached(self):
+        # The hash is worked out on first use, and then kept.
+        d = Duration(2, 3, 4)
+        self.assertEqual(d._hashcode, -1)
+        h = hash(d)
+        self.assertEqual(d._hashcode, h)
+        self.assertEqual(hash(d), h)
+        self.assertEqual(hash(Duration(2, 3, 4)), h)
+        self.assertEqual(h, hash(d._us))
+
     def test_hash_equality(self):
         t1 = Duration(days=100,
                       weeks=-7,
@@ -352,6 +362,98 @@ class TestDuration(tests.HarmlessMixedComparison, unittest.TestCase):
         self.assertEqual((d.days, d.seconds, d.microseconds),
                          (-1, 24*3600-1, 999999))
 
+    def test_from_microseconds(self):
+        # The trusted constructor must normalize like the public one.
+        for us in (0, 1, -1, 999999, 1000000, -1000000, 86399999999,
+                   86400000000, -86400000001, 123456789012345,
+                   -123456789012345):
+            d = Duration._from_microseconds(us)
+            self.assertIs(type(d), Duration)
+            self.assertEqual((d.days, d.seconds, d.microseconds),
+                             (Duration(0, 0, us).days,
+                              Duration(0, 0, us).seconds,
+                              Duration(0, 0, us).microseconds))
+            self.assertEqual(d, Duration(0, 0, us))
+            self.assertEqual(hash(d), hash(Duration(0, 0, us)))
+
+    def test_fields_from_microseconds(self):
+        # The fields are derived from the total number of microseconds.
+        for args in [(1, 2, 3), (-1, 2, 3), (0, -1), (0, 0, -1),
+                     (2, 86401, 1000001), (0, 1.5), (-0.5,),
+                     (-1000, -86399, -999999)]:
+            d = Duration(*args)
+            self.assertEqual(d.total_microseconds(),
+                             (d.days * 86400 + d.seconds) * 1000000 +
+                             d.microseconds)
+            self.assertTrue(0 <= d.seconds < 86400)
+            self.assertTrue(0 <= d.microseconds < 1000000)
+        self.assertFalse(hasattr(Duration(1), '__dict__'))
+
+    def test_isoformat(self):
+        for d, expected in [(Duration(0), 'PT0S'),
+                            (Duration(1), 'P1D'),
+                            (Duration(-1), '-P1D'),
+                            (Duration(0, 1), 'PT1S'),
+                            (Duration(0, 60), 'PT1M'),
+                            (Duration(0, 3600), 'PT1H'),
+                            (Duration(0, 0, 1), 'PT0.000001S'),
+                            (Duration(0, 0, -1), '-PT0.000001S'),
+                            (Duration(0, 0, 500000), 'PT0.5S'),
+                            (Duration(2, 3661, 120000), 'P2DT1H1M1.12S'),
+                            (Duration(2, 3600), 'P2DT1H'),
+                            (Duration(-2, -60, -1), '-P2DT1M0.000001S'),
+                            (Duration(999999999, 86399, 999999),
+                             'P999999999DT23H59M59.999999S')]:
+            self.assertEqual(d.isoformat(), expected)
+            self.assertEqual(Duration.fromisoformat(expected), d)
+
+    def test_fromisoformat(self):
+        for string, expected in [('P1W', Duration(weeks=1)),
+                                 ('+P1D', Duration(1)),
+                                 ('-PT0S', Duration(0)),
+                                 ('P0D', Duration(0)),
+                                 ('PT1,5S', Duration(0, 1, 500000)),
+                                 ('PT36H', Duration(1, 43200)),
+                                 ('PT90M', Duration(0, 5400)),
+                                 ('P1DT100000S', Duration(2, 13600)),
+                                 ('PT1M0.000010S', Duration(0, 60, 10))]:
+            self.assertEqual(Duration.fromisoformat(string), expected)
+
+        for bad in ('', 'P', 'PT', 'P1DT', 'PT1', 'P1Y', 'P1M', 'P1W2D',
+                    'P1.5D', 'PT1.5M', 'PT1.1234567S', 'PT.5S', '1D',
+                    'p1d', 'PT1S ', ' PT1S', 'PT1M1H', 'P-1D',
+                    'PT\uff11S'):
+            self.assertRaises(ValueError, Duration.fromisoformat, bad)
+        self.assertRaises(TypeError, Duration.fromisoformat, b'P1D')
+        self.assertRaises(TypeError, Duration.fromisoformat, 1)
+
+    def test_parse_durations(self):
+        rows = ['P1D', 'P1Y', '-PT0.5S', 'garbage']
+        durations, errors = parse_durations(rows)
+        self.assertEqual(durations, [Duration(1), None,
+                                     Duration(0, 0, -500000), None])
+        self.assertEqual([index for index, e in errors], [1, 3])
+        for index, e in errors:
+            self.assertIsInstance(e, ValueError)
+
+        buffer = b'P1D\r\nP1Y\r\n-PT0.5S\r\ngarbage\r\n'
+        us, errors = parse_durations(buffer, microseconds=True)
+        self.assertEqual(list(us), [86400000000, 0, -500000, 0])
+        self.assertEqual([index for index, e in errors], [1, 3])
+        self.assertEqual(list(parse_durations(bytearray(buffer), True)[0]),
+                         list(us))
+        self.assertEqual(parse_durations('\n'.join(rows))[0], durations)
+
+        # Too large for the array.
+        us, errors = parse_durations(['P999999999999D'], microseconds=True)
+        self.assertEqual(list(us), [0])
+        self.assertIsInstance(errors[0][1], OverflowError)
+
+        durations, errors = parse_durations([b'PT1S', 1])
+        self.assertEqual(durations, [Duration(0, 1), None])
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][1], TypeError)
+
     def test_bool(self):
         self.assertTrue(Duration(1))
         self.assertTrue(Duration(0, 1))
@@ -0,0 +1,189 @@
+import operator
+import unittest
+import tests
+
+from tider import Duration
+
+if tests.numpy is not None:
+    import numpy as np
+    from tider import DurationArray
+
+
+@tests.requires_numpy
+class TestDurationArray(unittest.TestCase):
+
+    def setUp(self):
+        self.durations = [Duration(0, 0, 1), Duration(-1), Duration(0, 1.5),
+                          Duration(3, 7200, 250), Duration(0)]
+        self.array = DurationArray(self.durations)
+
+    def test_indexing(self):
+        # The indexing itself is tested in test_arraybase.
+        mask = self.array > Duration(0)
+        filtered = self.array[mask]
+        self.assertIsInstance(filtered, DurationArray)
+        self.assertEqual(filtered.tolist(),
+                         [x for x in self.durations if x > Duration(0)])
+        self.assertIsInstance(self.array[np.int64(2)], Duration)
+        self.assertEqual(self.array[[3, 0]].tolist(),
+                         [self.durations[3], self.durations[0]])
+
+    def test_roundtrip(self):
+        self.assertEqual(len(self.array), 5)
+        self.assertEqual(self.array.tolist(), self.durations)
+        self.assertEqual(list(self.array), self.durations)
+        self.assertEqual(self.array[1], Duration(-1))
+        self.assertEqual(self.array[-1], Duration(0))
+        self.assertEqual(self.array[1:3].tolist(), self.durations[1:3])
+        self.assertEqual(len(DurationArray()), 0)
+        self.assertEqual(repr(DurationArray([Duration(1)])),
+                         'tider.DurationArray([tider.Duration(1)])')
+
+    def test_microseconds(self):
+        us = self.array.total_microseconds()
+        self.assertEqual(us.dtype, np.int64)
+        self.assertEqual(us.tolist(),
+                         [d.total_microseconds() for d in self.durations])
+        self.assertFalse(us.flags.writeable)
+        other = DurationArray.frommicroseconds(us)
+        self.assertEqual(other.tolist(), self.durations)
+
+        self.assertRaises(TypeError, DurationArray.frommicroseconds, [1.5])
+        self.assertRaises(ValueError, DurationArray.frommicroseconds,
+                          [[1, 2]])
+
+    def test_total_seconds(self):
+        seconds = self.array.total_seconds()
+        self.assertEqual(seconds.dtype, np.float64)
+        self.assertEqual(seconds.tolist(),
+                         [d.total_seconds() for d in self.durations])
+
+    def test_arithmetic(self):
+        d = Duration(0, 30, 7)
+        for result, expected in [
+                (self.array + d, [x + d for x in self.durations]),
+                (d + self.array, [d + x for x in self.durations]),
+                (self.array - d, [x - d for x in self.durations]),
+                (d - self.array, [d - x for x in self.durations]),
+                (-self.array, [-x for x in self.durations]),
+                (abs(self.array), [abs(x) for x in self.durations]),
+                (self.array * 3, [x * 3 for x in self.durations]),
+                (2 * self.array, [2 * x for x in self.durations]),
+                (self.array * 0.3, [x * 0.3 for x in self.durations]),
+                (self.array // 7, [x // 7 for x in self.durations]),
+                (self.array / 7, [x / 7 for x in self.durations]),
+                (self.array / 0.7, [x / 0.7 for x in self.durations]),
+                (self.array + self.array, [x + x for x in self.durations])]:
+            self.assertIsInstance(result, DurationArray)
+            self.assertEqual(result.tolist(), expected)
+
+        self.assertEqual((self.array // d).tolist(),
+                         [x // d for x in self.durations])
+        self.assertEqual((self.array / d).tolist(),
+                         [x / d for x in self.durations])
+        self.assertEqual((self.array * np.arange(5)).tolist(),
+                         [x * i for i, x in enumerate(self.durations)])
+
+        self.assertRaises(TypeError, lambda: self.array + 1)
+        self.assertRaises(TypeError, lambda: self.array * d)
+        self.assertRaises(TypeError, lambda: self.array * 'a')
+
+    def test_division_by_zero(self):
+        zeros = DurationArray.frommicroseconds(np.arange(5))
+        for divisor in (Duration(0), zeros, 0, np.arange(5)):
+            self.assertRaises(ZeroDivisionError,
+                              lambda: self.array // divisor)
+            self.assertRaises(ZeroDivisionError,
+                              lambda: self.array / divisor)
+        self.assertRaises(ZeroDivisionError, lambda: self.array / 0.0)
+
+    def test_comparisons(self):
+        d = Duration(0, 1)
+        self.assertEqual((self.array < d).tolist(),
+                         [x < d for x in self.durations])
+        self.assertEqual((self.array >= d).tolist(),
+                         [x >= d for x in self.durations])
+        self.assertEqual((self.array == self.array).tolist(), [True] * 5)
+        self.assertEqual((self.array != Duration(-1)).tolist(),
+                         [True, False, True, True, True])
+        self.assertRaises(TypeError, hash, self.array)
+
+    def test_reflected_comparisons(self):
+        # With the Duration on the left, the DurationArray's reflected
+        # methods are used.
+        for d in (Duration(0, 1), Duration(-1), Duration(0)):
+            for op in (operator.eq, operator.ne, operator.lt, operator.le,
+                       operator.gt, operator.ge):
+                expected = [op(d, x) for x in self.durations]
+                self.assertEqual(op(d, self.array).tolist(), expected)
+                self.assertEqual(op(self.array, d).tolist(),
+                                 [op(x, d) for x in self.durations])
+        self.assertRaises(TypeError, lambda: Duration(1) < 1)
+        self.assertFalse(Duration(1) == 1)
+        self.assertTrue(Duration(1) != 'a')
+
+    def test_reductions(self):
+        self.assertEqual(self.array.sum(), sum(self.durations, Duration(0)))
+        self.assertEqual(self.array.min(), min(self.durations))
+        self.assertEqual(self.array.max(), max(self.durations))
+        self.assertEqual(self.array.mean(),
+                         sum(self.durations, Duration(0)) / 5)
+        self.assertEqual(DurationArray().sum(), Duration(0))
+        # The mean rounds half to even.
+        self.assertEqual(DurationArray.frommicroseconds([1, 2]).mean(),
+                         Duration(0, 0, 2))
+        self.assertEqual(DurationArray.frommicroseconds([2, 3]).mean(),
+                         Duration(0, 0, 2))
+        self.assertEqual(DurationArray.frommicroseconds([-1, -2]).mean(),
+                         Duration(0, 0, -2))
+        for name in ('mean', 'min', 'max'):
+            self.assertRaises(ValueError, getattr(DurationArray(), name))
+        # Sums beyond the int64 range don't wrap around.
+        for us in ([2**62, 2**62, 2**62], [-2**63, -2**63, 1]):
+            array = DurationArray.frommicroseconds(us)
+            self.assertEqual(array.sum().total_microseconds(), sum(us))
+            self.assertEqual(array.mean().total_microseconds(),
+                             sum(us) // 3)
+        self.assertRaises(ValueError, DurationArray().percentile, 50)
+
+    def test_percentile(self):
+        array = DurationArray.frommicroseconds(range(101))
+        self.assertEqual(array.percentile(50), Duration(0, 0, 50))
+        self.assertEqual(array.percentile([0, 99, 100]),
+                         [Duration(0), Duration(0, 0, 99),
+                          Duration(0, 0, 100)])
+        array = DurationArray.frommicroseconds([10, 20])
+        self.assertEqual(array.percentile(25), Duration(0, 0, 12))
+
+    def test_histogram(self):
+        array = DurationArray.frommicroseconds([-5, 0, 9, 10, 15, 30])
+        counts, edges = array.histogram(Duration(0, 0, 10))
+        self.assertEqual(counts.tolist(), [1, 2, 2, 0, 1])
+        self.assertEqual(edges.total_microseconds().tolist(),
+                         [-10, 0, 10, 20, 30, 40])
+
+        counts, edges = array.histogram([Duration(0), Duration(0, 0, 10),
+                                         Duration(0, 0, 30)])
+        self.assertEqual(counts.tolist(), [2, 3])
+        self.assertEqual(edges.tolist(),
+                         [Duration(0), Duration(0, 0, 10),
+                          Duration(0, 0, 30)])
+
+        counts, edges = DurationArray().histogram(Duration(1))
+        self.assertEqual(counts.tolist(), [])
+        self.assertEqual(len(edges), 1)
+
+        self.assertRaises(ValueError, array.histogram, Duration(0))
+        self.assertRaises(ValueError, array.histogram,
+                          [Duration(1), Duration(0)])
+
+    def test_numpy_agrees(self):
+        rnd = np.random.default_rng(42)
+        us = rnd.integers(-10**12, 10**12, 1000)
+        array = DurationArray.frommicroseconds(us)
+        self.assertEqual(array.sum().total_microseconds(), int(us.sum()))
+        counts, edges = array.histogram(list(DurationArray.frommicroseconds(
+            np.linspace(-10**12, 10**12, 11).astype(np.int64))))
+        expected, _ = np.histogram(us, np.linspace(-10**12, 10**12, 11))
+        self.assertEqual(counts.tolist(), expected.tolist())
+
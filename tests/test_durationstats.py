@@ -0,0 +1,131 @@
+import pickle
+import random
+import unittest
+import tests
+
+from tider import Duration, DurationStats
+
+if tests.numpy is not None:
+    from tider import DurationArray
+
+
+class TestDurationStats(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(42)
+        # Latencies from a microsecond up to a minute, and a few negative
+        # and zero durations.
+        self.values = ([int(10 ** rnd.uniform(0, 7.8)) for i in range(5000)] +
+                       [-rnd.randrange(1, 10 ** 6) for i in range(500)] +
+                       [0] * 50)
+        rnd.shuffle(self.values)
+
+    def check_percentiles(self, stats, values, accuracy=0.01):
+        values = sorted(values)
+        for q in (0, 1, 10, 25, 50, 75, 90, 99, 99.9, 100):
+            # The sketch returns the value at the rank rounded down.
+            exact = values[int(q / 100 * (len(values) - 1))]
+            got = stats.percentile(q).total_microseconds()
+            self.assertLessEqual(abs(got - exact), accuracy * abs(exact) + 0.5,
+                                 (q, got, exact))
+
+    def test_exact_statistics(self):
+        stats = DurationStats()
+        stats.update(Duration(0, 0, us) for us in self.values)
+        self.assertEqual(stats.count, len(self.values))
+        self.assertEqual(stats.sum, Duration(0, 0, sum(self.values)))
+        self.assertEqual(stats.min, Duration(0, 0, min(self.values)))
+        self.assertEqual(stats.max, Duration(0, 0, max(self.values)))
+        self.assertEqual(stats.mean,
+                         Duration(0, 0, sum(self.values)) / len(self.values))
+        self.assertEqual(stats.relative_accuracy, 0.01)
+
+    def test_percentiles(self):
+        stats = DurationStats()
+        stats.update(self.values)
+        self.check_percentiles(stats, self.values)
+        self.assertEqual(stats.percentile(0), stats.min)
+        self.assertEqual(stats.percentile(100), stats.max)
+        self.assertEqual(stats.percentile([50, 99]),
+                         [stats.percentile(50), stats.percentile(99)])
+
+        stats = DurationStats(0.001)
+        stats.update(self.values)
+        self.check_percentiles(stats, self.values, 0.001)
+
+    def test_bounded(self):
+        stats = DurationStats()
+        for i in range(100000):
+            stats.add(i * 997)
+        # The buckets only depend on the range of the durations.
+        self.assertLess(len(stats._positive), 1500)
+
+    def test_merge(self):
+        whole = DurationStats()
+        whole.update(self.values)
+        parts = [DurationStats() for i in range(4)]
+        for i, us in enumerate(self.values):
+            parts[i % 4].add(us)
+        merged = DurationStats()
+        for part in parts:
+            merged.merge(part)
+        merged.merge(DurationStats())
+        for name in ('count', 'sum', 'min', 'max', 'mean'):
+            self.assertEqual(getattr(merged, name), getattr(whole, name))
+        self.assertEqual(merged.percentile([1, 50, 99]),
+                         whole.percentile([1, 50, 99]))
+
+        self.assertRaises(ValueError, merged.merge, DurationStats(0.02))
+        self.assertRaises(TypeError, merged.merge, whole.sum)
+
+    def test_pickling(self):
+        stats = DurationStats()
+        stats.update(self.values)
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            derived = pickle.loads(pickle.dumps(stats, proto))
+            self.assertEqual(derived.count, stats.count)
+            self.assertEqual(derived.percentile(90), stats.percentile(90))
+            derived.add(1)
+            self.assertEqual(derived.count, stats.count + 1)
+
+    def test_empty(self):
+        stats = DurationStats()
+        self.assertEqual(stats.count, 0)
+        self.assertEqual(stats.sum, Duration(0))
+        for name in ('min', 'max', 'mean'):
+            self.assertRaises(ValueError, getattr, stats, name)
+        self.assertRaises(ValueError, stats.percentile, 50)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, DurationStats, 0)
+        self.assertRaises(ValueError, DurationStats, 1)
+        stats = DurationStats()
+        self.assertRaises(TypeError, stats.add, 1.5)
+        self.assertRaises(TypeError, stats.add, '1')
+        stats.add(Duration(1))
+        self.assertRaises(ValueError, stats.percentile, 101)
+        self.assertRaises(ValueError, stats.percentile, -1)
+
+    @tests.requires_numpy
+    def test_durationarray(self):
+        stats = DurationStats()
+        stats.update(self.values)
+        array_stats = DurationStats()
+        array_stats.update(DurationArray.frommicroseconds(self.values[:3000]))
+        array_stats.update(DurationArray())
+        array_stats.update(DurationArray.frommicroseconds(self.values[3000:]))
+        for name in ('count', 'sum', 'min', 'max', 'mean'):
+            self.assertEqual(getattr(array_stats, name), getattr(stats, name))
+        self.check_percentiles(array_stats, self.values)
+
+    @tests.requires_numpy
+    def test_durationarray_large_sum(self):
+        # The sum doesn't wrap around in int64.
+        values = [2**62] * 3
+        stats = DurationStats()
+        stats.update(values)
+        array_stats = DurationStats()
+        array_stats.update(DurationArray.frommicroseconds(values))
+        self.assertEqual(array_stats.sum, Duration(microseconds=3 * 2**62))
+        self.assertEqual(array_stats.sum, stats.sum)
+        self.assertEqual(array_stats.mean, stats.mean)
@@ -1,8 +1,9 @@
+import time
 import unittest
 import tests
 import tider  # Must be imported for eval to work in the roundtrip test.
 
-from tider import Duration, Time
+from tider import Duration, Time, parse_times
 
 NAN = float("nan")
 INF = float("inf")
@@ -111,6 +112,16 @@ class TestTime(tests.HarmlessMixedComparison, unittest.TestCase):
         self.assertRaises(ValueError, self.theclass, 23, 59, 59, -1)
         self.assertRaises(ValueError, self.theclass, 23, 59, 59, 1000000)
 
+    def test_hash_cached(self):
+        # The hash is worked out on first use, and then kept.
+        d = self.theclass(23, 30, 17, 5)
+        self.assertEqual(d._hashcode, -1)
+        h = hash(d)
+        self.assertEqual(d._hashcode, h)
+        self.assertEqual(hash(d), h)
+        self.assertEqual(hash(self.theclass(23, 30, 17, 5)), h)
+        self.assertEqual(h, hash(d._us))
+
     def test_hash_equality(self):
         d = self.theclass(23, 30, 17)
         e = self.theclass(23, 30, 17)
@@ -167,6 +178,48 @@ class TestTime(tests.HarmlessMixedComparison, unittest.TestCase):
         self.assertEqual(t.isoformat(), "00:00:00.100000")
         self.assertEqual(t.isoformat(), str(t))
 
+    def test_fromisoformat(self):
+        for t in (self.theclass(), self.theclass(23, 59, 59, 999999),
+                  self.theclass(4, 5, 1, 123), self.theclass(12, 30, 1)):
+            self.assertEqual(self.theclass.fromisoformat(t.isoformat()), t)
+        for string, expected in [('12:30', (12, 30)),
+                                 ('12:30:15', (12, 30, 15)),
+                                 ('12:30:15.5', (12, 30, 15, 500000)),
+                                 ('12:30:15,123', (12, 30, 15, 123000)),
+                                 ('00:00:00.000001', (0, 0, 0, 1))]:
+            t = self.theclass.fromisoformat(string)
+            self.assertIs(type(t), self.theclass)
+            self.assertEqual(t, self.theclass(*expected))
+
+        for bad in ('', '1:30', '24:00', '12:60', '12:30:60', '12:3',
+                    '12:30:', '12:30:15.', '12:30:15.1234567', '12:30.5',
+                    '12:30:15Z', ' 12:30', '12:30 ', '1230', '\uff11\uff12:30'):
+            self.assertRaises(ValueError, self.theclass.fromisoformat, bad)
+        self.assertRaises(TypeError, self.theclass.fromisoformat, b'12:30')
+        self.assertRaises(TypeError, self.theclass.fromisoformat, 1230)
+
+    def test_parse_times(self):
+        rows = ['12:30', '24:00', '23:59:59.999999', 'garbage']
+        times, errors = parse_times(rows)
+        self.assertEqual(times, [Time(12, 30), None,
+                                 Time(23, 59, 59, 999999), None])
+        self.assertEqual([index for index, e in errors], [1, 3])
+        for index, e in errors:
+            self.assertIsInstance(e, ValueError)
+
+        buffer = b'12:30\r\n24:00\r\n23:59:59.999999\r\ngarbage\r\n'
+        us, errors = parse_times(buffer, microseconds=True)
+        self.assertEqual(list(us), [45000000000, -1, 86399999999, -1])
+        self.assertEqual([index for index, e in errors], [1, 3])
+        self.assertEqual(list(parse_times(bytearray(buffer), True)[0]),
+                         list(us))
+        self.assertEqual(parse_times('\n'.join(rows))[0], times)
+
+        times, errors = parse_times([b'00:00', 0])
+        self.assertEqual(times, [Time(0), None])
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][1], TypeError)
+
     def test_1653736(self):
         # verify it doesn't accept extra keyword arguments
         t = self.theclass(second=1)
@@ -178,6 +231,16 @@ class TestTime(tests.HarmlessMixedComparison, unittest.TestCase):
         # A naive object replaces %z and %Z with empty strings.
         self.assertEqual(t.strftime("'%z' '%Z'"), "'' ''")
 
+        for t in self.theclass(0, 0), self.theclass(12, 30, 5, 10), \
+                self.theclass(23, 59, 59, 999999):
+            self.assertEqual(t.strftime('%I:%M:%S.%f %p %r %R %T %X %%'),
+                             time.strftime('%I:%M:%S.{:06d} %p %r %R %T %X %%'
+                                           .format(t.microsecond),
+                                           (1900, 1, 1, t.hour, t.minute,
+                                            t.second, 0, 1, -1)))
+        # The date part is January 1st, 1900, a Monday.
+        self.assertEqual(t.strftime('%Y-%m-%d %a %j'), '1900-01-01 Mon 001')
+
     def test_format(self):
         t = self.theclass(1, 2, 3, 4)
         self.assertEqual(t.__format__(''), str(t))
@@ -240,6 +303,23 @@ class TestTime(tests.HarmlessMixedComparison, unittest.TestCase):
             derived = unpickler.loads(green)
             self.assertEqual(orig, derived)
 
+    def test_pickle_state(self):
+        # The state is hour, minute, second and three bytes of
+        # microseconds, as it has always been.
+        t = self.theclass(20, 59, 16, 0x0a0b0c)
+        state = bytes([20, 59, 16, 10, 11, 12])
+        self.assertEqual(t.__reduce__(), (self.theclass, (state,)))
+        self.assertEqual(self.theclass(state), t)
+        self.assertEqual(self.theclass(state).microsecond, 0x0a0b0c)
+
+    def test_fields(self):
+        for args in [(0, 0), (23, 59, 59, 999999), (12, 1, 2, 3),
+                     (1, 59, 0, 500000)]:
+            t = self.theclass(*args)
+            self.assertEqual((t.hour, t.minute, t.second, t.microsecond),
+                             (args + (0, 0))[:4])
+        self.assertFalse(hasattr(self.theclass(1), '__dict__'))
+
     def test_pickling_subclass_time(self):
         args = 20, 59, 16, 64**2
         orig = SubclassTime(*args)
@@ -282,6 +362,8 @@ class TestTime(tests.HarmlessMixedComparison, unittest.TestCase):
         self.assertRaises(ValueError, base.replace, minute=-1)
         self.assertRaises(ValueError, base.replace, second=100)
         self.assertRaises(ValueError, base.replace, microsecond=1000000)
+        self.assertRaises(TypeError, base.replace, hour=1.0)
+        self.assertRaises(TypeError, base.replace, microsecond='1')
 
     def test_subclass_time(self):
 
@@ -0,0 +1,131 @@
+import operator
+import unittest
+import tests
+
+from tider import Duration, Time
+
+if tests.numpy is not None:
+    import numpy as np
+    from tider import DurationArray, TimeArray
+
+
+@tests.requires_numpy
+class TestTimeArray(unittest.TestCase):
+
+    def setUp(self):
+        self.times = [Time(0), Time(4, 5, 1, 123), Time(12, 30),
+                      Time(18, 0, 59, 500000), Time(23, 59, 59, 999999)]
+        self.array = TimeArray(self.times)
+
+    def test_indexing(self):
+        # The indexing itself is tested in test_arraybase.
+        mask = self.array > Time(12, 30)
+        filtered = self.array[mask]
+        self.assertIsInstance(filtered, TimeArray)
+        self.assertEqual(filtered.tolist(),
+                         [x for x in self.times if x > Time(12, 30)])
+        self.assertIsInstance(self.array[np.int64(2)], Time)
+        self.assertEqual(self.array[[3, 0]].tolist(),
+                         [self.times[3], self.times[0]])
+
+    def test_roundtrip(self):
+        self.assertEqual(len(self.array), 5)
+        self.assertEqual(self.array.tolist(), self.times)
+        self.assertEqual(list(self.array), self.times)
+        self.assertEqual(self.array[1], Time(4, 5, 1, 123))
+        self.assertEqual(self.array[-1], Time(23, 59, 59, 999999))
+        self.assertEqual(self.array[1:3].tolist(), self.times[1:3])
+        self.assertEqual(len(TimeArray()), 0)
+
+    def test_microseconds(self):
+        us = self.array.tomicroseconds()
+        self.assertEqual(us.dtype, np.int64)
+        self.assertEqual(us.tolist(), [
+            ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 +
+            t.microsecond for t in self.times])
+        self.assertFalse(us.flags.writeable)
+        self.assertEqual(TimeArray.frommicroseconds(us).tolist(), self.times)
+
+        self.assertRaises(ValueError, TimeArray.frommicroseconds, [-1])
+        self.assertRaises(ValueError, TimeArray.frommicroseconds,
+                          [86400000000])
+        self.assertRaises(ValueError, TimeArray.frommicroseconds, [[1]])
+        self.assertRaises(TypeError, TimeArray.frommicroseconds, [1.5])
+
+    def test_fields(self):
+        for name in ('hour', 'minute', 'second', 'microsecond'):
+            self.assertEqual(getattr(self.array, name).tolist(),
+                             [getattr(t, name) for t in self.times])
+
+    def test_isoformat(self):
+        self.assertEqual(self.array.isoformat().tolist(),
+                         [t.isoformat() for t in self.times])
+        self.assertEqual(repr(self.array[:2]),
+                         "tider.TimeArray(['00:00:00', '04:05:01.000123'])")
+        self.assertEqual(TimeArray().isoformat().tolist(), [])
+
+    def test_comparisons(self):
+        t = Time(12, 30)
+        self.assertEqual((self.array < t).tolist(),
+                         [x < t for x in self.times])
+        self.assertEqual((self.array >= t).tolist(),
+                         [x >= t for x in self.times])
+        self.assertEqual((self.array == t).tolist(),
+                         [False, False, True, False, False])
+        self.assertEqual((self.array != self.array).tolist(), [False] * 5)
+        self.assertRaises(TypeError, lambda: self.array < 1)
+        self.assertRaises(TypeError, hash, self.array)
+
+    def test_reflected_comparisons(self):
+        # With the Time on the left, the TimeArray's reflected methods are
+        # used.
+        for t in (Time(12, 30), Time(0), Time(23, 59)):
+            for op in (operator.eq, operator.ne, operator.lt, operator.le,
+                       operator.gt, operator.ge):
+                self.assertEqual(op(t, self.array).tolist(),
+                                 [op(t, x) for x in self.times])
+                self.assertEqual(op(self.array, t).tolist(),
+                                 [op(x, t) for x in self.times])
+        self.assertRaises(TypeError, lambda: Time(1) < 1)
+        self.assertFalse(Time(1) == 1)
+        self.assertTrue(Time(1) != 'a')
+
+    def test_floor(self):
+        quarter = self.array.floor(Duration(minutes=15))
+        self.assertEqual(quarter.tolist(),
+                         [Time(0), Time(4), Time(12, 30), Time(18),
+                          Time(23, 45)])
+        self.assertEqual(self.array.floor(Duration(1)).tolist(),
+                         [Time(0)] * 5)
+        self.assertEqual(self.array.floor(Duration(0, 0, 1)).tolist(),
+                         self.times)
+        self.assertRaises(ValueError, self.array.floor, Duration(0))
+        self.assertRaises(ValueError, self.array.floor, Duration(0, -1))
+        self.assertRaises(ValueError, self.array.floor, Duration(1, 1))
+        self.assertRaises(TypeError, self.array.floor, 60)
+
+    def test_arithmetic(self):
+        # Time has no arithmetic, so compare with microseconds modulo a day.
+        def shifted(us):
+            return [Time._from_microseconds_unchecked(
+                (t._us + us) % 86400000000) for t in self.times]
+
+        for d in (Duration(0, 1), Duration(0, 0, 1), Duration(-1, 5),
+                  Duration(3, 3600), Duration(0, -7200, -1)):
+            us = d.total_microseconds()
+            self.assertEqual((self.array + d).tolist(), shifted(us))
+            self.assertEqual((d + self.array).tolist(), shifted(us))
+            self.assertEqual((self.array - d).tolist(), shifted(-us))
+
+        self.assertEqual((self.array + Duration(0, 1))[-1],
+                         Time(0, 0, 0, 999999))
+        self.assertEqual((self.array - Duration(0, 0, 1))[0],
+                         Time(23, 59, 59, 999999))
+
+        durations = DurationArray([Duration(0, i * 3600) for i in range(5)])
+        self.assertEqual((self.array + durations).tolist(),
+                         [Time(0), Time(5, 5, 1, 123), Time(14, 30),
+                          Time(21, 0, 59, 500000), Time(3, 59, 59, 999999)])
+
+        self.assertRaises(TypeError, lambda: self.array + 1)
+        self.assertRaises(TypeError, lambda: self.array - Time(1))
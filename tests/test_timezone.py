@@ -1,7 +1,22 @@
+import io
+import pickle
+import random
+import struct
+import threading
 import unittest
 import tider  # Must be imported for eval to work in the roundtrip test.
 
-from tider import FixedTimezone, Duration, Datetime
+from tider import FixedTimezone, PosixTimezone, ZoneInfoTimezone
+from tider import Duration, Datetime
+from tider import timezone as timezone_module
+from tider._tzif import _load_tzif, _parse_posix_tz, _posix_rule_ordinal
+from tider._utils import _ymd2ord
+
+try:
+    import datetime
+    import zoneinfo
+except ImportError:
+    zoneinfo = None
 
 
 ZERO = Duration(0)
@@ -15,7 +30,7 @@ class TestFixedTimezone(unittest.TestCase):
     def setUp(self):
         self.ACDT = FixedTimezone(Duration(hours=9.5), 'ACDT')
         self.EST = FixedTimezone(-Duration(hours=5), 'EST')
-        #self.DT = Datetime(2010, 1, 1)
+        self.DT = Datetime(2010, 1, 1)
 
     def test_str(self):
         for tz in [self.ACDT, self.EST, FixedTimezone.utc,
@@ -47,25 +62,82 @@ class TestFixedTimezone(unittest.TestCase):
         with self.assertRaises(TypeError): FixedTimezone(ZERO, 42)
         with self.assertRaises(TypeError): FixedTimezone(ZERO, 'ABC', 'extra')
 
+    def test_from_offset(self):
+        tz = FixedTimezone.from_offset(-5 * HOUR, 'EST')
+        self.assertIs(FixedTimezone.from_offset(-5 * HOUR, 'EST'), tz)
+        self.assertEqual(tz, self.EST)
+        self.assertEqual(tz.tzname(None), 'EST')
+        self.assertIsNot(FixedTimezone.from_offset(-5 * HOUR), tz)
+        self.assertEqual(FixedTimezone.from_offset(-5 * HOUR).tzname(None),
+                         'UTC-05:00')
+        self.assertIs(FixedTimezone.from_offset(ZERO), FixedTimezone.utc)
+        self.assertIs(FixedTimezone.from_offset(-FixedTimezone.max.utcoffset(None)),
+                      FixedTimezone.min)
+
+        self.assertRaises(ValueError, FixedTimezone.from_offset, DAY)
+        self.assertRaises(ValueError, FixedTimezone.from_offset,
+                          Duration(seconds=1))
+        self.assertRaises(TypeError, FixedTimezone.from_offset, 42)
+        self.assertRaises(TypeError, FixedTimezone.from_offset, ZERO, 42)
+
+        class Subclass(FixedTimezone):
+            pass
+        self.assertIs(type(Subclass.from_offset(HOUR)), Subclass)
+        self.assertIs(type(FixedTimezone.from_offset(HOUR)), FixedTimezone)
+
+    def test_from_offset_named_limit(self):
+        # Only the most recently created named timezones are kept.
+        first = FixedTimezone.from_offset(HOUR, 'name0')
+        for i in range(1, 2 * FixedTimezone._maxnamed):
+            tz = FixedTimezone.from_offset(HOUR, 'name%d' % i)
+        self.assertEqual(len(FixedTimezone._named), FixedTimezone._maxnamed)
+        self.assertIs(FixedTimezone.from_offset(HOUR, 'name%d' % i), tz)
+        self.assertIsNot(FixedTimezone.from_offset(HOUR, 'name0'), first)
+        self.assertEqual(FixedTimezone.from_offset(HOUR, 'name0'), first)
+        self.assertIs(FixedTimezone.from_offset(ZERO), FixedTimezone.utc)
+
+    def test_fromisoformat(self):
+        for string, offset in [('+05:30', 5 * HOUR + 30 * MINUTE),
+                               ('+0530', 5 * HOUR + 30 * MINUTE),
+                               ('-08:00', -8 * HOUR),
+                               ('-08', -8 * HOUR),
+                               ('+23:59', 23 * HOUR + 59 * MINUTE),
+                               ('-00:01', -MINUTE)]:
+            tz = FixedTimezone.fromisoformat(string)
+            self.assertEqual(tz.utcoffset(None), offset)
+            self.assertIs(tz, FixedTimezone.from_offset(offset))
+            self.assertIs(FixedTimezone.fromisoformat(string), tz)
+        self.assertEqual(FixedTimezone.fromisoformat('-0800').tzname(None),
+                         'UTC-08:00')
+        for string in ('Z', '+00:00', '-00:00', '+00'):
+            self.assertIs(FixedTimezone.fromisoformat(string),
+                          FixedTimezone.utc)
+
+        for bad in ('', 'z', 'UTC', '05:30', '+5:30', '+24:00', '+05:60',
+                    '+05:3', '+05:30:00', '+05:30 ', '+0530Z', '\u221205:00'):
+            self.assertRaises(ValueError, FixedTimezone.fromisoformat, bad)
+        self.assertRaises(TypeError, FixedTimezone.fromisoformat, b'Z')
+        self.assertRaises(TypeError, FixedTimezone.fromisoformat, 0)
+
     def test_inheritance(self):
         self.assertIsInstance(FixedTimezone.utc, FixedTimezone)
         self.assertIsInstance(self.EST, FixedTimezone)
 
-    #def test_utcoffset(self):
-        #dummy = self.DT
-        #for h in [0, 1.5, 12]:
-            #offset = h * HOUR
-            #self.assertEqual(offset, FixedTimezone(offset).utcoffset(dummy))
-            #self.assertEqual(-offset, FixedTimezone(-offset).utcoffset(dummy))
+    def test_utcoffset(self):
+        dummy = self.DT
+        for h in [0, 1.5, 12]:
+            offset = h * HOUR
+            self.assertEqual(offset, FixedTimezone(offset).utcoffset(dummy))
+            self.assertEqual(-offset, FixedTimezone(-offset).utcoffset(dummy))
 
-        #with self.assertRaises(TypeError): self.EST.utcoffset('')
-        #with self.assertRaises(TypeError): self.EST.utcoffset(5)
+        with self.assertRaises(TypeError): self.EST.utcoffset('')
+        with self.assertRaises(TypeError): self.EST.utcoffset(5)
 
-    #def test_dst(self):
-        #self.assertIsNone(FixedTimezone.utc.dst(self.DT))
+    def test_dst(self):
+        self.assertIsNone(FixedTimezone.utc.dst(self.DT))
 
-        #with self.assertRaises(TypeError): self.EST.dst('')
-        #with self.assertRaises(TypeError): self.EST.dst(5)
+        with self.assertRaises(TypeError): self.EST.dst('')
+        with self.assertRaises(TypeError): self.EST.dst(5)
 
     def test_tzname(self):
         self.assertEqual('UTC+00:00', FixedTimezone(ZERO).tzname(None))
@@ -77,17 +149,18 @@ class TestFixedTimezone(unittest.TestCase):
         with self.assertRaises(TypeError): self.EST.tzname('')
         with self.assertRaises(TypeError): self.EST.tzname(5)
 
-    #def test_fromutc(self):
-        #with self.assertRaises(ValueError):
-            #FixedTimezone.utc.fromutc(self.DT)
-        #with self.assertRaises(TypeError):
-            #FixedTimezone.utc.fromutc('not Datetime')
-        #for tz in [self.EST, self.ACDT, Eastern]:
-            #utctime = self.DT.replace(tzinfo=tz)
-            #local = tz.fromutc(utctime)
-            #self.assertEqual(local - utctime, tz.utcoffset(local))
-            #self.assertEqual(local,
-                             #self.DT.replace(tzinfo=FixedTimezone.utc))
+    def test_fromutc(self):
+        with self.assertRaises(ValueError):
+            FixedTimezone.utc.fromutc(self.DT)
+        with self.assertRaises(TypeError):
+            FixedTimezone.utc.fromutc('not Datetime')
+        Eastern = PosixTimezone('EST5EDT,M3.2.0,M11.1.0')
+        for tz in [self.EST, self.ACDT, Eastern]:
+            utctime = self.DT.replace(tzinfo=tz)
+            local = tz.fromutc(utctime)
+            self.assertEqual(local - utctime, tz.utcoffset(local))
+            self.assertEqual(local,
+                             self.DT.replace(tzinfo=FixedTimezone.utc))
 
     def test_comparison(self):
         self.assertNotEqual(FixedTimezone(ZERO), FixedTimezone(HOUR))
@@ -98,14 +171,398 @@ class TestFixedTimezone(unittest.TestCase):
         self.assertTrue(FixedTimezone(ZERO) != None)
         self.assertFalse(FixedTimezone(ZERO) ==  None)
 
-    #def test_aware_Datetime(self):
-        ## test that FixedTimezone instances can be used by Datetime
-        #t = Datetime(1, 1, 1)
-        #for tz in [FixedTimezone.min, FixedTimezone.max, FixedTimezone.utc]:
-            #self.assertEqual(tz.tzname(t),
-                             #t.replace(tzinfo=tz).tzname())
-            #self.assertEqual(tz.utcoffset(t),
-                             #t.replace(tzinfo=tz).utcoffset())
-            #self.assertEqual(tz.dst(t),
-                             #t.replace(tzinfo=tz).dst())
+    def test_aware_Datetime(self):
+        # test that FixedTimezone instances can be used by Datetime
+        t = Datetime(1, 1, 1)
+        for tz in [FixedTimezone.min, FixedTimezone.max, FixedTimezone.utc]:
+            self.assertEqual(tz.tzname(t),
+                             t.replace(tzinfo=tz).tzname())
+            self.assertEqual(tz.utcoffset(t),
+                             t.replace(tzinfo=tz).utcoffset())
+            self.assertEqual(tz.dst(t),
+                             t.replace(tzinfo=tz).dst())
+
+
+def make_tzif(transitions, ttinfos, footer):
+    """Build a version 2 TZif file, with an empty version 1 part."""
+    chars = b''
+    records = []
+    for utoff, isdst, abbr in ttinfos:
+        records.append(struct.pack('>lBB', utoff, isdst, len(chars)))
+        chars += abbr.encode('ascii') + b'\0'
+    v1 = struct.pack('>4sc15x6l', b'TZif', b'2', 0, 0, 0, 0, 1, 1)
+    v1 += struct.pack('>lBB', 0, 0, 0) + b'\0'
+    v2 = struct.pack('>4sc15x6l', b'TZif', b'2', 0, 0, 0, len(transitions),
+                     len(ttinfos), len(chars))
+    v2 += b''.join(struct.pack('>q', t) for t, i in transitions)
+    v2 += bytes(i for t, i in transitions)
+    v2 += b''.join(records) + chars
+    return v1 + v2 + b'\n' + footer.encode('ascii') + b'\n'
+
+
+class TestTZif(unittest.TestCase):
+
+    def test_load(self):
+        data = make_tzif([(-100, 1), (0, 2), (100, 1)],
+                         [(3600, 0, 'LMT'), (-18000, 0, 'EST'),
+                          (-14400, 1, 'EDT')],
+                         'EST5EDT,M3.2.0,M11.1.0')
+        transitions, types, ttinfos, footer = _load_tzif(data)
+        self.assertEqual(list(transitions), [-100, 0, 100])
+        self.assertEqual(list(types), [1, 2, 1])
+        self.assertEqual(ttinfos, [(3600, 0, 'LMT'), (-18000, 0, 'EST'),
+                                   (-14400, 1, 'EDT')])
+        self.assertEqual(footer, 'EST5EDT,M3.2.0,M11.1.0')
+
+        for bad in (b'', b'TZif', data[:-1], b'TZjf' + data[4:],
+                    data[:60]):
+            self.assertRaises(ValueError, _load_tzif, bad)
+
+    def test_parse_posix_tz(self):
+        self.assertEqual(_parse_posix_tz('UTC0'),
+                         ('UTC', 0, None, None, None, None))
+        self.assertEqual(_parse_posix_tz('<+0330>-3:30'),
+                         ('+0330', 12600, None, None, None, None))
+        self.assertEqual(_parse_posix_tz('EST5EDT,M3.2.0,M11.1.0'),
+                         ('EST', -18000, 'EDT', -14400,
+                          ('M', 3, 2, 0, 7200), ('M', 11, 1, 0, 7200)))
+        self.assertEqual(_parse_posix_tz('IST-1GMT0,M10.5.0,M3.5.0/1'),
+                         ('IST', 3600, 'GMT', 0,
+                          ('M', 10, 5, 0, 7200), ('M', 3, 5, 0, 3600)))
+        self.assertEqual(_parse_posix_tz('<-03>3<-02>,M3.5.0/-2,M10.5.0/-1'),
+                         ('-03', -10800, '-02', -7200,
+                          ('M', 3, 5, 0, -7200), ('M', 10, 5, 0, -3600)))
+        self.assertEqual(_parse_posix_tz('AAA-10BBB-11:30,J60/25,300/1:02:03'),
+                         ('AAA', 36000, 'BBB', 41400,
+                          ('J', 60, 0, 0, 90000), ('N', 300, 0, 0, 3723)))
+        for bad in ('', 'UTC', 'EST5EDT', 'EST5EDT,M3.2.0', 'E5',
+                    'EST25', 'EST5:60', 'EST5EDT,M13.1.0,M11.1.0',
+                    'EST5EDT,M3.6.0,M11.1.0', 'EST5EDT,M3.2.7,M11.1.0',
+                    'EST5EDT,J0,J365', 'EST5EDT,0,366',
+                    'EST5EDT,M3.2.0/168,M11.1.0'):
+            self.assertRaises(ValueError, _parse_posix_tz, bad)
+
+    def test_rule_ordinal(self):
+        # The second Sunday of March and the first Sunday of November.
+        self.assertEqual(_posix_rule_ordinal(('M', 3, 2, 0, 0), 2024),
+                         _ymd2ord(2024, 3, 10))
+        self.assertEqual(_posix_rule_ordinal(('M', 11, 1, 0, 0), 2024),
+                         _ymd2ord(2024, 11, 3))
+        # The last Sunday of October, when the fifth doesn't exist.
+        self.assertEqual(_posix_rule_ordinal(('M', 10, 5, 0, 0), 2023),
+                         _ymd2ord(2023, 10, 29))
+        self.assertEqual(_posix_rule_ordinal(('M', 2, 5, 4, 0), 2024),
+                         _ymd2ord(2024, 2, 29))
+        # Julian days never count February 29th, zero based days do.
+        self.assertEqual(_posix_rule_ordinal(('J', 60, 0, 0, 0), 2024),
+                         _ymd2ord(2024, 3, 1))
+        self.assertEqual(_posix_rule_ordinal(('J', 60, 0, 0, 0), 2023),
+                         _ymd2ord(2023, 3, 1))
+        self.assertEqual(_posix_rule_ordinal(('N', 59, 0, 0, 0), 2024),
+                         _ymd2ord(2024, 2, 29))
+        self.assertEqual(_posix_rule_ordinal(('N', 365, 0, 0, 0), 2024),
+                         _ymd2ord(2024, 12, 31))
+
+
+class TestZoneInfoTimezone(unittest.TestCase):
+
+    def setUp(self):
+        self.data = make_tzif([(-100000, 1), (0, 2), (1000000, 1)],
+                              [(3600, 0, 'LMT'), (-18000, 0, 'EST'),
+                               (-14400, 1, 'EDT')],
+                              'EST5EDT,M3.2.0,M11.1.0')
+        self.tz = ZoneInfoTimezone.from_file(io.BytesIO(self.data), 'Test')
+
+    def test_find_utc(self):
+        tz = self.tz
+        self.assertEqual(tz._find_utc(-100001)[3], 'LMT')
+        self.assertEqual(tz._find_utc(-100000)[3], 'EST')
+        self.assertEqual(tz._find_utc(-1)[3], 'EST')
+        self.assertEqual(tz._find_utc(0)[3], 'EDT')
+        self.assertEqual(tz._find_utc(0)[1], Duration(hours=-4))
+        self.assertEqual(tz._find_utc(0)[2], Duration(hours=1))
+        self.assertEqual(tz._find_utc(999999)[3], 'EDT')
+        # After the last transition, the footer is used.  In 2024 EDT
+        # started at 2024-03-10 07:00 UTC and ended at 2024-11-03 06:00 UTC.
+        start = (_ymd2ord(2024, 3, 10) - 719163) * 86400 + 7 * 3600
+        end = (_ymd2ord(2024, 11, 3) - 719163) * 86400 + 6 * 3600
+        self.assertEqual(tz._find_utc(start - 1)[3], 'EST')
+        self.assertEqual(tz._find_utc(start)[3], 'EDT')
+        self.assertEqual(tz._find_utc(end - 1)[3], 'EDT')
+        self.assertEqual(tz._find_utc(end)[3], 'EST')
+        self.assertEqual(tz._find_utc(end)[2], Duration(0))
+
+    def test_pickle_without_key(self):
+        # A zone from a file without a key can't be found again.
+        tz = ZoneInfoTimezone.from_file(io.BytesIO(self.data))
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertRaises(pickle.PicklingError, pickle.dumps, tz, proto)
+
+    def test_find_wall(self):
+        tz = self.tz
+        # 2024-03-10 02:00 to 03:00 doesn't exist, and gets EST.
+        start = (_ymd2ord(2024, 3, 10) - 719163) * 86400 + 2 * 3600
+        self.assertEqual(tz._find_wall(start - 1)[3], 'EST')
+        self.assertEqual(tz._find_wall(start)[3], 'EST')
+        self.assertEqual(tz._find_wall(start + 3599)[3], 'EST')
+        self.assertEqual(tz._find_wall(start + 3600)[3], 'EDT')
+        # 2024-11-03 01:00 to 02:00 happens twice, and gets EDT.
+        end = (_ymd2ord(2024, 11, 3) - 719163) * 86400 + 1 * 3600
+        self.assertEqual(tz._find_wall(end - 1)[3], 'EDT')
+        self.assertEqual(tz._find_wall(end)[3], 'EDT')
+        self.assertEqual(tz._find_wall(end + 3599)[3], 'EDT')
+        self.assertEqual(tz._find_wall(end + 3600)[3], 'EST')
+        # The transition at 0 UTC is at 20:00 EDT.
+        self.assertEqual(tz._find_wall(-14401)[3], 'EST')
+        self.assertEqual(tz._find_wall(-14400)[3], 'EDT')
+
+    def test_limits(self):
+        for t in (-62135596800, 253402300799):
+            self.assertIn(self.tz._find_utc(t)[3], ('LMT', 'EST'))
+            self.assertIn(self.tz._find_wall(t)[3], ('LMT', 'EST'))
+
+    def test_protocol(self):
+        tz = self.tz
+        self.assertEqual(tz.key, 'Test')
+        self.assertEqual(str(tz), 'Test')
+        self.assertEqual(repr(tz), "tider.ZoneInfoTimezone('Test')")
+        self.assertIsNone(tz.utcoffset(None))
+        self.assertIsNone(tz.dst(None))
+        self.assertIsNone(tz.tzname(None))
+        for method in (tz.utcoffset, tz.dst, tz.tzname, tz.fromutc):
+            self.assertRaises(TypeError, method, 5)
+            self.assertRaises(TypeError, method, '')
+
+    def test_keys(self):
+        self.assertRaises(TypeError, ZoneInfoTimezone, None)
+        for bad in ('', '/etc/passwd', '../zoneinfo/UTC', 'Europe/../UTC',
+                    'Europe//Stockholm', 'Nowhere/Nothing'):
+            self.assertRaises(ValueError, ZoneInfoTimezone, bad)
+
+    @unittest.skipIf(zoneinfo is None, 'test requires zoneinfo')
+    def test_zones(self):
+        points = range(-2208988800, 4102444800, 86400 * 7 + 3607)
+        for key in ('America/New_York', 'Europe/Dublin', 'Europe/Stockholm',
+                    'Australia/Lord_Howe', 'Asia/Kolkata',
+                    'America/Santiago', 'Pacific/Apia', 'UTC'):
+            try:
+                tz = ZoneInfoTimezone(key)
+            except ValueError:
+                self.skipTest('zoneinfo files not found')
+            ref = zoneinfo.ZoneInfo(key)
+            for t in points:
+                utc = datetime.datetime.fromtimestamp(t, datetime.timezone.utc)
+                local = utc.astimezone(ref)
+                ttinfo = tz._find_utc(t)
+                self.assertEqual(ttinfo[0], local.utcoffset().total_seconds())
+                self.assertEqual(ttinfo[3], local.tzname())
+                self.assertEqual(ttinfo[2].total_seconds(),
+                                 local.dst().total_seconds())
+
+                wall = local.replace(fold=0)
+                seconds = t + int(local.utcoffset().total_seconds())
+                ttinfo = tz._find_wall(seconds)
+                self.assertEqual(ttinfo[0], wall.utcoffset().total_seconds())
+                self.assertEqual(ttinfo[3], wall.tzname())
+
+            self.assertIs(type(pickle.loads(pickle.dumps(tz))),
+                          ZoneInfoTimezone)
+
+
+class TestPosixTimezone(unittest.TestCase):
+
+    def seconds(self, year, month, day, hour=0):
+        return (_ymd2ord(year, month, day) - 719163) * 86400 + hour * 3600
+
+    def test_northern(self):
+        tz = PosixTimezone('EST5EDT,M3.2.0,M11.1.0')
+        for year, start, end in ((2024, 10, 3), (2025, 9, 2), (2026, 8, 1)):
+            start = self.seconds(year, 3, start, 7)
+            end = self.seconds(year, 11, end, 6)
+            self.assertEqual(tz._find_utc(start - 1)[3], 'EST')
+            self.assertEqual(tz._find_utc(start)[3], 'EDT')
+            self.assertEqual(tz._find_utc(end - 1)[3], 'EDT')
+            self.assertEqual(tz._find_utc(end)[3], 'EST')
+            # The wall times are 02:00 EST and 02:00 EDT.
+            self.assertEqual(tz._find_wall(start - 5 * 3600 + 3599)[3], 'EST')
+            self.assertEqual(tz._find_wall(start - 4 * 3600)[3], 'EDT')
+            self.assertEqual(tz._find_wall(end - 4 * 3600 - 1)[3], 'EDT')
+            self.assertEqual(tz._find_wall(end - 4 * 3600)[3], 'EST')
+        # The transitions are only worked out for the years around these.
+        self.assertEqual(sorted(tz._years), list(range(2023, 2028)))
+        ttinfo = tz._find_utc(self.seconds(2024, 7, 1))
+        self.assertEqual(ttinfo[1:], (Duration(hours=-4), HOUR, 'EDT'))
+
+    def test_southern(self):
+        # Daylight saving time from October to April, over new year.
+        tz = PosixTimezone('AEST-10AEDT,M10.1.0,M4.1.0/3')
+        self.assertEqual(tz._find_utc(self.seconds(2024, 1, 1))[3], 'AEDT')
+        self.assertEqual(tz._find_utc(self.seconds(2024, 7, 1))[3], 'AEST')
+        self.assertEqual(tz._find_utc(self.seconds(2024, 12, 31))[3], 'AEDT')
+        # 2024-04-07 03:00 AEDT is 2024-04-06 16:00 UTC.
+        end = self.seconds(2024, 4, 6, 16)
+        self.assertEqual(tz._find_utc(end - 1)[3], 'AEDT')
+        self.assertEqual(tz._find_utc(end)[3], 'AEST')
+        self.assertEqual(tz._find_wall(end + 11 * 3600 - 1)[3], 'AEDT')
+        self.assertEqual(tz._find_wall(end + 11 * 3600)[3], 'AEST')
+
+    def test_negative_dst(self):
+        # Ireland has standard time in the summer, and GMT in the winter.
+        tz = PosixTimezone('IST-1GMT0,M10.5.0,M3.5.0/1')
+        summer = tz._find_utc(self.seconds(2024, 7, 1))
+        winter = tz._find_utc(self.seconds(2024, 1, 1))
+        self.assertEqual(summer[1:], (HOUR, ZERO, 'IST'))
+        self.assertEqual(winter[1:], (ZERO, -HOUR, 'GMT'))
+
+    def test_lookup_order(self):
+        # Lookups give the same result whatever was looked up before.
+        rnd = random.Random(7)
+        times = [rnd.randrange(-62135596800, 253402300800) for i in range(200)]
+        times += [self.seconds(2024, 3, 10, 7) + i for i in range(-2, 2)]
+        for tzstring in ('EST5EDT,M3.2.0,M11.1.0',
+                         'AEST-10AEDT,M10.1.0,M4.1.0/3',
+                         'EST5EDT,0/0,J365/25'):
+            tz = PosixTimezone(tzstring)
+            expected = [(PosixTimezone(tzstring)._find_utc(t),
+                         PosixTimezone(tzstring)._find_wall(t)) for t in times]
+            for i in rnd.sample(range(len(times)), len(times)):
+                self.assertEqual(tz._find_utc(times[i]), expected[i][0])
+                self.assertEqual(tz._find_wall(times[i]), expected[i][1])
+
+    def test_no_dst(self):
+        tz = PosixTimezone('<+0330>-3:30')
+        self.assertEqual(tz._find_utc(0)[1:], (Duration(hours=3, minutes=30),
+                                               ZERO, '+0330'))
+        self.assertEqual(tz._find_wall(10 ** 10), tz._find_utc(0))
+
+    def test_limits(self):
+        tz = PosixTimezone('EST5EDT,M3.2.0,M11.1.0')
+        for t in (-62135596800, 253402300799):
+            self.assertEqual(tz._find_utc(t)[3], 'EST')
+            self.assertEqual(tz._find_wall(t)[3], 'EST')
+
+    def test_protocol(self):
+        tz = PosixTimezone('EST5EDT,M3.2.0,M11.1.0')
+        self.assertEqual(str(tz), 'EST5EDT,M3.2.0,M11.1.0')
+        self.assertEqual(repr(tz),
+                         "tider.PosixTimezone('EST5EDT,M3.2.0,M11.1.0')")
+        self.assertEqual(repr(eval(repr(tz))), repr(tz))
+        self.assertEqual(str(pickle.loads(pickle.dumps(tz))), str(tz))
+        self.assertIsNone(tz.utcoffset(None))
+        for method in (tz.utcoffset, tz.dst, tz.tzname, tz.fromutc):
+            self.assertRaises(TypeError, method, 5)
+        self.assertRaises(TypeError, PosixTimezone, None)
+        for bad in ('', 'EST', 'EST5EDT', 'EST5EDT,M13.1.0,M11.1.0'):
+            self.assertRaises(ValueError, PosixTimezone, bad)
+
+    @unittest.skipIf(zoneinfo is None, 'test requires zoneinfo')
+    def test_footer(self):
+        # The zone uses a PosixTimezone after its last transition.
+        try:
+            tz = ZoneInfoTimezone('America/New_York')
+        except ValueError:
+            self.skipTest('zoneinfo files not found')
+        self.assertIsInstance(tz._rule, PosixTimezone)
+        self.assertEqual(str(tz._rule), 'EST5EDT,M3.2.0,M11.1.0')
+
+
+class TestTimezoneCache(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            ZoneInfoTimezone('Europe/Stockholm')
+        except ValueError:
+            self.skipTest('zoneinfo files not found')
+        timezone_module.cache_clear()
+        timezone_module.set_cache_size(2)
+
+    def tearDown(self):
+        timezone_module.set_cache_size(128)
+        timezone_module.cache_clear()
+
+    def test_get(self):
+        get = timezone_module.get
+        tz = get('Europe/Stockholm')
+        self.assertIsInstance(tz, ZoneInfoTimezone)
+        self.assertIs(get('Europe/Stockholm'), tz)
+        self.assertIs(get('UTC'), FixedTimezone.utc)
+        info = timezone_module.cache_info()
+        self.assertEqual(info[:4], (1, 1, 2, 1))
+        self.assertEqual(info, timezone_module.CacheInfo(
+            hits=1, misses=1, maxsize=2, currsize=1, loadtime=info.loadtime))
+        self.assertGreater(info.loadtime, 0)
+
+        self.assertRaises(ValueError, get, 'Nowhere/Nothing')
+        self.assertRaises(TypeError, get, None)
+        self.assertEqual(timezone_module.cache_info().currsize, 1)
+
+    def test_eviction(self):
+        get = timezone_module.get
+        stockholm = get('Europe/Stockholm')
+        get('America/New_York')
+        get('Europe/Stockholm')
+        # Asia/Tokyo evicts the least recently used zone, New York.
+        get('Asia/Tokyo')
+        self.assertIs(get('Europe/Stockholm'), stockholm)
+        self.assertEqual(timezone_module.cache_info().misses, 3)
+        get('America/New_York')
+        self.assertEqual(timezone_module.cache_info().misses, 4)
+
+        timezone_module.set_cache_size(1)
+        self.assertEqual(timezone_module.cache_info().currsize, 1)
+        timezone_module.set_cache_size(0)
+        self.assertEqual(timezone_module.cache_info().currsize, 0)
+        self.assertIsNot(get('Asia/Tokyo'), get('Asia/Tokyo'))
+        timezone_module.cache_clear()
+        self.assertEqual(timezone_module.cache_info()[:2], (0, 0))
+        self.assertEqual(timezone_module.cache_info().loadtime, 0)
+        self.assertRaises(ValueError, timezone_module.set_cache_size, -1)
+        self.assertRaises(TypeError, timezone_module.set_cache_size, 1.5)
+
+    def test_threads(self):
+        results = []
+
+        def worker():
+            for i in range(50):
+                results.append(timezone_module.get('Europe/Stockholm'))
+
+        threads = [threading.Thread(target=worker) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, results))), 1)
+        hits, misses = timezone_module.cache_info()[:2]
+        self.assertEqual(hits + misses, 400)
+        self.assertGreaterEqual(misses, 1)
+
+    def test_load_outside_lock(self):
+        # A zone being loaded doesn't hold up lookups of cached zones.
+        stockholm = timezone_module.get('Europe/Stockholm')
+        loading = threading.Event()
+        release = threading.Event()
+        released = []
+
+        def load(key):
+            loading.set()
+            released.append(release.wait(10))
+            return ZoneInfoTimezone(key)
+
+        timezone_module.ZoneInfoTimezone = load
+        try:
+            thread = threading.Thread(
+                target=timezone_module.get, args=('Asia/Tokyo',))
+            thread.start()
+            loading.wait(10)
+            self.assertIs(timezone_module.get('Europe/Stockholm'), stockholm)
+            release.set()
+            thread.join()
+        finally:
+            timezone_module.ZoneInfoTimezone = ZoneInfoTimezone
+        self.assertEqual(released, [True])
+        self.assertEqual(timezone_module.cache_info()[:4], (1, 2, 2, 2))
 
+    def test_pickle(self):
+        tz = timezone_module.get('Europe/Stockholm')
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertIs(pickle.loads(pickle.dumps(tz, proto)), tz)
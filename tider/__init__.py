@@ -1,5 +1,15 @@
-from .date import Date
+from .businesscalendar import BusinessCalendar
+from .date import Date, parse_dates
+from .daterange import DateRange
 from .datetime import Datetime
-from .duration import Duration
-from .time import Time
-from .timezone import FixedTimezone
+from .duration import Duration, parse_durations
+from .durationstats import DurationStats
+from .time import Time, parse_times
+from .timezone import FixedTimezone, PosixTimezone, ZoneInfoTimezone
+
+try:
+    from .datearray import DateArray
+    from .durationarray import DurationArray
+    from .timearray import TimeArray
+except ImportError:  # NumPy is not installed
+    pass
@@ -0,0 +1,26 @@
+# The sequence protocol shared by DateArray, DurationArray and TimeArray
+
+
+class _ArraySequence(object):
+    """Mixin giving an array of values the sequence protocol.
+
+    The subclass sets _values to the name of the slot with the NumPy
+    array, _item to the function making an element from one value, and
+    _from_values_unchecked to the constructor taking a NumPy array.
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        return len(getattr(self, self._values))
+
+    def __getitem__(self, index):
+        # Slices, boolean masks and arrays of indexes give a new array.
+        values = getattr(self, self._values)[index]
+        if values.ndim == 0:
+            return self._item(int(values))
+        if values.ndim != 1:
+            raise IndexError('index must give a one-dimensional result')
+        return self._from_values_unchecked(values)
+
+    def __iter__(self):
+        return map(self._item, getattr(self, self._values).tolist())
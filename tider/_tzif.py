@@ -0,0 +1,178 @@
+"""Reading of compiled TZif timezone files, see RFC 8536."""
+import re as _re
+import struct as _struct
+from array import array as _array
+
+from ._utils import _ymd2ord, _days_in_month, _EPOCH_ORDINAL
+
+_HEADER = _struct.Struct('>4sc15x6l')
+
+
+def _load_tzif(data):
+    """TZif file contents -> (transitions, types, ttinfos, footer).
+
+    transitions is an array('q') of the transition times, in seconds since
+    the epoch, UTC.  types is an array('B') of the index in ttinfos of the
+    local time type that starts at each transition.  ttinfos is a list of
+    (utoff, isdst, abbr) tuples, where utoff is the offset from UTC in
+    seconds.  footer is the POSIX TZ string for times after the last
+    transition, or '' if there is none.
+
+    Raises ValueError if the data isn't a valid TZif file.
+    """
+    try:
+        return _parse_tzif(memoryview(data))
+    except (_struct.error, IndexError, UnicodeDecodeError):
+        raise ValueError('invalid TZif data')
+
+
+def _parse_tzif(data):
+    magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = (
+        _HEADER.unpack_from(data))
+    if magic != b'TZif':
+        raise ValueError('invalid TZif data')
+    timesize = 4
+    pos = _HEADER.size
+    if version >= b'2':
+        # Skip the version 1 data, which only has 32-bit times, and use
+        # the 64-bit data that follows it.
+        pos += (timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 +
+                isstdcnt + isutcnt)
+        (magic, version, isutcnt, isstdcnt, leapcnt, timecnt, typecnt,
+         charcnt) = _HEADER.unpack_from(data, pos)
+        timesize = 8
+        pos += _HEADER.size
+    if not typecnt:
+        raise ValueError('invalid TZif data')
+
+    transitions = _array('q', _struct.unpack_from(
+        '>%d%s' % (timecnt, 'q' if timesize == 8 else 'l'), data, pos))
+    pos += timecnt * timesize
+    types = _array('B', data[pos:pos + timecnt])
+    pos += timecnt
+    if types and max(types) >= typecnt:
+        raise ValueError('invalid TZif data')
+    records = _struct.unpack_from('>' + 'lBB' * typecnt, data, pos)
+    pos += typecnt * 6
+    chars = bytes(data[pos:pos + charcnt])
+    pos += charcnt + leapcnt * (timesize + 4) + isstdcnt + isutcnt
+    ttinfos = []
+    for i in range(0, len(records), 3):
+        utoff, isdst, index = records[i:i + 3]
+        abbr = chars[index:chars.index(b'\0', index)].decode('ascii')
+        ttinfos.append((utoff, isdst, abbr))
+
+    footer = ''
+    if timesize == 8:
+        rest = bytes(data[pos:])
+        if rest[:1] != b'\n' or rest.count(b'\n') < 2:
+            raise ValueError('invalid TZif footer')
+        footer = rest[1:rest.index(b'\n', 1)].decode('ascii')
+    return transitions, types, ttinfos, footer
+
+
+# POSIX TZ strings, like 'EST5EDT,M3.2.0,M11.1.0', see
+# https://pubs.opengroup.org/onlinepubs/9699919799/basedefs/V1_chap08.html
+# and RFC 8536 section 3.3.1 for the extensions used in TZif files.
+_NAME = r'([A-Za-z]{3,}|<[A-Za-z0-9+-]{3,}>)'
+_OFFSET = r'([+-]?\d{1,3}(?::\d\d){0,2})'
+_RULE = r'(J\d{1,3}|\d{1,3}|M\d{1,2}\.\d\.\d)(?:/' + _OFFSET + r')?'
+_POSIX_TZ = _re.compile(
+    _NAME + _OFFSET + '(?:' + _NAME + _OFFSET + '?' +
+    '(?:,' + _RULE + ',' + _RULE + ')?)?\\Z', _re.ASCII).match
+
+
+def _parse_posix_offset(string, limit):
+    """'[+-]hh[:mm[:ss]]' -> seconds."""
+    sign = -1 if string[0] == '-' else 1
+    fields = [int(field) for field in string.lstrip('+-').split(':')]
+    fields += [0] * (3 - len(fields))
+    hours, minutes, seconds = fields
+    if hours > limit or minutes > 59 or seconds > 59:
+        raise ValueError('invalid offset in TZ string: %r' % string)
+    return sign * (hours * 3600 + minutes * 60 + seconds)
+
+
+def _parse_posix_rule(rule, time):
+    """A rule and its time -> (kind, a, b, c, seconds).
+
+    kind is 'J' for Julian days 1..365 that don't count February 29th,
+    'N' for zero based days 0..365, and 'M' for month a, week b (5 is the
+    last week) and weekday c, with 0 being Sunday.  seconds is the local
+    time of the transition, which defaults to 02:00.
+    """
+    seconds = 7200 if time is None else _parse_posix_offset(time, 167)
+    if rule[0] == 'J':
+        day = int(rule[1:])
+        if not 1 <= day <= 365:
+            raise ValueError('invalid rule in TZ string: %r' % rule)
+        return ('J', day, 0, 0, seconds)
+    if rule[0] == 'M':
+        month, week, weekday = (int(field) for field in rule[1:].split('.'))
+        if not (1 <= month <= 12 and 1 <= week <= 5 and 0 <= weekday <= 6):
+            raise ValueError('invalid rule in TZ string: %r' % rule)
+        return ('M', month, week, weekday, seconds)
+    day = int(rule)
+    if not 0 <= day <= 365:
+        raise ValueError('invalid rule in TZ string: %r' % rule)
+    return ('N', day, 0, 0, seconds)
+
+
+def _parse_posix_tz(string):
+    """POSIX TZ string -> (std_abbr, std_offset, dst_abbr, dst_offset,
+    start, end).
+
+    The offsets are in seconds east of UTC, the opposite of the TZ string.
+    Without daylight saving time, dst_abbr, dst_offset, start and end are
+    None.  start and end are rules from _parse_posix_rule().
+    """
+    match = _POSIX_TZ(string)
+    if match is None:
+        raise ValueError('invalid TZ string: %r' % (string,))
+    (std_abbr, std_offset, dst_abbr, dst_offset,
+     start, start_time, end, end_time) = match.groups()
+    std_abbr = std_abbr.strip('<>')
+    std_offset = -_parse_posix_offset(std_offset, 24)
+    if dst_abbr is None:
+        return std_abbr, std_offset, None, None, None, None
+    dst_abbr = dst_abbr.strip('<>')
+    if dst_offset is None:
+        dst_offset = std_offset + 3600
+    else:
+        dst_offset = -_parse_posix_offset(dst_offset, 24)
+    if start is None:
+        # The POSIX default rules are not used by TZif files.
+        raise ValueError('TZ string without rules: %r' % (string,))
+    return (std_abbr, std_offset, dst_abbr, dst_offset,
+            _parse_posix_rule(start, start_time),
+            _parse_posix_rule(end, end_time))
+
+
+def _posix_rule_ordinal(rule, year):
+    """Return the ordinal of the day a rule applies to in a year."""
+    kind, a, b, c, seconds = rule
+    jan1 = _ymd2ord(year, 1, 1)
+    if kind == 'N':
+        return jan1 + a
+    if kind == 'J':
+        # February 29th is never counted.
+        return jan1 + a - 1 + (a >= 60 and _days_in_month(year, 2) == 29)
+    # The b:th weekday c of month a, where 0 is Sunday, and 5 the last.
+    # Ordinal 7 is a Sunday, so the weekday of an ordinal is ordinal % 7.
+    if b == 5:
+        last = _ymd2ord(year, a, _days_in_month(year, a))
+        return last - (last - c) % 7
+    first = _ymd2ord(year, a, 1)
+    return first + (c - first) % 7 + (b - 1) * 7
+
+
+def _posix_transitions(std_offset, dst_offset, start, end, year):
+    """Return the UTC seconds when daylight saving time starts and ends
+    in a year.
+    """
+    # The transitions are given in the local time that is in effect
+    # before them.
+    return ((_posix_rule_ordinal(start, year) - _EPOCH_ORDINAL) * 86400 +
+            start[4] - std_offset,
+            (_posix_rule_ordinal(end, year) - _EPOCH_ORDINAL) * 86400 +
+            end[4] - dst_offset)
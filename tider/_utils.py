@@ -1,5 +1,11 @@
 # Various internal helper functions
+import math as _math
+import os as _os
+import re as _re
 import time as _time
+from array import array as _array
+from functools import lru_cache as _lru_cache
+from operator import itemgetter as _itemgetter
 
 # I might get rid of these.
 MINYEAR = 1
@@ -45,17 +51,6 @@ def _days_before_month(year, month):
     assert 1 <= month <= 12, 'month must be in 1..12'
     return _DAYS_BEFORE_MONTH[month] + (month > 2 and _is_leap(year))
 
-def _isoweek1monday(year):
-    # Helper to calculate the day number of the Monday starting week 1
-    # XXX This could be done more efficiently
-    THURSDAY = 3
-    firstday = _ymd2ord(year, 1, 1)
-    firstweekday = (firstday + 6) % 7 # See weekday() above
-    week1monday = firstday - firstweekday
-    if firstweekday > THURSDAY:
-        week1monday += 7
-    return week1monday
-
 _DI400Y = _days_before_year(401)    # number of days in 400 years
 _DI100Y = _days_before_year(101)    #    "    "   "   " 100   "
 _DI4Y   = _days_before_year(5)      #    "    "   "   "   4   "
@@ -75,76 +70,178 @@ assert _DI400Y == 4 * _DI100Y + 1
 assert _DI100Y == 25 * _DI4Y - 1
 
 
+# Ordinal conversions.
+#
+# These are called for every Date that is created or formatted, so they
+# do no validation.  The arguments must already have been checked, for
+# example by _check_date_fields().
+
+# The number of days before January 1st of each year, for the years
+# 0..MAXYEAR+1.  It is built on first use by _build_year_starts().
+_YEAR_STARTS = None
+
+
+def _build_year_starts():
+    global _YEAR_STARTS
+    if _YEAR_STARTS is None:
+        _YEAR_STARTS = _array('i', [_days_before_year(year)
+                                    for year in range(MAXYEAR + 2)])
+    return _YEAR_STARTS
+
+
 def _ymd2ord(year, month, day):
     "year, month, day -> ordinal, considering 01-Jan-0001 as day 1."
-    assert 1 <= month <= 12, 'month must be in 1..12'
-    dim = _days_in_month(year, month)
-    assert 1 <= day <= dim, ('day must be in 1..%d' % dim)
-    return (_days_before_year(year) +
-            _days_before_month(year, month) +
-            day)
+    starts = _YEAR_STARTS or _build_year_starts()
+    before = starts[year]
+    # A year is a leap year if it is 366 days long.
+    return (before + _DAYS_BEFORE_MONTH[month] + day +
+            (month > 2 and starts[year + 1] - before == 366))
+
+
+# The ordinal of the Monday starting ISO week 1 of each year, for the
+# years 0..MAXYEAR+1.  It is built on first use by
+# _build_isoweek1mondays().
+_ISOWEEK1MONDAYS = None
+
+
+def _build_isoweek1mondays():
+    global _ISOWEEK1MONDAYS
+    if _ISOWEEK1MONDAYS is None:
+        THURSDAY = 3
+        mondays = _array('i')
+        for before in _YEAR_STARTS or _build_year_starts():
+            firstday = before + 1
+            firstweekday = (firstday + 6) % 7
+            week1monday = firstday - firstweekday
+            if firstweekday > THURSDAY:
+                week1monday += 7
+            mondays.append(week1monday)
+        _ISOWEEK1MONDAYS = mondays
+    return _ISOWEEK1MONDAYS
+
+
+def _isocalendar(year, ordinal):
+    """year, ordinal -> (ISO year, ISO week, ISO weekday).
+
+    year must be the year of the date with that ordinal.
+    """
+    mondays = _ISOWEEK1MONDAYS or _build_isoweek1mondays()
+    # The ISO year is at most one off from the calendar year.
+    if ordinal < mondays[year]:
+        year -= 1
+    elif ordinal >= mondays[year + 1]:
+        year += 1
+    week, day = divmod(ordinal - mondays[year], 7)
+    return year, week + 1, day + 1
+
+
+def _isocalendar2ord(year, week, day):
+    "ISO year, week, weekday -> ordinal, validating the arguments."
+    if not (isinstance(year, int) and isinstance(week, int) and
+            isinstance(day, int)):
+        raise TypeError('int expected')
+    if not MINYEAR <= year <= MAXYEAR:
+        raise ValueError('year must be in %d..%d' % (MINYEAR, MAXYEAR), year)
+    mondays = _ISOWEEK1MONDAYS or _build_isoweek1mondays()
+    weeks = (mondays[year + 1] - mondays[year]) // 7
+    if not 1 <= week <= weeks:
+        raise ValueError('week must be in 1..%d' % weeks, week)
+    if not 1 <= day <= 7:
+        raise ValueError('day must be in 1..7', day)
+    ordinal = mondays[year] + (week - 1) * 7 + day - 1
+    if ordinal > _MAXORDINAL:
+        raise ValueError('date is out of range')
+    return ordinal
+
 
 def _ord2ymd(n):
     "ordinal -> (year, month, day), considering 01-Jan-0001 as day 1."
 
-    # n is a 1-based index, starting at 1-Jan-1.  The pattern of leap years
-    # repeats exactly every 400 years.  The basic strategy is to find the
-    # closest 400-year boundary at or before n, then work with the offset
-    # from that boundary to n.  Life is much clearer if we subtract 1 from
-    # n first -- then the values of n at 400-year boundaries are exactly
-    # those divisible by _DI400Y:
+    # This uses the Euclidean affine functions from Cassio Neri and Lorenz
+    # Schneider, "Euclidean affine functions and their application to
+    # calendar algorithms" (2022).  The calculation is made in a
+    # "computational calendar" where years start on March 1st, so that the
+    # leap day is the last day of the year.  Day 0 is 0000-03-01, which
+    # makes 0001-01-01 day 306, so the computational day is n + 305.
     #
-    #     D  M   Y            n              n-1
-    #     -- --- ----        ----------     ----------------
-    #     31 Dec -400        -_DI400Y       -_DI400Y -1
-    #      1 Jan -399         -_DI400Y +1   -_DI400Y      400-year boundary
-    #     ...
-    #     30 Dec  000        -1             -2
-    #     31 Dec  000         0             -1
-    #      1 Jan  001         1              0            400-year boundary
-    #      2 Jan  001         2              1
-    #      3 Jan  001         3              2
-    #     ...
-    #     31 Dec  400         _DI400Y        _DI400Y -1
-    #      1 Jan  401         _DI400Y +1     _DI400Y      400-year boundary
-    n -= 1
-    n400, n = divmod(n, _DI400Y)
-    year = n400 * 400 + 1   # ..., -399, 1, 401, ...
-
-    # Now n is the (non-negative) offset, in days, from January 1 of year, to
-    # the desired date.  Now compute how many 100-year cycles precede n.
-    # Note that it's possible for n100 to equal 4!  In that case 4 full
-    # 100-year cycles precede the desired day, which implies the desired
-    # day is December 31 at the end of a 400-year cycle.
-    n100, n = divmod(n, _DI100Y)
-
-    # Now compute how many 4-year cycles precede it.
-    n4, n = divmod(n, _DI4Y)
-
-    # And now how many single years.  Again n1 can be 4, and again meaning
-    # that the desired day is December 31 at the end of the 4-year cycle.
-    n1, n = divmod(n, 365)
-
-    year += n100 * 100 + n4 * 4 + n1
-    if n1 == 4 or n100 == 4:
-        assert n == 0
-        return year-1, 12, 31
-
-    # Now the year is correct, and n is the offset from January 1.  We find
-    # the month via an estimate that's either exact or one too large.
-    leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
-    assert leapyear == _is_leap(year)
-    month = (n + 50) >> 5
-    preceding = _DAYS_BEFORE_MONTH[month] + (month > 2 and leapyear)
-    if preceding > n:  # estimate is too large
-        month -= 1
-        preceding -= _DAYS_IN_MONTH[month] + (month == 2 and leapyear)
-    n -= preceding
-    assert 0 <= n < _days_in_month(year, month)
-
-    # Now the year and month are correct, and n is the offset from the
-    # start of that month:  we're done!
-    return year, month, n+1
+    # n1 is 4 * (n + 305) + 3.  Dividing by the number of days in 400
+    # years gives the century c, and the remainder is rounded up to 3
+    # modulo 4 to get four times the day of the century (plus 3).
+    n1 = 4 * n + 1223
+    c = n1 // 146097
+    # Multiplying by 2939745 and splitting at bit 32 is the same as
+    # divmod() by 1461, four years, but without a division.  The high
+    # part is the year of the century, and the low part, divided by
+    # 4 * 2939745, is the day of the year.
+    p2 = 2939745 * ((n1 - 146097 * c) | 3)
+    # Likewise the month (3..14) is in the high 16 bits of n3 and the day
+    # of the month in the low 16 bits, divided by 2141.
+    n3 = 2141 * ((p2 & 0xFFFFFFFF) // 11758980) + 197913
+    # The day of the year is 306 or more for January and February, which
+    # belong to the next year in the Gregorian calendar.  852059 is
+    # 2141 * 306 + 197913.
+    j = n3 >= 852059
+    return (100 * c + (p2 >> 32) + j,
+            (n3 >> 16) - 12 * j,
+            (n3 & 0xFFFF) // 2141 + 1)
+
+
+# POSIX timestamps
+
+_EPOCH_ORDINAL = 719163  # The ordinal of 1970-01-01
+_MIN_TIMESTAMP = (1 - _EPOCH_ORDINAL) * 86400
+_MAX_TIMESTAMP = (_MAXORDINAL + 1 - _EPOCH_ORDINAL) * 86400
+
+# The local UTC offset is looked up once for each 15 minute interval,
+# as UTC offsets do not change more often than that.
+_OFFSET_INTERVAL = 900
+
+
+@_lru_cache(maxsize=1024)
+def _local_offset_cache(interval, zone):
+    # zone is only a part of the key, so that the cache isn't used for the
+    # wrong timezone after time.tzset().
+    start = interval * _OFFSET_INTERVAL
+    offset = _time.localtime(start).tm_gmtoff
+    if _time.localtime(start + _OFFSET_INTERVAL - 1).tm_gmtoff != offset:
+        # The offset changes in this interval.
+        return None
+    return offset
+
+
+def _local_zone():
+    """Return a key for the local timezone that time.tzset() set up.
+
+    Zones can have the same names and offsets, like Europe/Berlin and
+    Europe/Paris, and still have different rules, so the TZ environment
+    variable is a part of the key as well.
+    """
+    return (_os.environ.get('TZ'), _time.timezone, _time.altzone,
+            _time.tzname)
+
+
+def _local_offset(seconds):
+    """Integer POSIX timestamp -> the local UTC offset in seconds."""
+    offset = _local_offset_cache(seconds // _OFFSET_INTERVAL, _local_zone())
+    if offset is None:
+        offset = _time.localtime(seconds).tm_gmtoff
+    return offset
+
+
+def _timestamp2ord(t, utc=False):
+    """POSIX timestamp -> ordinal of the date in UTC or local time."""
+    # The timestamp may be off by a day from the date, because of the
+    # UTC offset.
+    if not _MIN_TIMESTAMP - 86400 < t < _MAX_TIMESTAMP + 86400:
+        raise OverflowError("timestamp out of range")
+    seconds = _math.floor(t)
+    if not utc:
+        seconds += _local_offset(seconds)
+    ordinal = seconds // 86400 + _EPOCH_ORDINAL
+    if not 1 <= ordinal <= _MAXORDINAL:
+        raise OverflowError("date value out of range")
+    return ordinal
+
 
 def _build_struct_time(y, m, d, hh, mm, ss, dstflag):
     wday = (_ymd2ord(y, m, d) + 6) % 7
@@ -154,10 +251,6 @@ def _build_struct_time(y, m, d, hh, mm, ss, dstflag):
 
 # The repetitive bit of comparisons
 
-def _cmp(x, y):
-    return 0 if x == y else 1 if x > y else -1
-
-
 def _cmperror(x, y):
     raise TypeError("can't compare '%s' to '%s'" % (
                     type(x).__name__, type(y).__name__))
@@ -194,62 +287,311 @@ def _check_date_fields(year, month, day):
     if not 1 <= day <= dim:
         raise ValueError('day must be in 1..%d' % dim, day)
 
-# Formatting
 
-# Correctly substitute for %z and %Z escapes in strftime formats.
-def _wrap_strftime(object, format, timetuple):
-    # Don't call utcoffset() or tzname() unless actually needed.
-    freplace = None # the string to use for %f
-    zreplace = None # the string to use for %z
-    Zreplace = None # the string to use for %Z
+# Parsing
 
-    # Scan format for %z and %Z escapes, replacing as needed.
-    newformat = []
-    push = newformat.append
+_ISODATE_STR = _re.compile(r'(\d{4})-(\d\d)-(\d\d)\Z', _re.ASCII).match
+_ISODATE_BYTES = _re.compile(br'(\d{4})-(\d\d)-(\d\d)\Z').match
+
+
+def _parse_isodate(string):
+    """'YYYY-MM-DD' as str or bytes -> ordinal.
+
+    The fields are validated while parsing, and ValueError is raised if
+    the string isn't a valid date.
+    """
+    if isinstance(string, str):
+        match = _ISODATE_STR(string)
+    else:
+        match = _ISODATE_BYTES(string)
+    if match is None:
+        raise ValueError('Invalid isoformat string: %r' % (string,))
+    year, month, day = match.groups()
+    year = int(year)
+    month = int(month)
+    day = int(day)
+    if not year:
+        raise ValueError('year must be in %d..%d' % (MINYEAR, MAXYEAR), year)
+    if not 1 <= month <= 12:
+        raise ValueError('month must be in 1..12', month)
+    if not 1 <= day <= _DAYS_IN_MONTH[month]:
+        if not (month == 2 and day == 29 and _is_leap(year)):
+            dim = _days_in_month(year, month)
+            raise ValueError('day must be in 1..%d' % dim, day)
+    return _ymd2ord(year, month, day)
+
+
+# 'HH:MM[:SS[.ffffff]]', where the regex also checks the ranges of the
+# fields, so nothing needs to be validated after the match.
+_ISOTIME = (r'([01]\d|2[0-3]):([0-5]\d)'
+            r'(?::([0-5]\d)(?:[.,](\d{1,6}))?)?\Z')
+_ISOTIME_STR = _re.compile(_ISOTIME, _re.ASCII).match
+_ISOTIME_BYTES = _re.compile(_ISOTIME.encode()).match
+
+
+def _parse_isotime(string):
+    """'HH:MM[:SS[.ffffff]]' as str or bytes -> microseconds since midnight.
+
+    Raises ValueError if the string isn't a valid time.
+    """
+    if isinstance(string, str):
+        match = _ISOTIME_STR(string)
+    else:
+        match = _ISOTIME_BYTES(string)
+    if match is None:
+        raise ValueError('Invalid isoformat string: %r' % (string,))
+    hour, minute, second, fraction = match.groups()
+    us = (int(hour) * 60 + int(minute)) * 60000000
+    if second is not None:
+        us += int(second) * 1000000
+        if fraction is not None:
+            us += int(fraction) * 10 ** (6 - len(fraction))
+    return us
+
+
+# ISO 8601 durations, with an optional sign: PnW or PnDTnHnMn.nS, where
+# any of the days, hours, minutes and seconds can be left out, but not all
+# of them.  Only the seconds can have a fraction, of at most six digits, so
+# that the duration is a whole number of microseconds.
+_ISODURATION = (r'([-+])?P(?=\d|T\d)(?:(\d+)W|(?:(\d+)D)?'
+                r'(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?'
+                r'(?:(\d+)(?:[.,](\d{1,6}))?S)?)?)\Z')
+_ISODURATION_STR = _re.compile(_ISODURATION, _re.ASCII).match
+_ISODURATION_BYTES = _re.compile(_ISODURATION.encode()).match
+
+
+def _parse_isoduration(string):
+    """'PnDTnHnMn.nS' as str or bytes -> microseconds.
+
+    Raises ValueError if the string isn't a valid duration.
+    """
+    if isinstance(string, str):
+        match = _ISODURATION_STR(string)
+    else:
+        match = _ISODURATION_BYTES(string)
+    if match is None:
+        raise ValueError('Invalid isoformat string: %r' % (string,))
+    sign, weeks, days, hours, minutes, seconds, fraction = match.groups()
+    if weeks is not None:
+        us = int(weeks) * 604800000000
+    else:
+        us = 0
+        if days is not None:
+            us = int(days) * 86400000000
+        if hours is not None:
+            us += int(hours) * 3600000000
+        if minutes is not None:
+            us += int(minutes) * 60000000
+        if seconds is not None:
+            us += int(seconds) * 1000000
+            if fraction is not None:
+                us += int(fraction) * 10 ** (6 - len(fraction))
+    if sign in ('-', b'-'):
+        return -us
+    return us
+
+
+def _rows(data):
+    """Return the rows of the input of a bulk parser.
+
+    A str or bytes-like buffer is split into lines, any other iterable is
+    returned as is.
+    """
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    if isinstance(data, (str, bytes)):
+        return data.splitlines()
+    return data
+
+
+# Formatting
+
+# strftime() formats are compiled to a "plan" once, and the plans are kept
+# in an LRU cache keyed by the format.  A plan is a %-style template and a
+# function that takes a tuple of fields and returns the values for the
+# template.  The fields are:
+_F_YEAR = 0
+_F_MONTH = 1
+_F_DAY = 2
+_F_HOUR = 3
+_F_MINUTE = 4
+_F_SECOND = 5
+_F_MICROSECOND = 6
+_F_ORDINAL = 7
+_F_OBJECT = 8   # For %z and %Z
+#
+# Everything is done here, in the C locale, so time.strftime() is never
+# called.
+
+_FULL_MONTHNAMES = [None, "January", "February", "March", "April", "May",
+                    "June", "July", "August", "September", "October",
+                    "November", "December"]
+_FULL_DAYNAMES = [None, "Monday", "Tuesday", "Wednesday", "Thursday",
+                  "Friday", "Saturday", "Sunday"]
+
+_STRFTIME_CACHE_SIZE = 256
+
+
+def _isoweekday(fields):
+    return fields[_F_ORDINAL] % 7 or 7
+
+
+def _yday(fields):
+    # The day of the year, starting at 0.
+    year = fields[_F_YEAR]
+    return (_DAYS_BEFORE_MONTH[fields[_F_MONTH]] + fields[_F_DAY] - 1 +
+            (fields[_F_MONTH] > 2 and _is_leap(year)))
+
+
+def _format_offset(fields):
+    obj = fields[_F_OBJECT]
+    if not hasattr(obj, "utcoffset"):
+        return ""
+    offset = obj.utcoffset()
+    if offset is None:
+        return ""
+    seconds = offset.days * 86400 + offset.seconds
+    sign = '+'
+    if seconds < 0:
+        seconds = -seconds
+        sign = '-'
+    hh, ss = divmod(seconds, 3600)
+    mm, ss = divmod(ss, 60)
+    if ss:
+        return '%c%02d%02d%02d' % (sign, hh, mm, ss)
+    return '%c%02d%02d' % (sign, hh, mm)
+
+
+def _format_tzname(fields):
+    obj = fields[_F_OBJECT]
+    if not hasattr(obj, "tzname"):
+        return ""
+    name = obj.tzname()
+    if name is None:
+        return ""
+    return name
+
+
+# Directive -> (template, getter).  The getter is either the index of a
+# field or a function of the fields.  Directives that are made up from
+# other directives are expanded when compiling.
+_STRFTIME_DIRECTIVES = {
+    'a': ('%s', lambda f: _DAYNAMES[_isoweekday(f)]),
+    'A': ('%s', lambda f: _FULL_DAYNAMES[_isoweekday(f)]),
+    'b': ('%s', lambda f: _MONTHNAMES[f[_F_MONTH]]),
+    'B': ('%s', lambda f: _FULL_MONTHNAMES[f[_F_MONTH]]),
+    'C': ('%02d', lambda f: f[_F_YEAR] // 100),
+    'd': ('%02d', _F_DAY),
+    'e': ('%2d', _F_DAY),
+    'f': ('%06d', _F_MICROSECOND),
+    'G': ('%04d', lambda f: _isocalendar(f[_F_YEAR], f[_F_ORDINAL])[0]),
+    'H': ('%02d', _F_HOUR),
+    'I': ('%02d', lambda f: f[_F_HOUR] % 12 or 12),
+    'j': ('%03d', lambda f: _yday(f) + 1),
+    'm': ('%02d', _F_MONTH),
+    'M': ('%02d', _F_MINUTE),
+    'p': ('%s', lambda f: 'AM' if f[_F_HOUR] < 12 else 'PM'),
+    'S': ('%02d', _F_SECOND),
+    'u': ('%d', _isoweekday),
+    'U': ('%02d', lambda f: (_yday(f) + 7 - _isoweekday(f) % 7) // 7),
+    'V': ('%02d', lambda f: _isocalendar(f[_F_YEAR], f[_F_ORDINAL])[1]),
+    'w': ('%d', lambda f: _isoweekday(f) % 7),
+    'W': ('%02d', lambda f: (_yday(f) + 7 - (_isoweekday(f) - 1)) // 7),
+    'y': ('%02d', lambda f: f[_F_YEAR] % 100),
+    'Y': ('%04d', _F_YEAR),
+    'z': ('%s', _format_offset),
+    'Z': ('%s', _format_tzname),
+}
+
+_STRFTIME_ALIASES = {
+    'c': '%a %b %e %H:%M:%S %Y',
+    'D': '%m/%d/%y',
+    'F': '%Y-%m-%d',
+    'h': '%b',
+    'n': '\n',
+    'r': '%I:%M:%S %p',
+    'R': '%H:%M',
+    't': '\t',
+    'T': '%H:%M:%S',
+    'x': '%m/%d/%y',
+    'X': '%H:%M:%S',
+    '%': '%%',
+}
+
+
+def _expand_strftime(format):
+    # Replace the aliases, so only _STRFTIME_DIRECTIVES are left.
+    result = []
+    i, n = 0, len(format)
+    while i < n:
+        ch = format[i]
+        i += 1
+        if ch == '%' and i < n:
+            ch = format[i]
+            i += 1
+            if ch in _STRFTIME_ALIASES:
+                result.append(_STRFTIME_ALIASES[ch])
+            else:
+                result.append('%' + ch)
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+@_lru_cache(maxsize=_STRFTIME_CACHE_SIZE)
+def _compile_strftime(format):
+    """Compile a strftime() format to a (template, getter) plan.
+
+    Unknown directives, and a '%' at the end of the format, are copied
+    to the output as they are.
+    """
+    if not isinstance(format, str):
+        raise TypeError('strftime() argument 1 must be str, not %s' %
+                        type(format).__name__)
+    format = _expand_strftime(format)
+    template = []
+    getters = []
     i, n = 0, len(format)
     while i < n:
         ch = format[i]
         i += 1
-        if ch == '%':
-            if i < n:
-                ch = format[i]
-                i += 1
-                if ch == 'f':
-                    if freplace is None:
-                        freplace = '%06d' % getattr(object,
-                                                    'microsecond', 0)
-                    newformat.append(freplace)
-                elif ch == 'z':
-                    if zreplace is None:
-                        zreplace = ""
-                        if hasattr(object, "utcoffset"):
-                            offset = object.utcoffset()
-                            if offset is not None:
-                                sign = '+'
-                                if offset.days < 0:
-                                    offset = -offset
-                                    sign = '-'
-                                h, m = divmod(offset, timedelta(hours=1))
-                                assert not m % timedelta(minutes=1), "whole minute"
-                                m //= timedelta(minutes=1)
-                                zreplace = '%c%02d%02d' % (sign, h, m)
-                    assert '%' not in zreplace
-                    newformat.append(zreplace)
-                elif ch == 'Z':
-                    if Zreplace is None:
-                        Zreplace = ""
-                        if hasattr(object, "tzname"):
-                            s = object.tzname()
-                            if s is not None:
-                                # strftime is going to have at this: escape %
-                                Zreplace = s.replace('%', '%%')
-                    newformat.append(Zreplace)
-                else:
-                    push('%')
-                    push(ch)
+        if ch == '%' and i < n:
+            ch = format[i]
+            i += 1
+            if ch == '%':
+                template.append('%%')
+            elif ch in _STRFTIME_DIRECTIVES:
+                fmt, getter = _STRFTIME_DIRECTIVES[ch]
+                template.append(fmt)
+                getters.append(getter)
             else:
-                push('%')
+                template.append('%%' + ch)
+        elif ch == '%':
+            template.append('%%')
         else:
-            push(ch)
-    newformat = "".join(newformat)
-    return _time.strftime(newformat, timetuple)
+            template.append(ch)
+    template = ''.join(template)
+
+    if not getters:
+        return template % (), None
+    if all(isinstance(getter, int) for getter in getters):
+        if len(getters) == 1:
+            index = getters[0]
+            return template, lambda fields: (fields[index],)
+        return template, _itemgetter(*getters)
+    getters = [_itemgetter(getter) if isinstance(getter, int) else getter
+               for getter in getters]
+    return template, lambda fields: tuple([getter(fields)
+                                           for getter in getters])
+
+
+def _strftime(format, fields):
+    """Format the fields according to a strftime() format.
+
+    fields is a tuple of (year, month, day, hour, minute, second,
+    microsecond, ordinal, object), where object is used for %z and %Z.
+    """
+    template, getter = _compile_strftime(format)
+    if getter is None:
+        return template
+    return template % getter(fields)
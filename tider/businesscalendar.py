@@ -0,0 +1,261 @@
+from array import array as _array
+
+from .date import BaseDate, Date
+
+_ROLLS = ('raise', 'forward', 'following', 'backward', 'preceding',
+          'modifiedfollowing', 'modifiedpreceding')
+
+
+def _parse_weekmask(weekmask):
+    if isinstance(weekmask, str):
+        if len(weekmask) != 7 or weekmask.strip('01'):
+            raise ValueError("weekmask must be seven '0' or '1' characters,"
+                             " starting with Monday", weekmask)
+        return tuple(ch == '1' for ch in weekmask)
+    weekmask = tuple(bool(day) for day in weekmask)
+    if len(weekmask) != 7:
+        raise ValueError("weekmask must have seven days, starting with"
+                         " Monday", weekmask)
+    return weekmask
+
+
+class BusinessCalendar(object):
+    """A calendar of business days, for business day arithmetic.
+
+    Arguments:
+
+    weekmask, which weekdays are business days.  Either a string of seven
+        '1' or '0', or a sequence of seven booleans, starting with Monday.
+        The default, '1111100', is Monday to Friday.
+    holidays, an iterable of Dates that are not business days.
+    start, end, the first and last Dates the calendar can be used for.
+        The default is January 1st, 1900 to December 31st, 2100.
+
+    When the calendar is created, it counts the business days from start
+    to end in a cumulative index, so all the queries take constant time.
+    ValueError is raised for queries outside of the calendar.
+
+    Methods:
+
+    is_busday()
+    busday_count()
+    busday_offset()
+
+    And is_busday_ordinals(), busday_count_ordinals() and
+    busday_offset_ordinals(), that do the same for arrays of ordinals.
+    They require NumPy.
+    """
+
+    def __init__(self, weekmask='1111100', holidays=(), start=None,
+                 end=None):
+        if start is None:
+            start = Date(1900, 1, 1)
+        if end is None:
+            end = Date(2100, 12, 31)
+        if not isinstance(start, BaseDate) or not isinstance(end, BaseDate):
+            raise TypeError("start and end must be Dates")
+        if end < start:
+            raise ValueError("end must not be before start")
+        holidays = list(holidays)
+        for holiday in holidays:
+            if not isinstance(holiday, BaseDate):
+                raise TypeError("holidays must be Dates")
+        self._weekmask = weekmask = _parse_weekmask(weekmask)
+        self._holidays = holidays = tuple(sorted(set(holidays)))
+        self._start = first = start.toordinal()
+        self._end = last = end.toordinal()
+
+        # _cumulative[i] is the number of business days before the day
+        # start + i, and _busdays the ordinals of all the business days.
+        closed = set(holiday.toordinal() for holiday in holidays)
+        cumulative = _array('i', [0])
+        busdays = _array('i')
+        count = 0
+        for ordinal in range(first, last + 1):
+            if weekmask[(ordinal + 6) % 7] and ordinal not in closed:
+                busdays.append(ordinal)
+                count += 1
+            cumulative.append(count)
+        self._cumulative = cumulative
+        self._busdays = busdays
+
+    def __repr__(self):
+        return "tider.BusinessCalendar(%r, %r, %r, %r)" % (
+            ''.join('1' if day else '0' for day in self._weekmask),
+            list(self._holidays), self.start, self.end)
+
+    # Read-only field accessors
+
+    @property
+    def weekmask(self):
+        """The business days of the week, as seven booleans."""
+        return self._weekmask
+
+    @property
+    def holidays(self):
+        """The holidays, as a sorted tuple of Dates."""
+        return self._holidays
+
+    @property
+    def start(self):
+        """The first Date of the calendar."""
+        return BaseDate._from_ordinal_unchecked(self._start)
+
+    @property
+    def end(self):
+        """The last Date of the calendar."""
+        return BaseDate._from_ordinal_unchecked(self._end)
+
+    # Queries
+
+    def _index(self, date, end=False):
+        # If end is true, the index may be one past the calendar's end.
+        if not isinstance(date, BaseDate):
+            raise TypeError("a Date is required (got type %s)" %
+                            type(date).__name__)
+        index = date.toordinal() - self._start
+        if not 0 <= index <= self._end - self._start + end:
+            raise ValueError("%s is outside of the calendar" % date)
+        return index
+
+    def is_busday(self, date):
+        """Return True if the Date is a business day."""
+        index = self._index(date)
+        cumulative = self._cumulative
+        return cumulative[index + 1] != cumulative[index]
+
+    def busday_count(self, begin, end):
+        """Return the number of business days from begin up to end.
+
+        The begin Date is included and the end Date is not.  If end is
+        before begin the count is negative, and then it's the other way
+        around: end is not included, but begin is.  This is the same as
+        numpy.busday_count().
+        """
+        begin = self._index(begin, True)
+        end = self._index(end, True)
+        cumulative = self._cumulative
+        if end < begin:
+            if begin > self._end - self._start:
+                raise ValueError("begin is outside of the calendar")
+            return cumulative[end + 1] - cumulative[begin + 1]
+        return cumulative[end] - cumulative[begin]
+
+    def busday_offset(self, date, offset, roll='raise'):
+        """Return the business day offset business days after date.
+
+        If the date isn't a business day, it is first rolled to one
+        according to roll:
+
+        'raise', raise a ValueError
+        'forward' or 'following', roll to the next business day
+        'backward' or 'preceding', roll to the previous business day
+        'modifiedfollowing', roll forward, unless that changes the month,
+            then roll backward
+        'modifiedpreceding', roll backward, unless that changes the month,
+            then roll forward
+        """
+        if not isinstance(offset, int):
+            raise TypeError("offset must be an int")
+        if roll not in _ROLLS:
+            raise ValueError("roll must be one of %s" % ', '.join(_ROLLS),
+                             roll)
+        index = self._index(date)
+        busdays = self._busdays
+        # The rank of the first business day on or after the date.
+        rank = self._cumulative[index]
+        if rank == len(busdays) or busdays[rank] != date.toordinal():
+            if roll == 'raise':
+                raise ValueError("%s is not a business day" % date)
+            if roll in ('backward', 'preceding'):
+                rank -= 1
+            elif roll == 'modifiedfollowing':
+                if (rank == len(busdays) or
+                        self._month(busdays[rank]) != date.month):
+                    rank -= 1
+            elif roll == 'modifiedpreceding':
+                if rank and self._month(busdays[rank - 1]) == date.month:
+                    rank -= 1
+        rank += offset
+        if not 0 <= rank < len(busdays):
+            raise ValueError("the result is outside of the calendar")
+        return BaseDate._from_ordinal_unchecked(busdays[rank])
+
+    @staticmethod
+    def _month(ordinal):
+        return BaseDate._from_ordinal_unchecked(ordinal).month
+
+    # Vectorized queries
+
+    def _indexes(self, ordinals, end=False):
+        import numpy as np
+        if hasattr(ordinals, 'toordinal'):
+            ordinals = ordinals.toordinal()  # A DateArray
+        indexes = np.asarray(ordinals, dtype=np.int64) - self._start
+        if indexes.size and (indexes.min() < 0 or
+                             indexes.max() > self._end - self._start + end):
+            raise ValueError("dates outside of the calendar")
+        return np, indexes
+
+    def is_busday_ordinals(self, ordinals):
+        """Return a boolean array telling which ordinals are business days.
+
+        ordinals is an array of proleptic Gregorian ordinals or a
+        DateArray.
+        """
+        np, indexes = self._indexes(ordinals)
+        cumulative = np.frombuffer(self._cumulative, dtype=np.int32)
+        return cumulative[indexes + 1] != cumulative[indexes]
+
+    def busday_count_ordinals(self, begin, end):
+        """Return an array of business day counts, see busday_count()."""
+        np, begin = self._indexes(begin, True)
+        np, end = self._indexes(end, True)
+        begin, end = np.broadcast_arrays(begin, end)
+        cumulative = np.frombuffer(self._cumulative, dtype=np.int32)
+        backwards = end < begin
+        if (begin[backwards] > self._end - self._start).any():
+            raise ValueError("dates outside of the calendar")
+        # Backwards, count the days after end up to and including begin.
+        begin = begin + backwards
+        end = end + backwards
+        return cumulative[end] - cumulative[begin]
+
+    def busday_offset_ordinals(self, ordinals, offsets, roll='raise'):
+        """Return an array of the ordinals of business days.
+
+        This is busday_offset() for an array of ordinals or a DateArray,
+        and an int or array of offsets.
+        """
+        if roll not in _ROLLS:
+            raise ValueError("roll must be one of %s" % ', '.join(_ROLLS),
+                             roll)
+        from .datearray import _ord2ymd
+        np, indexes = self._indexes(ordinals)
+        cumulative = np.frombuffer(self._cumulative, dtype=np.int32)
+        busdays = np.frombuffer(self._busdays, dtype=np.int32)
+        ordinals = indexes + self._start
+        rank = cumulative[indexes].astype(np.int64)
+        # Look up the business day on or after each date, and the one
+        # before it, clipped to the existing business days.
+        last = len(busdays) - 1
+        following = busdays[np.minimum(rank, last)] if len(busdays) else rank
+        preceding = busdays[np.maximum(rank - 1, 0)] if len(busdays) else rank
+        rolled = (rank > last) | (following != ordinals)
+        if roll == 'raise':
+            if rolled.any():
+                raise ValueError("dates that are not business days")
+        elif roll in ('backward', 'preceding'):
+            rank = rank - rolled
+        elif roll == 'modifiedfollowing':
+            month = _ord2ymd(ordinals)[1]
+            changed = (rank > last) | (_ord2ymd(following)[1] != month)
+            rank = rank - (rolled & changed)
+        elif roll == 'modifiedpreceding':
+            month = _ord2ymd(ordinals)[1]
+            stays = (rank > 0) & (_ord2ymd(preceding)[1] == month)
+            rank = rank - (rolled & stays)
+        rank = rank + np.asarray(offsets, dtype=np.int64)
+        if rank.size and (rank.min() < 0 or rank.max() > last):
+            raise ValueError("results outside of the calendar")
+        return busdays[rank]
@@ -1,9 +1,89 @@
 import time as _time
+from array import array as _array
+from collections import namedtuple as _namedtuple, OrderedDict as _OrderedDict
 
 from .duration import Duration
-from ._utils import _cmp, _build_struct_time, _ymd2ord, _ord2ymd
-from ._utils import _wrap_strftime, _check_date_fields, _isoweek1monday
+from ._utils import _build_struct_time, _ymd2ord, _ord2ymd
+from ._utils import _strftime, _check_date_fields
+from ._utils import _isocalendar, _isocalendar2ord
 from ._utils import _MAXORDINAL, _DAYNAMES, _MONTHNAMES
+from ._utils import _parse_isodate, _rows, _timestamp2ord
+
+
+CacheInfo = _namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+class _DateCache(object):
+    """A LRU cache of Dates, keyed by ordinal.
+
+    Dates are immutable, so when the cache is enabled the Dates made from
+    ordinals are shared instead of creating a new object for each one.
+    That's the Dates from fromordinal(), the other class method
+    constructors and date arithmetic, but not from calling Date().
+
+    The statistics are not exact if the cache is used from several
+    threads at once.
+    """
+
+    def __init__(self):
+        self.maxsize = 0
+        self.hits = 0
+        self.misses = 0
+        self.dates = _OrderedDict()
+
+    def get(self, n):
+        dates = self.dates
+        try:
+            date = dates[n]
+        except KeyError:
+            self.misses += 1
+            date = object.__new__(BaseDate)
+            date._ordinal = n
+            date._ymd = None
+            dates[n] = date
+            if len(dates) > self.maxsize:
+                try:
+                    dates.popitem(last=False)
+                except KeyError:
+                    pass  # Another thread emptied it
+            return date
+        self.hits += 1
+        try:
+            dates.move_to_end(n)
+        except KeyError:
+            pass  # Another thread evicted it
+        return date
+
+
+_cache = _DateCache()
+
+
+def set_cache_size(maxsize):
+    """Set the number of Dates to keep in the Date cache.
+
+    The cache is disabled by default, and setting maxsize to 0 disables
+    it again.
+    """
+    if not isinstance(maxsize, int):
+        raise TypeError('int expected')
+    if maxsize < 0:
+        raise ValueError('maxsize must be 0 or more', maxsize)
+    _cache.maxsize = maxsize
+    dates = _cache.dates
+    while len(dates) > maxsize:
+        dates.popitem(last=False)
+
+
+def cache_info():
+    """Return the statistics of the Date cache as a CacheInfo tuple."""
+    return CacheInfo(_cache.hits, _cache.misses, _cache.maxsize,
+                     len(_cache.dates))
+
+
+def cache_clear():
+    """Empty the Date cache and reset its statistics."""
+    _cache.dates.clear()
+    _cache.hits = _cache.misses = 0
 
 
 class BaseDate:
@@ -12,9 +92,11 @@ class BaseDate:
     Constructors:
 
     __init__()
-    fromtimestamp()
+    fromtimestamp(), utcfromtimestamp(), fromtimestamps()
     today()
     fromordinal()
+    fromisoformat()
+    fromisocalendar()
 
     Operators:
 
@@ -32,8 +114,12 @@ class BaseDate:
 
     Properties (readonly):
     year, month, day
+
+    Internally the Date is stored as its proleptic Gregorian ordinal.
+    The year, month and day are only calculated when needed, and are then
+    cached.
     """
-    __slots__ = '_year', '_month', '_day'
+    __slots__ = '_ordinal', '_ymd'
 
     def __init__(self, year, month=None, day=None):
         """Constructor.
@@ -43,17 +129,49 @@ class BaseDate:
         year, month, day
         """
         _check_date_fields(year, month, day)
-        self._year = year
-        self._month = month
-        self._day = day
+        self._ordinal = _ymd2ord(year, month, day)
+        self._ymd = year, month, day
+
+    @classmethod
+    def _from_ordinal_unchecked(cls, n):
+        """Construct a Date from an ordinal that is known to be valid."""
+        if cls is not BaseDate:
+            # Subclasses may do their own thing in __init__.
+            return cls(*_ord2ymd(n))
+        if _cache.maxsize:
+            return _cache.get(n)
+        self = object.__new__(cls)
+        self._ordinal = n
+        self._ymd = None
+        return self
+
+    def _getymd(self):
+        ymd = self._ymd
+        if ymd is None:
+            ymd = self._ymd = _ord2ymd(self._ordinal)
+        return ymd
 
     # Additional constructors
 
     @classmethod
     def fromtimestamp(cls, t):
         "Construct a Date from a POSIX timestamp (like time.time())."
-        y, m, d, hh, mm, ss, weekday, jday, dst = _time.localtime(t)
-        return cls(y, m, d)
+        return cls._from_ordinal_unchecked(_timestamp2ord(t))
+
+    @classmethod
+    def utcfromtimestamp(cls, t):
+        "Construct a Date in UTC from a POSIX timestamp."
+        return cls._from_ordinal_unchecked(_timestamp2ord(t, True))
+
+    @classmethod
+    def fromtimestamps(cls, timestamps, utc=False):
+        """Construct a list of Dates from an iterable of POSIX timestamps.
+
+        The dates are in local time, unless utc is true.
+        """
+        from_ordinal = cls._from_ordinal_unchecked
+        to_ordinal = _timestamp2ord
+        return [from_ordinal(to_ordinal(t, utc)) for t in timestamps]
 
     @classmethod
     def today(cls):
@@ -68,8 +186,29 @@ class BaseDate:
         January 1 of year 1 is day 1.  Only the year, month and day are
         non-zero in the result.
         """
-        y, m, d = _ord2ymd(n)
-        return cls(y, m, d)
+        if not isinstance(n, int):
+            raise TypeError('int expected')
+        if not 1 <= n <= _MAXORDINAL:
+            raise ValueError('ordinal must be in 1..%d' % _MAXORDINAL, n)
+        return cls._from_ordinal_unchecked(n)
+
+    @classmethod
+    def fromisoformat(cls, date_string):
+        """Construct a Date from a string in the format 'YYYY-MM-DD'.
+
+        This is the inverse of isoformat().
+        """
+        if not isinstance(date_string, str):
+            raise TypeError('fromisoformat: argument must be str')
+        return cls._from_ordinal_unchecked(_parse_isodate(date_string))
+
+    @classmethod
+    def fromisocalendar(cls, year, week, day):
+        """Construct a Date from the ISO year, week number and weekday.
+
+        This is the inverse of isocalendar().
+        """
+        return cls._from_ordinal_unchecked(_isocalendar2ord(year, week, day))
 
     # Conversions to string
 
@@ -80,27 +219,23 @@ class BaseDate:
         >>> repr(dt)
         'tider.Basedate(2010, 1, 1)'
         """
+        year, month, day = self._getymd()
         return "%s(%d, %d, %d)" % ('Datetime.' + self.__class__.__name__,
-                                   self._year,
-                                   self._month,
-                                   self._day)
-    # XXX These shouldn't depend on time.localtime(), because that
-    # clips the usable dates to [1970 .. 2038).  At least ctime() is
-    # easily done without using strftime() -- that's better too because
-    # strftime("%c", ...) is locale specific.
-
-
+                                   year, month, day)
     def ctime(self):
         "Return ctime() style string."
-        weekday = self.toordinal() % 7 or 7
+        weekday = self._ordinal % 7 or 7
+        year, month, day = self._getymd()
         return "%s %s %2d 00:00:00 %04d" % (
             _DAYNAMES[weekday],
-            _MONTHNAMES[self._month],
-            self._day, self._year)
+            _MONTHNAMES[month],
+            day, year)
 
     def strftime(self, fmt):
         "Format using strftime()."
-        return _wrap_strftime(self, fmt, self.timetuple())
+        year, month, day = self._getymd()
+        return _strftime(fmt, (year, month, day, 0, 0, 0, 0,
+                               self._ordinal, self))
 
     def __format__(self, fmt):
         if len(fmt) != 0:
@@ -116,7 +251,7 @@ class BaseDate:
         - http://www.w3.org/TR/NOTE-Datetime
         - http://www.cl.cam.ac.uk/~mgk25/iso-time.html
         """
-        return "%04d-%02d-%02d" % (self._year, self._month, self._day)
+        return "%04d-%02d-%02d" % self._getymd()
 
     __str__ = isoformat
 
@@ -124,24 +259,24 @@ class BaseDate:
     @property
     def year(self):
         """year (1-9999)"""
-        return self._year
+        return self._getymd()[0]
 
     @property
     def month(self):
         """month (1-12)"""
-        return self._month
+        return self._getymd()[1]
 
     @property
     def day(self):
         """day (1-31)"""
-        return self._day
+        return self._getymd()[2]
 
     # Standard conversions, comparisons, __hash__ (and helpers)
 
     def timetuple(self):
         "Return local time tuple compatible with time.localtime()."
-        return _build_struct_time(self._year, self._month, self._day,
-                                  0, 0, 0, -1)
+        year, month, day = self._getymd()
+        return _build_struct_time(year, month, day, 0, 0, 0, -1)
 
     def toordinal(self):
         """Return proleptic Gregorian ordinal for the year, month and day.
@@ -149,69 +284,74 @@ class BaseDate:
         January 1 of year 1 is day 1.  Only the year, month and day values
         contribute to the result.
         """
-        return _ymd2ord(self._year, self._month, self._day)
+        return self._ordinal
 
     def replace(self, year=None, month=None, day=None):
         """Return a new Date with new values for the specified fields."""
+        y, m, d = self._getymd()
         if year is None:
-            year = self._year
+            year = y
         if month is None:
-            month = self._month
+            month = m
         if day is None:
-            day = self._day
+            day = d
         _check_date_fields(year, month, day)
-        return self.__class__(year, month, day)
+        cls = self.__class__
+        if cls is not BaseDate:
+            # Subclasses may do their own thing in __init__.
+            return cls(year, month, day)
+        self = cls._from_ordinal_unchecked(_ymd2ord(year, month, day))
+        if self._ymd is None:
+            self._ymd = year, month, day
+        return self
 
     # Comparisons of Date objects with other.
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, BaseDate):
-            return self._cmp(other) == 0
+            return self._ordinal == other._ordinal
         return NotImplemented
 
     def __ne__(self, other):
         if isinstance(other, BaseDate):
-            return self._cmp(other) != 0
+            return self._ordinal != other._ordinal
         return NotImplemented
 
     def __le__(self, other):
         if isinstance(other, BaseDate):
-            return self._cmp(other) <= 0
+            return self._ordinal <= other._ordinal
         return NotImplemented
 
     def __lt__(self, other):
         if isinstance(other, BaseDate):
-            return self._cmp(other) < 0
+            return self._ordinal < other._ordinal
         return NotImplemented
 
     def __ge__(self, other):
         if isinstance(other, BaseDate):
-            return self._cmp(other) >= 0
+            return self._ordinal >= other._ordinal
         return NotImplemented
 
     def __gt__(self, other):
         if isinstance(other, BaseDate):
-            return self._cmp(other) > 0
+            return self._ordinal > other._ordinal
         return NotImplemented
 
-    def _cmp(self, other):
-        assert isinstance(other, BaseDate)
-        this = self._year, self._month, self._day
-        other = other._year, other._month, other._day
-        return _cmp(this, other)
-
     def __hash__(self):
         "Hash."
-        return hash(self._getstate())
+        # The ordinal is an int, so hashing it needs no caching.
+        return hash(self._ordinal)
 
     # Computations
 
     def __add__(self, other):
         "Add a BaseDate to a Duration."
         if isinstance(other, Duration):
-            o = self.toordinal() + other.days
+            o = self._ordinal + other.days
             if 0 < o <= _MAXORDINAL:
-                return BaseDate.fromordinal(o)
+                return BaseDate._from_ordinal_unchecked(o)
             raise OverflowError("result out of range")
         return NotImplemented
 
@@ -220,23 +360,25 @@ class BaseDate:
     def __sub__(self, other):
         """Subtract two dates, or a BaseDate and a Duration."""
         if isinstance(other, Duration):
-            return self + Duration(-other.days)
+            o = self._ordinal - other.days
+            if 0 < o <= _MAXORDINAL:
+                return BaseDate._from_ordinal_unchecked(o)
+            raise OverflowError("result out of range")
         if isinstance(other, BaseDate):
-            days1 = self.toordinal()
-            days2 = other.toordinal()
-            return Duration(days1 - days2)
+            return Duration._from_microseconds(
+                (self._ordinal - other._ordinal) * 86400000000)
         return NotImplemented
 
     def weekday(self):
         "Return day of the week, where Monday == 0 ... Sunday == 6."
-        return (self.toordinal() + 6) % 7
+        return (self._ordinal + 6) % 7
 
     # Day-of-the-week and week-of-the-year, according to ISO
 
     def isoweekday(self):
         "Return day of the week, where Monday == 1 ... Sunday == 7."
         # 1-Jan-0001 is a Monday
-        return self.toordinal() % 7 or 7
+        return self._ordinal % 7 or 7
 
     def isocalendar(self):
         """Return a 3-tuple containing ISO year, week number, and weekday.
@@ -250,29 +392,12 @@ class BaseDate:
         ISO calendar algorithm taken from
         http://www.phys.uu.nl/~vgent/calendar/isocalendar.htm
         """
-        year = self._year
-        week1monday = _isoweek1monday(year)
-        today = _ymd2ord(self._year, self._month, self._day)
-        # Internally, week and day have origin 0
-        week, day = divmod(today - week1monday, 7)
-        if week < 0:
-            year -= 1
-            week1monday = _isoweek1monday(year)
-            week, day = divmod(today - week1monday, 7)
-        elif week >= 52:
-            if today >= _isoweek1monday(year+1):
-                year += 1
-                week = 0
-        return year, week+1, day+1
+        return _isocalendar(self._getymd()[0], self._ordinal)
 
     # Pickle support.
 
     def _getstate(self):
-        return self._year, self._month, self._day
-
-    def __setstate(self, string):
-        import pdb;pdb.set_trace()
-        self._year, self._month, self._day = string
+        return self._getymd()
 
     def __reduce__(self):
         return (self.__class__, self._getstate())
@@ -280,6 +405,41 @@ class BaseDate:
 
 BaseDate.resolution = Duration(days=1)
 
+
+def parse_dates(data, ordinals=False):
+    """Parse many 'YYYY-MM-DD' dates in one go.
+
+    data is either an iterable of str or bytes, or a str or bytes-like
+    buffer with one date per line.
+
+    Returns a (dates, errors) tuple.  Unless ordinals is true, dates is a
+    list of Date objects, with None for rows that could not be parsed.
+    If ordinals is true, dates is instead an array('i') of proleptic
+    Gregorian ordinals, with 0 for the rows that could not be parsed.
+    errors is a list of (index, exception) tuples for those rows.
+    """
+    errors = []
+    if ordinals:
+        result = _array('i')
+        invalid = 0
+        convert = None
+    else:
+        result = []
+        invalid = None
+        convert = BaseDate._from_ordinal_unchecked
+    append = result.append
+    parse = _parse_isodate
+    for index, row in enumerate(_rows(data)):
+        try:
+            ordinal = parse(row)
+        except (ValueError, TypeError) as e:
+            append(invalid)
+            errors.append((index, e))
+        else:
+            append(ordinal if convert is None else convert(ordinal))
+    return result, errors
+
+
 # For the time, let's use just Gregorian Astronomical dates. That's wrong,
 # but the best way of implementing other dates takes thinking.
 Date = BaseDate
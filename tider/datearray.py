@@ -0,0 +1,227 @@
+import numpy as np
+
+from ._arraybase import _ArraySequence
+from .date import Date
+from .duration import Duration
+from ._utils import _EPOCH_ORDINAL, _MAXORDINAL
+
+
+def _ord2ymd(ordinals):
+    """ordinals -> (years, months, days) arrays.
+
+    This is the vectorized version of tider._utils._ord2ymd, see there for
+    a description of the algorithm.
+    """
+    n1 = 4 * ordinals.astype(np.int64) + 1223
+    c = n1 // 146097
+    p2 = 2939745 * ((n1 - 146097 * c) | 3)
+    n3 = 2141 * ((p2 & 0xFFFFFFFF) // 11758980) + 197913
+    j = (n3 >= 852059).astype(np.int64)
+    return (100 * c + (p2 >> 32) + j,
+            (n3 >> 16) - 12 * j,
+            (n3 & 0xFFFF) // 2141 + 1)
+
+
+def _year_starts(years):
+    """years -> array of the ordinals of January 1st of those years."""
+    y = years - 1
+    return y * 365 + y // 4 - y // 100 + y // 400 + 1
+
+
+class DateArray(_ArraySequence):
+    """An array of Dates, stored as int32 proleptic Gregorian ordinals.
+
+    A DateArray does calendar calculations on all the dates at once,
+    without creating a Date for each element.
+
+    Constructors:
+
+    __init__()
+    fromordinal()
+
+    Operators:
+
+    __len__, __getitem__, __iter__, __repr__
+    __add__, __radd__, __sub__ (only with Duration arg)
+    comparisons with Date and DateArray, returning boolean arrays
+
+    Methods:
+
+    toordinal()
+    tolist()
+    weekday()
+    isoweekday(), isocalendar(), isoformat()
+
+    Properties (readonly):
+    year, month, day
+    """
+    __slots__ = '_ordinals',
+
+    def __init__(self, dates=()):
+        """Constructor.
+
+        Arguments:
+
+        dates, an iterable of Date objects
+        """
+        self._ordinals = np.fromiter((d.toordinal() for d in dates),
+                                     dtype=np.int32)
+        self._ordinals.flags.writeable = False
+
+    @classmethod
+    def fromordinal(cls, ordinals):
+        """Construct a DateArray from proleptic Gregorian ordinals.
+
+        January 1 of year 1 is day 1.
+        """
+        ordinals = np.asarray(ordinals)
+        if ordinals.ndim != 1:
+            raise ValueError('ordinals must be one-dimensional')
+        if ordinals.size and ordinals.dtype.kind not in 'iu':
+            raise TypeError('int expected')
+        if ordinals.size and (ordinals.min() < 1 or
+                              ordinals.max() > _MAXORDINAL):
+            raise ValueError('ordinal must be in 1..%d' % _MAXORDINAL)
+        return cls._from_ordinals_unchecked(ordinals.astype(np.int32))
+
+    @classmethod
+    def _from_ordinals_unchecked(cls, ordinals):
+        self = object.__new__(cls)
+        ordinals.flags.writeable = False
+        self._ordinals = ordinals
+        return self
+
+    # Sequence protocol, see _ArraySequence
+
+    _values = '_ordinals'
+    _item = Date._from_ordinal_unchecked
+    _from_values_unchecked = _from_ordinals_unchecked
+
+    def __repr__(self):
+        return 'tider.DateArray(%s)' % self.isoformat().tolist()
+
+    # Conversions
+
+    def toordinal(self):
+        """Return the proleptic Gregorian ordinals as a read-only array."""
+        return self._ordinals
+
+    def tolist(self):
+        """Return the dates as a list of Date objects."""
+        return list(self)
+
+    def isoformat(self):
+        """Return the dates formatted according to ISO, as a str array.
+
+        This is 'YYYY-MM-DD'.
+        """
+        # datetime64 uses the same proleptic Gregorian calendar.
+        days = (self._ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+        return np.datetime_as_string(days)
+
+    # Read-only field accessors
+
+    @property
+    def year(self):
+        """year (1-9999)"""
+        return _ord2ymd(self._ordinals)[0]
+
+    @property
+    def month(self):
+        """month (1-12)"""
+        return _ord2ymd(self._ordinals)[1]
+
+    @property
+    def day(self):
+        """day (1-31)"""
+        return _ord2ymd(self._ordinals)[2]
+
+    def weekday(self):
+        "Return day of the week, where Monday == 0 ... Sunday == 6."
+        return (self._ordinals + 6) % 7
+
+    def isoweekday(self):
+        "Return day of the week, where Monday == 1 ... Sunday == 7."
+        return (self._ordinals + 6) % 7 + 1
+
+    def isocalendar(self):
+        """Return a 3-tuple of arrays with ISO year, week number, and weekday.
+
+        The ISO year of a date is the year of the Thursday in its week, and
+        the week number counts the weeks from the first Thursday of the
+        ISO year.
+        """
+        weekday = (self._ordinals.astype(np.int64) + 6) % 7
+        thursday = self._ordinals - weekday + 3
+        year = _ord2ymd(thursday)[0]
+        week = (thursday - _year_starts(year)) // 7 + 1
+        return year, week, weekday + 1
+
+    # Comparisons
+
+    def _other_ordinals(self, other):
+        if isinstance(other, DateArray):
+            return other._ordinals
+        if isinstance(other, Date):
+            return other.toordinal()
+        return None
+
+    def __eq__(self, other):
+        other = self._other_ordinals(other)
+        if other is None:
+            return NotImplemented
+        return self._ordinals == other
+
+    def __ne__(self, other):
+        other = self._other_ordinals(other)
+        if other is None:
+            return NotImplemented
+        return self._ordinals != other
+
+    def __le__(self, other):
+        other = self._other_ordinals(other)
+        if other is None:
+            return NotImplemented
+        return self._ordinals <= other
+
+    def __lt__(self, other):
+        other = self._other_ordinals(other)
+        if other is None:
+            return NotImplemented
+        return self._ordinals < other
+
+    def __ge__(self, other):
+        other = self._other_ordinals(other)
+        if other is None:
+            return NotImplemented
+        return self._ordinals >= other
+
+    def __gt__(self, other):
+        other = self._other_ordinals(other)
+        if other is None:
+            return NotImplemented
+        return self._ordinals > other
+
+    __hash__ = None
+
+    # Computations
+
+    def _shift(self, days):
+        result = self._ordinals.astype(np.int64) + days
+        if result.size and (result.min() < 1 or result.max() > _MAXORDINAL):
+            raise OverflowError("result out of range")
+        return self._from_ordinals_unchecked(result.astype(np.int32))
+
+    def __add__(self, other):
+        "Add a Duration to all the dates."
+        if isinstance(other, Duration):
+            return self._shift(other.days)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        "Subtract a Duration from all the dates."
+        if isinstance(other, Duration):
+            return self._shift(-other.days)
+        return NotImplemented
@@ -0,0 +1,170 @@
+from array import array as _array
+
+from .date import BaseDate
+from .duration import Duration
+from ._utils import _MAXORDINAL
+
+_ONE_DAY = Duration(1)
+
+
+def _repr_range(r):
+    start = BaseDate._from_ordinal_unchecked(r.start)
+    stop = BaseDate._from_ordinal_unchecked(r.stop)
+    if r.step == 1:
+        return "tider.DateRange(%r, %r)" % (start, stop)
+    return "tider.DateRange(%r, %r, %r)" % (start, stop, Duration(r.step))
+
+
+class DateRange(object):
+    """An immutable sequence of Dates, like range() is for integers.
+
+    DateRange(start, stop[, step]) holds the Dates from start up to, but
+    not including, stop, every step days.  The step is a Duration of whole
+    days, one day by default, and can be negative.
+
+    Internally this is a range() of ordinals, so len(), "in", index(),
+    slicing and reversal do not depend on the length, and the Dates are
+    only created when they are needed.
+
+    Operators:
+
+    __len__, __getitem__, __contains__, __iter__, __reversed__
+    __eq__, __hash__, __repr__
+
+    Methods:
+
+    index(), count()
+    toordinal()
+    todatearray()
+
+    Properties (readonly):
+    start, stop, step
+    """
+    __slots__ = '_range',
+
+    def __init__(self, start, stop, step=_ONE_DAY):
+        if not isinstance(start, BaseDate) or not isinstance(stop, BaseDate):
+            raise TypeError("start and stop must be Dates")
+        if not isinstance(step, Duration):
+            raise TypeError("step must be a Duration")
+        if step.seconds or step.microseconds:
+            raise ValueError("step must be a whole number of days")
+        if not step.days:
+            raise ValueError("step must not be zero")
+        self._range = range(start.toordinal(), stop.toordinal(), step.days)
+
+    @classmethod
+    def _from_range(cls, ordinals):
+        self = object.__new__(cls)
+        self._range = ordinals
+        return self
+
+    # Read-only field accessors
+
+    @property
+    def start(self):
+        """The first Date of the range."""
+        return BaseDate._from_ordinal_unchecked(self._range.start)
+
+    @property
+    def stop(self):
+        """The Date the range stops before."""
+        stop = self._range.stop
+        if not 0 < stop <= _MAXORDINAL:
+            # Slices can stop outside of the supported dates.
+            raise OverflowError("stop is out of range")
+        return BaseDate._from_ordinal_unchecked(stop)
+
+    @property
+    def step(self):
+        """The step between the Dates, as a Duration."""
+        return Duration(self._range.step)
+
+    # Sequence protocol
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._from_range(self._range[index])
+        return BaseDate._from_ordinal_unchecked(self._range[index])
+
+    def __iter__(self):
+        return map(BaseDate._from_ordinal_unchecked, self._range)
+
+    def __reversed__(self):
+        return map(BaseDate._from_ordinal_unchecked, reversed(self._range))
+
+    def __contains__(self, date):
+        if isinstance(date, BaseDate):
+            return date.toordinal() in self._range
+        return False
+
+    def index(self, date):
+        """Return the index of a Date in the range.
+
+        Raises ValueError if the Date is not in the range.
+        """
+        if isinstance(date, BaseDate) and date.toordinal() in self._range:
+            return self._range.index(date.toordinal())
+        raise ValueError("%r is not in range" % (date,))
+
+    def count(self, date):
+        """Return the number of times a Date is in the range, 0 or 1."""
+        return int(date in self)
+
+    def __eq__(self, other):
+        if isinstance(other, DateRange):
+            # Like range(), ranges with the same Dates are equal.
+            return self._range == other._range
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, DateRange):
+            return self._range != other._range
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._range)
+
+    def __repr__(self):
+        r = self._range
+        if 0 < r.stop <= _MAXORDINAL and (0 < r.start <= _MAXORDINAL or
+                                          not r):
+            return _repr_range(r)
+        if not r:
+            # All empty ranges are equal.
+            return _repr_range(range(1, 1, r.step))
+        # Slices can stop outside of the supported dates, so stop right
+        # after the last Date instead.  A range can't have both the first
+        # and the last supported Date, so if that is outside as well, the
+        # reversed range is inside.
+        sign = 1 if r.step > 0 else -1
+        last = r[-1]
+        if 0 < last + sign <= _MAXORDINAL:
+            return _repr_range(range(r.start, last + sign, r.step))
+        return _repr_range(range(last, r.start - sign, -r.step)) + '[::-1]'
+
+    # Conversions
+
+    def toordinal(self):
+        """Return the proleptic Gregorian ordinals as an array('i')."""
+        return _array('i', self._range)
+
+    def todatearray(self):
+        """Return the Dates as a DateArray.
+
+        This requires NumPy.
+        """
+        import numpy as np
+        from .datearray import DateArray
+        r = self._range
+        return DateArray._from_ordinals_unchecked(
+            np.arange(r.start, r.stop, r.step, dtype=np.int32))
+
+    # Pickle support.
+
+    def __reduce__(self):
+        r = self._range
+        return (self.__class__._from_range, (r,))
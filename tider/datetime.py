@@ -1,4 +1,499 @@
+import math as _math
+import time as _time
+
+from .date import Date
+from .duration import Duration
+from .time import Time, _check_time_fields, _format_time
+from ._utils import _check_date_fields, _ymd2ord, _ord2ymd, _strftime
+from ._utils import _EPOCH_ORDINAL, _MAXORDINAL, _local_offset
+
+_US_PER_DAY = 86400000000
+
+# The first and last microsecond of the supported years, since the epoch.
+_MIN_US = (1 - _EPOCH_ORDINAL) * _US_PER_DAY
+_MAX_US = (_MAXORDINAL + 1 - _EPOCH_ORDINAL) * _US_PER_DAY - 1
+
+
+def _check_tzinfo(tzinfo):
+    if tzinfo is not None and not hasattr(tzinfo, 'utcoffset'):
+        raise TypeError("tzinfo argument must be None or a timezone, not %s"
+                        % type(tzinfo).__name__)
+
+
+def _int64s(buffer):
+    """A buffer of int64s, or of bytes in native byte order -> a list."""
+    view = memoryview(buffer)
+    if view.format in ('B', 'b', 'c'):
+        if view.nbytes % 8:
+            raise ValueError('buffer size must be a multiple of 8')
+        view = view.cast('B').cast('q')
+    elif view.format not in ('q', 'l', '@q', '@l') or view.itemsize != 8:
+        raise TypeError('a buffer of int64 is required (got format %r)' %
+                        view.format)
+    return view.tolist()
+
+
+def _format_offset(us):
+    sign = '+'
+    if us < 0:
+        sign = '-'
+        us = -us
+    ss, us = divmod(us, 1000000)
+    mm, ss = divmod(ss, 60)
+    hh, mm = divmod(mm, 60)
+    result = '%s%02d:%02d' % (sign, hh, mm)
+    if ss or us:
+        result += ':%02d' % ss
+        if us:
+            result += '.%06d' % us
+    return result
 
 
 class Datetime(object):
-    pass
+    """A date and a time, optionally with a timezone.
+
+    Constructors:
+
+    __new__()
+    now(), utcnow()
+    fromtimestamp(), fromtimestamp_ns(), fromtimestamps()
+    combine()
+
+    Operators:
+
+    __repr__, __str__, __hash__
+    __add__, __radd__, __sub__ (add/radd only with Duration arg)
+    comparisons with other Datetimes
+
+    Methods:
+
+    date(), time()
+    utcoffset(), dst(), tzname()
+    astimezone()
+    replace()
+    isoformat()
+    strftime()
+
+    Properties (readonly):
+    year, month, day, hour, minute, second, microsecond, tzinfo
+
+    Internally the Datetime is stored as the number of microseconds since
+    1970-01-01 00:00, in UTC if it has a timezone and in its own wall time
+    if it doesn't.  Comparisons, hashing and arithmetic are done on that
+    number.  The UTC offset and the fields are only calculated when needed,
+    and are then cached.
+
+    Adding a Duration to a Datetime with a timezone adds to the instant,
+    not to the wall time, so the result is always the given time later.
+
+    The timezone's utcoffset(dt) must return the offset at the instant of
+    dt if dt has that timezone, and at the wall time of dt otherwise, as
+    the timezones in tider do.
+    """
+    __slots__ = '_us', '_tzinfo', '_offset', '_fields'
+
+    def __new__(cls, year, month, day, hour=0, minute=0, second=0,
+                microsecond=0, tzinfo=None):
+        """Constructor.
+
+        Arguments:
+
+        year, month, day (required)
+        hour, minute, second, microsecond (default to zero)
+        tzinfo (default to None)
+
+        Wall times that are ambiguous or don't exist in the timezone get
+        the UTC offset that the timezone gives them.
+        """
+        _check_date_fields(year, month, day)
+        hour, minute, second, microsecond = _check_time_fields(
+            hour, minute, second, microsecond)
+        _check_tzinfo(tzinfo)
+        wall = (((_ymd2ord(year, month, day) - _EPOCH_ORDINAL) * 86400 +
+                 hour * 3600 + minute * 60 + second) * 1000000 + microsecond)
+        self = cls._from_microseconds(wall)
+        self._fields = year, month, day, hour, minute, second, microsecond
+        if tzinfo is not None:
+            # The offset of a naive Datetime is looked up by wall time.
+            self._set_tzinfo(tzinfo)
+        return self
+
+    @classmethod
+    def _from_microseconds(cls, us, tzinfo=None):
+        """Construct a Datetime from microseconds since the epoch, in UTC
+        if tzinfo isn't None, and in wall time otherwise.
+        """
+        self = object.__new__(cls)
+        self._us = us
+        self._tzinfo = tzinfo
+        self._offset = 0 if tzinfo is None else None
+        self._fields = None
+        return self
+
+    def _in_range(self):
+        """Return whether the wall time is within min and max."""
+        us = self._us
+        # UTC offsets are less than a day, so only values near the ends
+        # need the offset.
+        if _MIN_US + _US_PER_DAY <= us <= _MAX_US - _US_PER_DAY:
+            return True
+        if not _MIN_US - _US_PER_DAY < us < _MAX_US + _US_PER_DAY:
+            return False
+        return _MIN_US <= self._wall_microseconds() <= _MAX_US
+
+    def _set_tzinfo(self, tzinfo):
+        # Turn a naive Datetime into one in tzinfo with the same wall time.
+        offset = tzinfo.utcoffset(self).total_microseconds()
+        self._us -= offset
+        self._offset = offset
+        self._tzinfo = tzinfo
+
+    @classmethod
+    def _from_timestamp_microseconds(cls, us, tz):
+        """Construct a Datetime from microseconds since the epoch, UTC, in
+        local wall time if tz is None and in tz otherwise.
+        """
+        # The wall time may be off by a day from the UTC time.
+        if not _MIN_US - _US_PER_DAY < us < _MAX_US + _US_PER_DAY:
+            raise OverflowError("timestamp out of range")
+        if tz is None:
+            us += _local_offset(us // 1000000) * 1000000
+        self = cls._from_microseconds(us, tz)
+        if not self._in_range():
+            raise OverflowError("timestamp out of range")
+        return self
+
+    @classmethod
+    def now(cls, tz=None):
+        """Construct a Datetime from time.time_ns().
+
+        The result is naive and in local time, unless tz is given.
+        """
+        _check_tzinfo(tz)
+        return cls._from_timestamp_microseconds(_time.time_ns() // 1000, tz)
+
+    @classmethod
+    def utcnow(cls):
+        "Construct a naive Datetime in UTC from time.time_ns()."
+        return cls._from_microseconds(_time.time_ns() // 1000)
+
+    @classmethod
+    def fromtimestamp(cls, t, tz=None):
+        """Construct a Datetime from a POSIX timestamp (like time.time()).
+
+        The result is naive and in local time, unless tz is given.  A
+        float timestamp is rounded to the nearest microsecond.
+        """
+        _check_tzinfo(tz)
+        if isinstance(t, int):
+            us = t * 1000000
+        else:
+            # The fraction of a float is exact, so only it is rounded.
+            seconds = _math.floor(t)
+            us = seconds * 1000000 + round((t - seconds) * 1e6)
+        return cls._from_timestamp_microseconds(us, tz)
+
+    @classmethod
+    def fromtimestamp_ns(cls, ns, tz=None):
+        """Construct a Datetime from nanoseconds since the epoch (like
+        time.time_ns()), rounded down to the microsecond.
+
+        The result is naive and in local time, unless tz is given.
+        """
+        if not isinstance(ns, int):
+            raise TypeError('int expected')
+        _check_tzinfo(tz)
+        return cls._from_timestamp_microseconds(ns // 1000, tz)
+
+    @classmethod
+    def fromtimestamps(cls, timestamps, tz=None, ns=False):
+        """Construct a list of Datetimes from a buffer of int64 POSIX
+        timestamps.
+
+        timestamps is an object that supports the buffer protocol, like
+        array('q'), a NumPy int64 array, or bytes with the int64s in
+        native byte order.  The timestamps are in seconds, or in
+        nanoseconds if ns is true.
+
+        The results are naive and in local time, unless tz is given.
+        """
+        _check_tzinfo(tz)
+        timestamps = _int64s(timestamps)
+        convert = cls._from_timestamp_microseconds
+        if ns:
+            return [convert(t // 1000, tz) for t in timestamps]
+        return [convert(t * 1000000, tz) for t in timestamps]
+
+    @classmethod
+    def combine(cls, date, time, tzinfo=None):
+        "Construct a Datetime from a Date and a Time."
+        if not isinstance(date, Date):
+            raise TypeError("date argument must be a Date instance")
+        if not isinstance(time, Time):
+            raise TypeError("time argument must be a Time instance")
+        _check_tzinfo(tzinfo)
+        self = cls._from_microseconds(
+            (date._ordinal - _EPOCH_ORDINAL) * _US_PER_DAY + time._us)
+        if tzinfo is not None:
+            self._set_tzinfo(tzinfo)
+        return self
+
+    def _utcoffset_microseconds(self):
+        offset = self._offset
+        if offset is None:
+            offset = self._offset = self._tzinfo.utcoffset(
+                self).total_microseconds()
+        return offset
+
+    def _wall_microseconds(self):
+        """Return the wall time in microseconds since the epoch."""
+        return self._us + self._utcoffset_microseconds()
+
+    def _getfields(self):
+        fields = self._fields
+        if fields is None:
+            days, us = divmod(self._wall_microseconds(), _US_PER_DAY)
+            ss, us = divmod(us, 1000000)
+            mm, ss = divmod(ss, 60)
+            hh, mm = divmod(mm, 60)
+            fields = self._fields = (_ord2ymd(days + _EPOCH_ORDINAL) +
+                                     (hh, mm, ss, us))
+        return fields
+
+    # Read-only field accessors
+
+    @property
+    def year(self):
+        """year (1-9999)"""
+        return self._getfields()[0]
+
+    @property
+    def month(self):
+        """month (1-12)"""
+        return self._getfields()[1]
+
+    @property
+    def day(self):
+        """day (1-31)"""
+        return self._getfields()[2]
+
+    @property
+    def hour(self):
+        """hour (0-23)"""
+        return self._getfields()[3]
+
+    @property
+    def minute(self):
+        """minute (0-59)"""
+        return self._getfields()[4]
+
+    @property
+    def second(self):
+        """second (0-59)"""
+        return self._getfields()[5]
+
+    @property
+    def microsecond(self):
+        """microsecond (0-999999)"""
+        return self._getfields()[6]
+
+    @property
+    def tzinfo(self):
+        """timezone info object"""
+        return self._tzinfo
+
+    # Conversions
+
+    def date(self):
+        "Return the date part, as a Date."
+        return Date._from_ordinal_unchecked(
+            self._wall_microseconds() // _US_PER_DAY + _EPOCH_ORDINAL)
+
+    def time(self):
+        "Return the time part, as a Time, without the timezone."
+        return Time._from_microseconds_unchecked(
+            self._wall_microseconds() % _US_PER_DAY)
+
+    def utcoffset(self):
+        "Return the UTC offset as a Duration, or None if naive."
+        if self._tzinfo is None:
+            return None
+        return Duration._from_microseconds(self._utcoffset_microseconds())
+
+    def dst(self):
+        "Return the daylight saving time adjustment, or None if naive."
+        if self._tzinfo is None:
+            return None
+        return self._tzinfo.dst(self)
+
+    def tzname(self):
+        "Return the name of the timezone, or None if naive."
+        if self._tzinfo is None:
+            return None
+        return self._tzinfo.tzname(self)
+
+    def astimezone(self, tz):
+        "Return the same instant in another timezone."
+        if self._tzinfo is None:
+            raise ValueError("astimezone() requires an aware Datetime")
+        _check_tzinfo(tz)
+        if tz is None:
+            raise TypeError("tz argument must be a timezone")
+        result = self._from_microseconds(self._us, tz)
+        if not result._in_range():
+            raise OverflowError("result out of range")
+        return result
+
+    def replace(self, year=None, month=None, day=None, hour=None,
+                minute=None, second=None, microsecond=None, tzinfo=True):
+        """Return a new Datetime with new values for the specified fields.
+
+        The wall time is kept when the tzinfo is replaced.
+        """
+        y, m, d, hh, mm, ss, us = self._getfields()
+        if year is None:
+            year = y
+        if month is None:
+            month = m
+        if day is None:
+            day = d
+        if hour is None:
+            hour = hh
+        if minute is None:
+            minute = mm
+        if second is None:
+            second = ss
+        if microsecond is None:
+            microsecond = us
+        if tzinfo is True:
+            tzinfo = self._tzinfo
+        return self.__class__(year, month, day, hour, minute, second,
+                              microsecond, tzinfo)
+
+    # Conversions to string
+
+    def __repr__(self):
+        """Convert to formal string, for repr()."""
+        fields = list(self._getfields())
+        while len(fields) > 3 and not fields[-1]:
+            del fields[-1]
+        s = ', '.join(str(f) for f in fields)
+        if self._tzinfo is not None:
+            s += ', tzinfo=%r' % (self._tzinfo,)
+        return 'tider.%s(%s)' % (self.__class__.__name__, s)
+
+    def isoformat(self, sep='T'):
+        """Return the Datetime formatted according to ISO.
+
+        This is 'YYYY-MM-DDTHH:MM:SS.mmmmmm', or 'YYYY-MM-DDTHH:MM:SS' if
+        the microsecond is 0, followed by the UTC offset as '+HH:MM' if
+        the Datetime has a timezone.
+        """
+        y, m, d, hh, mm, ss, us = self._getfields()
+        result = '%04d-%02d-%02d%s%s' % (y, m, d, sep,
+                                         _format_time(hh, mm, ss, us))
+        if self._tzinfo is not None:
+            result += _format_offset(self._utcoffset_microseconds())
+        return result
+
+    def __str__(self):
+        return self.isoformat(sep=' ')
+
+    def strftime(self, fmt):
+        "Format using strftime()."
+        y, m, d, hh, mm, ss, us = self._getfields()
+        return _strftime(fmt, (y, m, d, hh, mm, ss, us,
+                               _ymd2ord(y, m, d), self))
+
+    def __format__(self, fmt):
+        if not isinstance(fmt, str):
+            raise TypeError("must be str, not %s" % type(fmt).__name__)
+        if len(fmt) != 0:
+            return self.strftime(fmt)
+        return str(self)
+
+    # Comparisons of Datetime objects with other.
+
+    def _check_comparable(self, other):
+        if (self._tzinfo is None) != (other._tzinfo is None):
+            raise TypeError("can't compare offset-naive and offset-aware"
+                            " Datetimes")
+
+    def __eq__(self, other):
+        if isinstance(other, Datetime):
+            return (self._us == other._us and
+                    (self._tzinfo is None) == (other._tzinfo is None))
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, Datetime):
+            return (self._us != other._us or
+                    (self._tzinfo is None) != (other._tzinfo is None))
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Datetime):
+            self._check_comparable(other)
+            return self._us <= other._us
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Datetime):
+            self._check_comparable(other)
+            return self._us < other._us
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Datetime):
+            self._check_comparable(other)
+            return self._us >= other._us
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Datetime):
+            self._check_comparable(other)
+            return self._us > other._us
+        return NotImplemented
+
+    def __hash__(self):
+        "Hash."
+        return hash(self._us)
+
+    # Computations
+
+    def __add__(self, other):
+        "Add a Datetime and a Duration."
+        if isinstance(other, Duration):
+            result = self._from_microseconds(self._us + other._us,
+                                             self._tzinfo)
+            if result._in_range():
+                return result
+            raise OverflowError("result out of range")
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """Subtract two Datetimes, or a Datetime and a Duration."""
+        if isinstance(other, Duration):
+            result = self._from_microseconds(self._us - other._us,
+                                             self._tzinfo)
+            if result._in_range():
+                return result
+            raise OverflowError("result out of range")
+        if isinstance(other, Datetime):
+            if (self._tzinfo is None) != (other._tzinfo is None):
+                raise TypeError("can't subtract offset-naive and"
+                                " offset-aware Datetimes")
+            return Duration._from_microseconds(self._us - other._us)
+        return NotImplemented
+
+    # Pickle support.
+
+    def __reduce__(self):
+        return (self.__class__._from_microseconds, (self._us, self._tzinfo))
+
+
+Datetime.min = Datetime(1, 1, 1)
+Datetime.max = Datetime(9999, 12, 31, 23, 59, 59, 999999)
+Datetime.resolution = Duration(microseconds=1)
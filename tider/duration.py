@@ -1,7 +1,8 @@
 from __future__ import division
 import math
+from array import array as _array
 
-from ._utils import _cmp, _cmperror
+from ._utils import _parse_isoduration, _rows
 
 
 class Duration(object):
@@ -9,8 +10,11 @@ class Duration(object):
 
     A Duration is used for doing time based arithmetic. If you subtract
     a Datetime from another Datetime the result is a Duration.
+
+    Internally the Duration is stored as a total number of microseconds.
+    The days, seconds and microseconds are calculated from it when needed.
     """
-    __slots__ = '_days', '_seconds', '_microseconds', '_hashcode'
+    __slots__ = '_us', '_hashcode'
 
     def __new__(cls, days=0, seconds=0, microseconds=0,
                 milliseconds=0, minutes=0, hours=0, weeks=0):
@@ -22,6 +26,18 @@ class Duration(object):
         # guide the C implementation; it's way more convoluted than speed-
         # ignoring auto-overflow-to-long idiomatic Python could be.
 
+        if (type(days) is int and type(seconds) is int and
+                type(microseconds) is int and type(milliseconds) is int and
+                type(minutes) is int and type(hours) is int and
+                type(weeks) is int):
+            # The common case, where no normalization is needed.
+            self = object.__new__(cls)
+            self._us = (((days + weeks*7) * 86400 + seconds + minutes*60 +
+                         hours*3600) * 1000000 +
+                        microseconds + milliseconds*1000)
+            self._hashcode = -1
+            return self
+
         # Final values, all integer.
         # s and us fit in 32-bit signed ints; d isn't bounded.
         d = s = us = 0
@@ -93,34 +109,88 @@ class Duration(object):
         assert isinstance(us, int) and 0 <= us < 1000000
 
         self = object.__new__(cls)
-        self._days = d
-        self._seconds = s
-        self._microseconds = us
+        self._us = (d * 86400 + s) * 1000000 + us
         self._hashcode = -1
         return self
 
+    @classmethod
+    def _from_microseconds(cls, us):
+        """Construct a Duration from a total number of microseconds.
+
+        This skips the argument checking and normalization of __new__, for
+        results that are already known to be valid integers.
+        """
+        self = object.__new__(cls)
+        self._us = us
+        self._hashcode = -1
+        return self
+
+    def _getfields(self):
+        d, us = divmod(self._us, 86400000000)
+        s, us = divmod(us, 1000000)
+        return d, s, us
+
     def __repr__(self):
-        if self._microseconds:
-            return "tider.Duration(%d, %d, %d)" % (self._days,
-                                                   self._seconds,
-                                                   self._microseconds)
-        if self._seconds:
-            return "tider.Duration(%d, %d)" % (self._days,
-                                               self._seconds)
-        return "tider.Duration(%d)" % (self._days)
+        d, s, us = self._getfields()
+        if us:
+            return "tider.Duration(%d, %d, %d)" % (d, s, us)
+        if s:
+            return "tider.Duration(%d, %d)" % (d, s)
+        return "tider.Duration(%d)" % (d)
 
     def __str__(self):
-        mm, ss = divmod(self._seconds, 60)
+        d, ss, us = self._getfields()
+        mm, ss = divmod(ss, 60)
         hh, mm = divmod(mm, 60)
         s = "%d:%02d:%02d" % (hh, mm, ss)
-        if self._days:
+        if d:
             def plural(n):
                 return n, abs(n) != 1 and "s" or ""
-            s = ("%d day%s, " % plural(self._days)) + s
-        if self._microseconds:
-            s = s + ".%06d" % self._microseconds
+            s = ("%d day%s, " % plural(d)) + s
+        if us:
+            s = s + ".%06d" % us
         return s
 
+    def isoformat(self):
+        """Return the Duration formatted according to ISO 8601.
+
+        This is 'PnDTnHnMn.nS', leaving out the fields that are zero, and
+        with a '-' in front of negative durations.  The zero Duration is
+        'PT0S'.
+        """
+        us = self._us
+        sign = '-' if us < 0 else ''
+        d, us = divmod(abs(us), 86400000000)
+        s, us = divmod(us, 1000000)
+        m, s = divmod(s, 60)
+        h, m = divmod(m, 60)
+        result = sign + 'P'
+        if d:
+            result += '%dD' % d
+        if h or m or s or us or not d:
+            result += 'T'
+            if h:
+                result += '%dH' % h
+            if m:
+                result += '%dM' % m
+            if us:
+                result += ('%d.%06d' % (s, us)).rstrip('0') + 'S'
+            elif s or not (d or h or m):
+                result += '%dS' % s
+        return result
+
+    @classmethod
+    def fromisoformat(cls, duration_string):
+        """Construct a Duration from an ISO 8601 duration string.
+
+        This is the inverse of isoformat().  Weeks ('PnW') and a leading '+'
+        are also accepted.  Years and months are not, as they have no fixed
+        length, and the seconds can have at most six decimals.
+        """
+        if not isinstance(duration_string, str):
+            raise TypeError('fromisoformat: argument must be str')
+        return cls._from_microseconds(_parse_isoduration(duration_string))
+
     def total_days(self):
         """Total days in the duration as float."""
         return self.total_microseconds() / 86400000000
@@ -131,32 +201,29 @@ class Duration(object):
 
     def total_microseconds(self):
         """Total microseconds in the duration."""
-        return ((self.days * 86400 + self.seconds) * 1000000 +
-                self.microseconds)
+        return self._us
 
     # Read-only field accessors
     @property
     def days(self):
         """days"""
-        return self._days
+        return self._us // 86400000000
 
     @property
     def seconds(self):
         """seconds"""
-        return self._seconds
+        return self._us % 86400000000 // 1000000
 
     @property
     def microseconds(self):
         """microseconds"""
-        return self._microseconds
+        return self._us % 1000000
 
     def __add__(self, other):
         if isinstance(other, Duration):
             # for CPython compatibility, we cannot use
             # our __class__ here, but need a real Duration
-            return Duration(self._days + other._days,
-                            self._seconds + other._seconds,
-                            self._microseconds + other._microseconds)
+            return Duration._from_microseconds(self._us + other._us)
         return NotImplemented
 
     __radd__ = __add__
@@ -165,9 +232,7 @@ class Duration(object):
         if isinstance(other, Duration):
             # for CPython compatibility, we cannot use
             # our __class__ here, but need a real Duration
-            return Duration(self._days - other._days,
-                            self._seconds - other._seconds,
-                            self._microseconds - other._microseconds)
+            return Duration._from_microseconds(self._us - other._us)
         return NotImplemented
 
     def __rsub__(self, other):
@@ -178,15 +243,13 @@ class Duration(object):
     def __neg__(self):
         # for CPython compatibility, we cannot use
         # our __class__ here, but need a real Duration
-        return Duration(-self._days,
-                        -self._seconds,
-                        -self._microseconds)
+        return Duration._from_microseconds(-self._us)
 
     def __pos__(self):
         return self
 
     def __abs__(self):
-        if self._days < 0:
+        if self._us < 0:
             return -self
         else:
             return self
@@ -195,19 +258,16 @@ class Duration(object):
         if isinstance(other, int):
             # for CPython compatibility, we cannot use
             # our __class__ here, but need a real Duration
-            return Duration(self._days * other,
-                            self._seconds * other,
-                            self._microseconds * other)
+            return Duration._from_microseconds(self._us * other)
         if isinstance(other, float):
             usec = self._to_microseconds()
-            return Duration(0, 0, usec * other)
+            return Duration._from_microseconds(round(usec * other))
         return NotImplemented
 
     __rmul__ = __mul__
 
     def _to_microseconds(self):
-        return ((self._days * 86400 + self._seconds) * 1000000 +
-                self._microseconds)
+        return self._us
 
     def __floordiv__(self, other):
         if not isinstance(other, (int, Duration)):
@@ -216,7 +276,7 @@ class Duration(object):
         if isinstance(other, Duration):
             return usec // other._to_microseconds()
         if isinstance(other, int):
-            return Duration(0, 0, usec // other)
+            return Duration._from_microseconds(usec // other)
 
     def __truediv__(self, other):
         if not isinstance(other, (int, float, Duration)):
@@ -225,74 +285,100 @@ class Duration(object):
         if isinstance(other, Duration):
             return usec / other._to_microseconds()
         if isinstance(other, int):
-            return Duration(0, 0, round(usec/other))
+            return Duration._from_microseconds(round(usec/other))
         if isinstance(other, float):
-            return Duration(0, 0, round(usec/other))
+            return Duration._from_microseconds(round(usec/other))
 
     def __mod__(self, other):
         if isinstance(other, Duration):
             r = self._to_microseconds() % other._to_microseconds()
-            return Duration(0, 0, r)
+            return Duration._from_microseconds(r)
         return NotImplemented
 
     def __divmod__(self, other):
         if isinstance(other, Duration):
             q, r = divmod(self._to_microseconds(),
                           other._to_microseconds())
-            return q, Duration(0, 0, r)
+            return q, Duration._from_microseconds(r)
         return NotImplemented
 
     # Comparisons of Duration objects with other.
 
     def __eq__(self, other):
         if isinstance(other, Duration):
-            return self._cmp(other) == 0
-        else:
-            return False
+            return self._us == other._us
+        return NotImplemented
 
     def __le__(self, other):
         if isinstance(other, Duration):
-            return self._cmp(other) <= 0
-        else:
-            _cmperror(self, other)
+            return self._us <= other._us
+        return NotImplemented
 
     def __lt__(self, other):
         if isinstance(other, Duration):
-            return self._cmp(other) < 0
-        else:
-            _cmperror(self, other)
+            return self._us < other._us
+        return NotImplemented
 
     def __ge__(self, other):
         if isinstance(other, Duration):
-            return self._cmp(other) >= 0
-        else:
-            _cmperror(self, other)
+            return self._us >= other._us
+        return NotImplemented
 
     def __gt__(self, other):
         if isinstance(other, Duration):
-            return self._cmp(other) > 0
-        else:
-            _cmperror(self, other)
-
-    def _cmp(self, other):
-        assert isinstance(other, Duration)
-        return _cmp(self._getstate(), other._getstate())
+            return self._us > other._us
+        return NotImplemented
 
     def __hash__(self):
         if self._hashcode == -1:
-            self._hashcode = hash(self._getstate())
+            self._hashcode = hash(self._us)
         return self._hashcode
 
     def __bool__(self):
-        return (self._days != 0 or
-                self._seconds != 0 or
-                self._microseconds != 0)
+        return self._us != 0
 
     # Pickle support.
     def _getstate(self):
-        return (self._days, self._seconds, self._microseconds)
+        return self._getfields()
 
     def __reduce__(self):
         return (self.__class__, self._getstate())
 
 Duration.resolution = Duration(microseconds=1)
+
+
+def parse_durations(data, microseconds=False):
+    """Parse many ISO 8601 durations in one go.
+
+    data is either an iterable of str or bytes, or a str or bytes-like
+    buffer with one duration per line.  See Duration.fromisoformat() for
+    the supported format.
+
+    Returns a (durations, errors) tuple.  Unless microseconds is true,
+    durations is a list of Duration objects, with None for rows that could
+    not be parsed.  If microseconds is true, durations is instead an
+    array('q') of the total microseconds, with 0 for the rows that could
+    not be parsed.  errors is a list of (index, exception) tuples for those
+    rows.
+    """
+    errors = []
+    if microseconds:
+        result = _array('q')
+        invalid = 0
+        convert = None
+    else:
+        result = []
+        invalid = None
+        convert = Duration._from_microseconds
+    append = result.append
+    parse = _parse_isoduration
+    for index, row in enumerate(_rows(data)):
+        try:
+            us = parse(row)
+            if convert is not None:
+                us = convert(us)
+            append(us)
+        except (ValueError, TypeError, OverflowError) as e:
+            append(invalid)
+            errors.append((index, e))
+    return result, errors
@@ -0,0 +1,323 @@
+import numpy as np
+
+from ._arraybase import _ArraySequence
+from .duration import Duration
+
+_INT64_MAX = 2**63 - 1
+
+
+def _to_microseconds(value):
+    """Duration or integer array of microseconds -> microseconds."""
+    if isinstance(value, Duration):
+        return value.total_microseconds()
+    if isinstance(value, DurationArray):
+        return value._us
+    return None
+
+
+def _check_int_array(values):
+    values = np.asarray(values)
+    if values.size and values.dtype.kind not in 'iu':
+        raise TypeError('int expected')
+    return values
+
+
+def _check_divisor(divisor):
+    if not np.all(divisor):
+        raise ZeroDivisionError('division by zero')
+
+
+class DurationArray(_ArraySequence):
+    """An array of Durations, stored as int64 microseconds.
+
+    A DurationArray does arithmetic and statistics on all the durations at
+    once, without creating a Duration for each element.  The int64 can
+    hold durations up to about 292000 years, and results outside of that
+    range overflow silently, like other NumPy integer arithmetic.  sum()
+    and mean() are exact for any number of durations.
+
+    Constructors:
+
+    __init__()
+    frommicroseconds()
+
+    Operators:
+
+    __len__, __getitem__, __iter__, __repr__
+    __add__, __radd__, __sub__, __rsub__ (with Duration and DurationArray)
+    __mul__, __rmul__ (with int, float and arrays of those)
+    __floordiv__, __truediv__ (with int, float, Duration and DurationArray)
+    __neg__, __pos__, __abs__
+    comparisons with Duration and DurationArray, returning boolean arrays
+
+    Methods:
+
+    total_microseconds(), total_seconds()
+    tolist()
+    sum(), mean(), min(), max()
+    percentile()
+    histogram()
+    """
+    __slots__ = '_us',
+
+    def __init__(self, durations=()):
+        """Constructor.
+
+        Arguments:
+
+        durations, an iterable of Duration objects
+        """
+        self._us = np.fromiter((d.total_microseconds() for d in durations),
+                               dtype=np.int64)
+        self._us.flags.writeable = False
+
+    @classmethod
+    def frommicroseconds(cls, microseconds):
+        """Construct a DurationArray from integer microseconds."""
+        microseconds = _check_int_array(microseconds)
+        if microseconds.ndim != 1:
+            raise ValueError('microseconds must be one-dimensional')
+        return cls._from_microseconds_unchecked(
+            microseconds.astype(np.int64))
+
+    @classmethod
+    def _from_microseconds_unchecked(cls, microseconds):
+        self = object.__new__(cls)
+        microseconds.flags.writeable = False
+        self._us = microseconds
+        return self
+
+    # Sequence protocol, see _ArraySequence
+
+    _values = '_us'
+    _item = Duration._from_microseconds
+    _from_values_unchecked = _from_microseconds_unchecked
+
+    def __repr__(self):
+        return 'tider.DurationArray(%s)' % self.tolist()
+
+    # Conversions
+
+    def total_microseconds(self):
+        """Return the microseconds as a read-only int64 array."""
+        return self._us
+
+    def total_seconds(self):
+        """Return the seconds as a float64 array."""
+        return self._us / 1000000
+
+    def tolist(self):
+        """Return the durations as a list of Duration objects."""
+        return list(self)
+
+    # Comparisons
+
+    def __eq__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us == other
+
+    def __ne__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us != other
+
+    def __le__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us <= other
+
+    def __lt__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us < other
+
+    def __ge__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us >= other
+
+    def __gt__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us > other
+
+    __hash__ = None
+
+    # Computations
+
+    def __add__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._from_microseconds_unchecked(self._us + other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._from_microseconds_unchecked(self._us - other)
+
+    def __rsub__(self, other):
+        other = _to_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._from_microseconds_unchecked(other - self._us)
+
+    def __neg__(self):
+        return self._from_microseconds_unchecked(-self._us)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self._from_microseconds_unchecked(np.abs(self._us))
+
+    def __mul__(self, other):
+        if isinstance(other, (Duration, DurationArray)):
+            return NotImplemented
+        other = np.asarray(other)
+        if other.dtype.kind in 'iu':
+            return self._from_microseconds_unchecked(self._us * other)
+        if other.dtype.kind == 'f':
+            # Round half to even, like Duration does.
+            return self._from_microseconds_unchecked(
+                np.rint(self._us * other).astype(np.int64))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        us = _to_microseconds(other)
+        if us is not None:
+            _check_divisor(us)
+            return self._us // us
+        other = np.asarray(other)
+        if other.dtype.kind in 'iu':
+            _check_divisor(other)
+            return self._from_microseconds_unchecked(self._us // other)
+        return NotImplemented
+
+    def __truediv__(self, other):
+        us = _to_microseconds(other)
+        if us is not None:
+            _check_divisor(us)
+            return self._us / us
+        other = np.asarray(other)
+        if other.dtype.kind in 'iuf':
+            _check_divisor(other)
+            return self._from_microseconds_unchecked(
+                np.rint(self._us / other).astype(np.int64))
+        return NotImplemented
+
+    # Reductions
+
+    def _check_not_empty(self, name):
+        if not len(self._us):
+            raise ValueError('%s() of an empty DurationArray' % name)
+
+    def _sum(self):
+        us = self._us
+        if not len(us):
+            return 0
+        # int64 sums wrap around silently, so add Python ints when the
+        # sum could leave the int64 range.
+        if max(-int(us.min()), int(us.max())) * len(us) <= _INT64_MAX:
+            return int(us.sum())
+        return sum(us.tolist())
+
+    def sum(self):
+        """Return the sum of the durations as a Duration."""
+        return Duration._from_microseconds(self._sum())
+
+    def mean(self):
+        """Return the mean of the durations as a Duration.
+
+        The mean is rounded to the nearest microsecond.
+        """
+        self._check_not_empty('mean')
+        # Divide the integer sum, as floats can't hold every microsecond.
+        q, r = divmod(self._sum(), len(self._us))
+        # Round half to even, like Duration does.
+        if 2 * r > len(self._us) or (2 * r == len(self._us) and q % 2):
+            q += 1
+        return Duration._from_microseconds(q)
+
+    def min(self):
+        """Return the shortest duration."""
+        self._check_not_empty('min')
+        return Duration._from_microseconds(int(self._us.min()))
+
+    def max(self):
+        """Return the longest duration."""
+        self._check_not_empty('max')
+        return Duration._from_microseconds(int(self._us.max()))
+
+    def percentile(self, q):
+        """Return the q-th percentile of the durations.
+
+        q is a number from 0 to 100, or a sequence of them, in which case
+        a list of Durations is returned.  The percentiles are interpolated
+        linearly between the closest durations, like numpy.percentile()
+        does, and rounded to the nearest microsecond.
+        """
+        self._check_not_empty('percentile')
+        result = np.rint(np.percentile(self._us, q)).astype(np.int64)
+        if result.ndim:
+            return [Duration._from_microseconds(us)
+                    for us in result.tolist()]
+        return Duration._from_microseconds(int(result))
+
+    def histogram(self, bins):
+        """Count the durations in buckets.
+
+        bins is either a Duration, the width of the buckets, or an
+        increasing sequence of Durations, the edges of the buckets.
+
+        Returns a (counts, edges) tuple, where counts is an int64 array of
+        the number of durations in each bucket, and edges a DurationArray
+        with one more element than counts.
+
+        With a width, the edges are the multiples of it that cover all the
+        durations, and each bucket includes its lower edge but not the
+        upper one.  With edges, the last bucket also includes its upper
+        edge, like numpy.histogram() does, and durations outside of the
+        edges are not counted.
+        """
+        us = self._us
+        if isinstance(bins, Duration):
+            width = bins.total_microseconds()
+            if width <= 0:
+                raise ValueError('the bucket width must be positive')
+            if len(us):
+                first = int(us.min()) // width
+                last = int(us.max()) // width + 1
+            else:
+                first = last = 0
+            # Bucket by integer division, so no float edges are involved.
+            counts = np.bincount(us // width - first, minlength=last - first)
+            edges = np.arange(first, last + 1, dtype=np.int64) * width
+            return (counts.astype(np.int64),
+                    self._from_microseconds_unchecked(edges))
+        edges = _to_microseconds(bins)
+        if edges is None:
+            edges = np.array([_to_microseconds(d) for d in bins],
+                             dtype=np.int64)
+        edges = np.asarray(edges, dtype=np.int64)
+        if len(edges) < 2 or (np.diff(edges) <= 0).any():
+            raise ValueError('bins must be increasing and at least two')
+        index = np.searchsorted(edges, us, side='right') - 1
+        # The last bucket includes its upper edge.
+        index[us == edges[-1]] = len(edges) - 2
+        inside = (index >= 0) & (index < len(edges) - 1)
+        counts = np.bincount(index[inside], minlength=len(edges) - 1)
+        return (counts.astype(np.int64),
+                self._from_microseconds_unchecked(edges.copy()))
@@ -0,0 +1,246 @@
+import math
+
+from .duration import Duration
+
+try:
+    from .durationarray import DurationArray
+except ImportError:  # NumPy is not installed
+    DurationArray = None
+
+
+def _microseconds(duration):
+    if isinstance(duration, Duration):
+        return duration.total_microseconds()
+    if isinstance(duration, int):
+        return duration
+    raise TypeError("a Duration or int is required (got type %s)" %
+                    type(duration).__name__)
+
+
+class DurationStats(object):
+    """Statistics over a stream of Durations, in bounded memory.
+
+    Arguments:
+
+    relative_accuracy, the maximum relative error of the percentiles.
+        The default is 0.01, 1%.
+
+    Durations, or ints of microseconds, are added one at a time with add()
+    or in batches with update().  The count, sum, minimum and maximum are
+    exact.  The percentiles come from a sketch that counts the durations
+    in buckets whose bounds grow exponentially, as in the DDSketch
+    algorithm: bucket i holds the durations from gamma**(i-1) to gamma**i
+    microseconds, where gamma = (1 + relative_accuracy) /
+    (1 - relative_accuracy).  A percentile is then the middle of its
+    bucket, which is within relative_accuracy of the exact percentile,
+    plus half a microsecond of rounding.
+
+    Durations that are negative are counted in buckets of their own, so
+    that bound holds for them as well.  The number of buckets only grows
+    with the logarithm of the range of the durations.  With 1% accuracy,
+    everything from a microsecond to a hundred years fits in about 1800
+    buckets for each sign.
+
+    Statistics that use the same relative_accuracy, for example from
+    different processes, can be combined with merge().  DurationStats can
+    be pickled.
+
+    Methods:
+
+    add(), update(), merge()
+    percentile()
+
+    Properties (readonly):
+    count, sum, min, max, mean, relative_accuracy
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1",
+                             relative_accuracy)
+        self._relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma = gamma
+        self._log_gamma = math.log(gamma)
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+        # Bucket index -> number of durations, for the durations that are
+        # above and below zero, and the number of zero durations.
+        self._positive = {}
+        self._negative = {}
+        self._zero = 0
+
+    # Adding durations
+
+    def add(self, duration):
+        """Add a Duration, or an int of microseconds."""
+        us = _microseconds(duration)
+        self._count += 1
+        self._sum += us
+        if self._min is None or us < self._min:
+            self._min = us
+        if self._max is None or us > self._max:
+            self._max = us
+        if us > 0:
+            buckets = self._positive
+        elif us < 0:
+            buckets = self._negative
+            us = -us
+        else:
+            self._zero += 1
+            return
+        key = math.ceil(math.log(us) / self._log_gamma)
+        buckets[key] = buckets.get(key, 0) + 1
+
+    def update(self, durations):
+        """Add an iterable of Durations or ints of microseconds.
+
+        A DurationArray is added in one go, without creating a Duration
+        for each element.
+        """
+        if DurationArray is not None and isinstance(durations,
+                                                    DurationArray):
+            self._update_array(durations)
+            return
+        add = self.add
+        for duration in durations:
+            add(duration)
+
+    def _update_array(self, array):
+        import numpy as np
+        us = array._us
+        if not len(us):
+            return
+        self._count += len(us)
+        # The int64 sum could wrap around, _sum() doesn't.
+        self._sum += array._sum()
+        low = int(us.min())
+        high = int(us.max())
+        if self._min is None or low < self._min:
+            self._min = low
+        if self._max is None or high > self._max:
+            self._max = high
+        self._zero += int((us == 0).sum())
+        for values, buckets in ((us[us > 0], self._positive),
+                                (-us[us < 0], self._negative)):
+            keys = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+            keys, counts = np.unique(keys, return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                buckets[key] = buckets.get(key, 0) + count
+
+    def merge(self, other):
+        """Add all the durations of another DurationStats to this one."""
+        if not isinstance(other, DurationStats):
+            raise TypeError("a DurationStats is required (got type %s)" %
+                            type(other).__name__)
+        if other._gamma != self._gamma:
+            raise ValueError("can only merge DurationStats with the same"
+                             " relative_accuracy")
+        if not other._count:
+            return
+        self._count += other._count
+        self._sum += other._sum
+        if self._min is None or other._min < self._min:
+            self._min = other._min
+        if self._max is None or other._max > self._max:
+            self._max = other._max
+        self._zero += other._zero
+        for buckets, others in ((self._positive, other._positive),
+                                (self._negative, other._negative)):
+            for key, count in others.items():
+                buckets[key] = buckets.get(key, 0) + count
+
+    # Read-only field accessors
+
+    @property
+    def relative_accuracy(self):
+        """The maximum relative error of the percentiles."""
+        return self._relative_accuracy
+
+    @property
+    def count(self):
+        """The number of durations."""
+        return self._count
+
+    @property
+    def sum(self):
+        """The sum of the durations."""
+        return Duration._from_microseconds(self._sum)
+
+    def _check_not_empty(self):
+        if not self._count:
+            raise ValueError("no durations have been added")
+
+    @property
+    def min(self):
+        """The shortest duration."""
+        self._check_not_empty()
+        return Duration._from_microseconds(self._min)
+
+    @property
+    def max(self):
+        """The longest duration."""
+        self._check_not_empty()
+        return Duration._from_microseconds(self._max)
+
+    @property
+    def mean(self):
+        """The mean of the durations, rounded to the nearest microsecond."""
+        self._check_not_empty()
+        q, r = divmod(self._sum, self._count)
+        # Round half to even, like Duration does.
+        if 2 * r > self._count or (2 * r == self._count and q % 2):
+            q += 1
+        return Duration._from_microseconds(q)
+
+    # Percentiles
+
+    def _value(self, key):
+        # The middle of the bucket, relative to its bounds.
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _percentile(self, q):
+        if not 0 <= q <= 100:
+            raise ValueError("percentile must be in 0..100", q)
+        if q == 0:
+            return Duration._from_microseconds(self._min)
+        if q == 100:
+            return Duration._from_microseconds(self._max)
+        rank = q / 100 * (self._count - 1)
+        # Walk through the buckets from the most negative durations to the
+        # most positive ones, until we get past the rank.
+        seen = 0
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                value = -self._value(key)
+                break
+        else:
+            seen += self._zero
+            if seen > rank:
+                value = 0
+            else:
+                positive = self._positive
+                for key in sorted(positive):
+                    seen += positive[key]
+                    if seen > rank:
+                        value = self._value(key)
+                        break
+                else:
+                    value = self._max
+        # The minimum and maximum are exact, so keep inside of them.
+        us = min(max(round(value), self._min), self._max)
+        return Duration._from_microseconds(us)
+
+    def percentile(self, q):
+        """Return the q-th percentile of the durations, as a Duration.
+
+        q is a number from 0 to 100, or a sequence of them, in which case
+        a list of Durations is returned.
+        """
+        self._check_not_empty()
+        if isinstance(q, (int, float)):
+            return self._percentile(q)
+        return [self._percentile(x) for x in q]
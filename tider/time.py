@@ -1,8 +1,8 @@
-import time as _time  # TODO: Move all things from time into tider
+from array import array as _array
 
 from .duration import Duration
-from ._utils import _check_int_field
-from ._utils import _cmp, _cmperror
+from ._utils import _check_int_field, _strftime
+from ._utils import _parse_isotime, _rows
 
 
 def _check_time_fields(hour, minute, second, microsecond):
@@ -21,6 +21,10 @@ def _check_time_fields(hour, minute, second, microsecond):
     return hour, minute, second, microsecond
 
 
+# The ordinal of January 1st, 1900, the date used by strftime().
+_ORDINAL_1900 = 693596
+
+
 def _format_time(hh, mm, ss, us):
     # Skip trailing microseconds when us==0.
     result = "%02d:%02d:%02d" % (hh, mm, ss)
@@ -29,70 +33,15 @@ def _format_time(hh, mm, ss, us):
     return result
 
 
-# Correctly substitute for %z and %Z escapes in strftime formats.
-# TODO: Make a new strftime that does this correctly
-def _wrap_strftime(object, format, timetuple):
-    # Don't call utcoffset() or tzname() unless actually needed.
-    freplace = None  # the string to use for %f
-    zreplace = None  # the string to use for %z
-    Zreplace = None  # the string to use for %Z
-
-    # Scan format for %z and %Z escapes, replacing as needed.
-    newformat = []
-    push = newformat.append
-    i, n = 0, len(format)
-    while i < n:
-        ch = format[i]
-        i += 1
-        if ch == '%':
-            if i < n:
-                ch = format[i]
-                i += 1
-                if ch == 'f':
-                    if freplace is None:
-                        freplace = '%06d' % getattr(object,
-                                                    'microsecond', 0)
-                    newformat.append(freplace)
-                elif ch == 'z':
-                    if zreplace is None:
-                        zreplace = ""
-                        if hasattr(object, "utcoffset"):
-                            offset = object.utcoffset()
-                            if offset is not None:
-                                sign = '+'
-                                if offset.days < 0:
-                                    offset = -offset
-                                    sign = '-'
-                                h, m = divmod(offset, Duration(hours=1))
-                                fraction = m % Duration(minutes=1)
-                                assert not fraction, "whole minute"
-                                m //= Duration(minutes=1)
-                                zreplace = '%c%02d%02d' % (sign, h, m)
-                    assert '%' not in zreplace
-                    newformat.append(zreplace)
-                elif ch == 'Z':
-                    if Zreplace is None:
-                        Zreplace = ""
-                        if hasattr(object, "tzname"):
-                            s = object.tzname()
-                            if s is not None:
-                                # strftime is going to have at this: escape %
-                                Zreplace = s.replace('%', '%%')
-                    newformat.append(Zreplace)
-                else:
-                    push('%')
-                    push(ch)
-            else:
-                push('%')
-        else:
-            push(ch)
-    newformat = "".join(newformat)
-    return _time.strftime(newformat, timetuple)
-
 class Time(object):
-    """A time object"""
+    """A time object
 
-    __slots__ = ('_hour', '_minute', '_second', '_microsecond', '_hashcode')
+    Internally the Time is stored as the number of microseconds since
+    midnight.  The hour, minute, second and microsecond are calculated from
+    it when needed.
+    """
+
+    __slots__ = '_us', '_hashcode'
 
     def __new__(cls, hour=0, minute=0, second=0, microsecond=0):
         """Constructor.
@@ -110,34 +59,61 @@ class Time(object):
             return self
         hour, minute, second, microsecond = _check_time_fields(
             hour, minute, second, microsecond)
+        return cls._from_fields_unchecked(hour, minute, second, microsecond)
+
+    @classmethod
+    def fromisoformat(cls, time_string):
+        """Construct a Time from a string in the format 'HH:MM[:SS[.ffffff]]'.
+
+        This is the inverse of isoformat().  The fraction of the second can
+        have one to six digits.
+        """
+        if not isinstance(time_string, str):
+            raise TypeError('fromisoformat: argument must be str')
+        return cls._from_microseconds_unchecked(_parse_isotime(time_string))
+
+    @classmethod
+    def _from_fields_unchecked(cls, hour, minute, second, microsecond):
+        """Construct a Time from fields that are known to be valid."""
+        return cls._from_microseconds_unchecked(
+            ((hour * 60 + minute) * 60 + second) * 1000000 + microsecond)
+
+    @classmethod
+    def _from_microseconds_unchecked(cls, us):
+        """Construct a Time from a valid number of microseconds since
+        midnight.
+        """
         self = object.__new__(cls)
-        self._hour = hour
-        self._minute = minute
-        self._second = second
-        self._microsecond = microsecond
+        self._us = us
         self._hashcode = -1
         return self
 
+    def _getfields(self):
+        ss, us = divmod(self._us, 1000000)
+        mm, ss = divmod(ss, 60)
+        hh, mm = divmod(mm, 60)
+        return hh, mm, ss, us
+
     # Read-only field accessors
     @property
     def hour(self):
         """hour (0-23)"""
-        return self._hour
+        return self._us // 3600000000
 
     @property
     def minute(self):
         """minute (0-59)"""
-        return self._minute
+        return self._us // 60000000 % 60
 
     @property
     def second(self):
         """second (0-59)"""
-        return self._second
+        return self._us // 1000000 % 60
 
     @property
     def microsecond(self):
         """microsecond (0-999999)"""
-        return self._microsecond
+        return self._us % 1000000
 
     # Standard conversions, __hash__ (and helpers)
 
@@ -145,60 +121,47 @@ class Time(object):
 
     def __eq__(self, other):
         if isinstance(other, Time):
-            return self._cmp(other, allow_mixed=True) == 0
-        else:
-            return False
+            return self._us == other._us
+        return NotImplemented
 
     def __le__(self, other):
         if isinstance(other, Time):
-            return self._cmp(other) <= 0
-        else:
-            _cmperror(self, other)
+            return self._us <= other._us
+        return NotImplemented
 
     def __lt__(self, other):
         if isinstance(other, Time):
-            return self._cmp(other) < 0
-        else:
-            _cmperror(self, other)
+            return self._us < other._us
+        return NotImplemented
 
     def __ge__(self, other):
         if isinstance(other, Time):
-            return self._cmp(other) >= 0
-        else:
-            _cmperror(self, other)
+            return self._us >= other._us
+        return NotImplemented
 
     def __gt__(self, other):
         if isinstance(other, Time):
-            return self._cmp(other) > 0
-        else:
-            _cmperror(self, other)
-
-    def _cmp(self, other, allow_mixed=False):
-        assert isinstance(other, Time)
-        myoff = otoff = None
-
-        return _cmp((self._hour, self._minute, self._second,
-                     self._microsecond),
-                    (other._hour, other._minute, other._second,
-                     other._microsecond))
+            return self._us > other._us
+        return NotImplemented
 
     def __hash__(self):
         """Hash."""
         if self._hashcode == -1:
-            self._hashcode = hash(self._getstate()[0])
+            self._hashcode = hash(self._us)
         return self._hashcode
 
     def __repr__(self):
         """Convert to formal string, for repr()."""
-        if self._microsecond != 0:
-            s = ", %d, %d" % (self._second, self._microsecond)
-        elif self._second != 0:
-            s = ", %d" % self._second
+        hh, mm, ss, us = self._getfields()
+        if us != 0:
+            s = ", %d, %d" % (ss, us)
+        elif ss != 0:
+            s = ", %d" % ss
         else:
             s = ""
         s = "%s.%s(%d, %d%s)" % (self.__class__.__module__,
                                  self.__class__.__qualname__,
-                                 self._hour, self._minute, s)
+                                 hh, mm, s)
         return s
 
     def isoformat(self):
@@ -207,21 +170,17 @@ class Time(object):
         This is 'HH:MM:SS.mmmmmm+zz:zz', or 'HH:MM:SS+zz:zz' if
         self.microsecond == 0.
         """
-        return _format_time(self._hour, self._minute, self._second,
-                         self._microsecond)
+        return _format_time(*self._getfields())
 
     __str__ = isoformat
 
     def strftime(self, fmt):
-        """Format using strftime().  The date part of the timestamp passed
-        to underlying strftime should not be used.
+        """Format using strftime().  The date part of the result should
+        not be used, it is January 1st, 1900.
         """
-        # The year must be >= 1000 else Python's strftime implementation
-        # can raise a bogus exception.
-        timetuple = (1900, 1, 1,
-                     self._hour, self._minute, self._second,
-                     0, 1, -1)
-        return _wrap_strftime(self, fmt, timetuple)
+        hh, mm, ss, us = self._getfields()
+        return _strftime(fmt, (1900, 1, 1, hh, mm, ss, us, _ORDINAL_1900,
+                               self))
 
     def __format__(self, fmt):
         if not isinstance(fmt, str):
@@ -232,32 +191,85 @@ class Time(object):
 
     def replace(self, hour=None, minute=None, second=None, microsecond=None):
         """Return a new Time with new values for the specified fields."""
+        # Only the new values need checking.
+        hh, mm, ss, us = self._getfields()
         if hour is None:
-            hour = self.hour
+            hour = hh
+        else:
+            hour = _check_int_field(hour)
+            if not 0 <= hour <= 23:
+                raise ValueError('hour must be in 0..23', hour)
         if minute is None:
-            minute = self.minute
+            minute = mm
+        else:
+            minute = _check_int_field(minute)
+            if not 0 <= minute <= 59:
+                raise ValueError('minute must be in 0..59', minute)
         if second is None:
-            second = self.second
+            second = ss
+        else:
+            second = _check_int_field(second)
+            if not 0 <= second <= 59:
+                raise ValueError('second must be in 0..59', second)
         if microsecond is None:
-            microsecond = self.microsecond
-        return Time(hour, minute, second, microsecond)
+            microsecond = us
+        else:
+            microsecond = _check_int_field(microsecond)
+            if not 0 <= microsecond <= 999999:
+                raise ValueError('microsecond must be in 0..999999',
+                                 microsecond)
+        return Time._from_fields_unchecked(hour, minute, second, microsecond)
 
     # Pickle support.
 
     def _getstate(self):
-        us2, us3 = divmod(self._microsecond, 256)
-        us1, us2 = divmod(us2, 256)
-        basestate = bytes([self._hour, self._minute, self._second,
-                           us1, us2, us3])
+        hh, mm, ss, us = self._getfields()
+        basestate = bytes([hh, mm, ss]) + us.to_bytes(3, 'big')
         return (basestate,)
 
     def __setstate(self, string, tzinfo):
-        self._hour, self._minute, self._second, us1, us2, us3 = string
-        self._microsecond = (((us1 << 8) | us2) << 8) | us3
+        hh, mm, ss = string[:3]
+        self._us = (((hh * 60 + mm) * 60 + ss) * 1000000 +
+                    int.from_bytes(string[3:], 'big'))
 
     def __reduce__(self):
         return (Time, self._getstate())
 
+
+def parse_times(data, microseconds=False):
+    """Parse many 'HH:MM[:SS[.ffffff]]' times in one go.
+
+    data is either an iterable of str or bytes, or a str or bytes-like
+    buffer with one time per line.
+
+    Returns a (times, errors) tuple.  Unless microseconds is true, times is
+    a list of Time objects, with None for rows that could not be parsed.
+    If microseconds is true, times is instead an array('q') of the
+    microseconds since midnight, with -1 for the rows that could not be
+    parsed.  errors is a list of (index, exception) tuples for those rows.
+    """
+    errors = []
+    if microseconds:
+        result = _array('q')
+        invalid = -1
+        convert = None
+    else:
+        result = []
+        invalid = None
+        convert = Time._from_microseconds_unchecked
+    append = result.append
+    parse = _parse_isotime
+    for index, row in enumerate(_rows(data)):
+        try:
+            us = parse(row)
+        except (ValueError, TypeError) as e:
+            append(invalid)
+            errors.append((index, e))
+        else:
+            append(us if convert is None else convert(us))
+    return result, errors
+
+
 Time.min = Time(0, 0, 0)
 Time.max = Time(23, 59, 59, 999999)
 Time.resolution = Duration(microseconds=1)
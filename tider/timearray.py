@@ -0,0 +1,213 @@
+import numpy as np
+
+from ._arraybase import _ArraySequence
+from .duration import Duration
+from .durationarray import DurationArray
+from .time import Time
+
+# The number of microseconds in a day.
+_US_PER_DAY = 86400000000
+
+
+class TimeArray(_ArraySequence):
+    """An array of Times, stored as int64 microseconds since midnight.
+
+    A TimeArray does calculations on all the times at once, without
+    creating a Time for each element.  Adding or subtracting durations
+    wraps around midnight, like a clock.
+
+    Constructors:
+
+    __init__()
+    frommicroseconds()
+
+    Operators:
+
+    __len__, __getitem__, __iter__, __repr__
+    __add__, __radd__, __sub__ (with Duration and DurationArray)
+    comparisons with Time and TimeArray, returning boolean arrays
+
+    Methods:
+
+    tomicroseconds()
+    tolist()
+    floor()
+    isoformat()
+
+    Properties (readonly):
+    hour, minute, second, microsecond
+    """
+    __slots__ = '_us',
+
+    def __init__(self, times=()):
+        """Constructor.
+
+        Arguments:
+
+        times, an iterable of Time objects
+        """
+        self._us = np.fromiter((t._us for t in times), dtype=np.int64)
+        self._us.flags.writeable = False
+
+    @classmethod
+    def frommicroseconds(cls, microseconds):
+        """Construct a TimeArray from microseconds since midnight."""
+        microseconds = np.asarray(microseconds)
+        if microseconds.ndim != 1:
+            raise ValueError('microseconds must be one-dimensional')
+        if microseconds.size and microseconds.dtype.kind not in 'iu':
+            raise TypeError('int expected')
+        if microseconds.size and (microseconds.min() < 0 or
+                                  microseconds.max() >= _US_PER_DAY):
+            raise ValueError('microseconds must be in 0..%d' %
+                             (_US_PER_DAY - 1))
+        return cls._from_microseconds_unchecked(
+            microseconds.astype(np.int64))
+
+    @classmethod
+    def _from_microseconds_unchecked(cls, microseconds):
+        self = object.__new__(cls)
+        microseconds.flags.writeable = False
+        self._us = microseconds
+        return self
+
+    # Sequence protocol, see _ArraySequence
+
+    _values = '_us'
+    _item = Time._from_microseconds_unchecked
+    _from_values_unchecked = _from_microseconds_unchecked
+
+    def __repr__(self):
+        return 'tider.TimeArray(%s)' % self.isoformat().tolist()
+
+    # Conversions
+
+    def tomicroseconds(self):
+        """Return the microseconds since midnight as a read-only array."""
+        return self._us
+
+    def tolist(self):
+        """Return the times as a list of Time objects."""
+        return list(self)
+
+    def isoformat(self):
+        """Return the times formatted according to ISO, as a str array.
+
+        This is 'HH:MM:SS.mmmmmm', or 'HH:MM:SS' if the microsecond is 0,
+        like Time.isoformat().
+        """
+        if not len(self._us):
+            return np.array([], dtype='U15')
+        # datetime64 formats the time of day on January 1st, 1970, and the
+        # date part is then cut off.
+        times = self._us.astype('datetime64[us]')
+        result = np.char.partition(np.datetime_as_string(times), 'T')[:, 2]
+        whole = self._us % 1000000 == 0
+        if whole.any():
+            seconds = np.datetime_as_string(times[whole], unit='s')
+            result[whole] = np.char.partition(seconds, 'T')[:, 2]
+        return result
+
+    # Read-only field accessors
+
+    @property
+    def hour(self):
+        """hour (0-23)"""
+        return self._us // 3600000000
+
+    @property
+    def minute(self):
+        """minute (0-59)"""
+        return self._us // 60000000 % 60
+
+    @property
+    def second(self):
+        """second (0-59)"""
+        return self._us // 1000000 % 60
+
+    @property
+    def microsecond(self):
+        """microsecond (0-999999)"""
+        return self._us % 1000000
+
+    def floor(self, interval):
+        """Round the times down to a multiple of interval since midnight.
+
+        interval is a positive Duration of at most one day.  This puts
+        the times in buckets, for example floor(Duration(minutes=15))
+        gives the start of each time's quarter of an hour.
+        """
+        if not isinstance(interval, Duration):
+            raise TypeError('interval must be a Duration')
+        interval = interval.total_microseconds()
+        if not 0 < interval <= _US_PER_DAY:
+            raise ValueError('interval must be positive and at most a day')
+        return self._from_microseconds_unchecked(
+            self._us - self._us % interval)
+
+    # Comparisons
+
+    def _other_microseconds(self, other):
+        if isinstance(other, TimeArray):
+            return other._us
+        if isinstance(other, Time):
+            return other._us
+        return None
+
+    def __eq__(self, other):
+        other = self._other_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us == other
+
+    def __ne__(self, other):
+        other = self._other_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us != other
+
+    def __le__(self, other):
+        other = self._other_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us <= other
+
+    def __lt__(self, other):
+        other = self._other_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us < other
+
+    def __ge__(self, other):
+        other = self._other_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us >= other
+
+    def __gt__(self, other):
+        other = self._other_microseconds(other)
+        if other is None:
+            return NotImplemented
+        return self._us > other
+
+    __hash__ = None
+
+    # Computations
+
+    def _shift(self, other, sign):
+        if not isinstance(other, (Duration, DurationArray)):
+            return NotImplemented
+        us = other.total_microseconds() % _US_PER_DAY
+        # Both are in 0..86399999999, so this can't overflow.
+        return self._from_microseconds_unchecked(
+            (self._us + sign * us) % _US_PER_DAY)
+
+    def __add__(self, other):
+        "Add a Duration to all the times, wrapping around midnight."
+        return self._shift(other, 1)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        "Subtract a Duration from all the times, wrapping around midnight."
+        return self._shift(other, -1)
@@ -1,25 +1,119 @@
+import os as _os
+import pickle as _pickle
+import re as _re
+import threading as _threading
+import time as _time
+from array import array as _array
+from bisect import bisect_right as _bisect_right
+from collections import namedtuple as _namedtuple, OrderedDict as _OrderedDict
+
 from .duration import Duration
 from .datetime import Datetime
+from ._tzif import _load_tzif, _parse_posix_tz, _posix_transitions
+from ._utils import _ord2ymd, _EPOCH_ORDINAL, _MAXORDINAL
+
+# The directories that are searched for compiled TZif files.
+TZPATH = ('/usr/share/zoneinfo', '/usr/lib/zoneinfo',
+          '/usr/share/lib/zoneinfo', '/etc/zoneinfo')
+
+# The largest offset, 23:59, in microseconds.
+_MAX_OFFSET = (23 * 60 + 59) * 60000000
+
+# Before and after all supported times, in seconds since the epoch.
+_MIN_SECONDS = -2 ** 63
+_MAX_SECONDS = 2 ** 63
+
+# '+HH:MM', '+HHMM', '+HH' or 'Z'.
+_ISOOFFSET = _re.compile(r'([-+])([01]\d|2[0-3])(?::?([0-5]\d))?\Z|Z\Z',
+                         _re.ASCII).match
 
 
 class FixedTimezone(object):
+    """A timezone with a fixed offset from UTC.
+
+    FixedTimezone.from_offset() and FixedTimezone.fromisoformat() return
+    shared instances, so use them when creating many timezones with the
+    same offsets.
+    """
 
     def __init__(self, offset, name=None):
         if not isinstance(offset, Duration):
             raise TypeError("offset must be a Duration")
         elif name is not None and not isinstance(name, str):
             raise TypeError("name must be a string or None")
-        if not self._minoffset <= offset <= self._maxoffset:
+        us = offset.total_microseconds()
+        if not -_MAX_OFFSET <= us <= _MAX_OFFSET:
             raise ValueError("offset must be a Duration"
                              " strictly between -Duration(hours=24) and"
                              " Duration(hours=24).")
-        if (offset.microseconds != 0 or
-            offset.seconds % 60 != 0):
+        if us % 60000000 != 0:
             raise ValueError("offset must be a Duration"
                              " representing a whole number of minutes")
 
         self._offset = offset
         self._name = name
+        # The name is what tzname() returns, so it's only made once.
+        if name is None:
+            name = self._name_from_offset(offset)
+        self._tzname = name
+
+    # Shared instances, by (class, offset in microseconds) for unnamed
+    # offsets, by (class, offset in microseconds, name) for the last
+    # _maxnamed named ones, and by (class, string) for the strings parsed
+    # by fromisoformat().  Offsets are whole minutes within a day and only
+    # valid strings are kept, so only the named ones have to be limited.
+    _instances = {}
+    _named = {}
+    _maxnamed = 256
+    _parsed = {}
+
+    @classmethod
+    def from_offset(cls, offset, name=None):
+        """Return the shared FixedTimezone with this offset and name.
+
+        This takes the same arguments as the constructor, but the
+        instance is only created and validated the first time.  Named
+        timezones are only shared while they are among the most recently
+        created ones.
+        """
+        if isinstance(offset, Duration):
+            if name is None:
+                instances = cls._instances
+                key = (cls, offset.total_microseconds())
+            else:
+                instances = cls._named
+                key = (cls, offset.total_microseconds(), name)
+            tz = instances.get(key)
+            if tz is not None:
+                return tz
+        tz = cls(offset, name)
+        if name is not None and len(instances) >= cls._maxnamed:
+            instances.pop(next(iter(instances), None), None)
+        return instances.setdefault(key, tz)
+
+    @classmethod
+    def fromisoformat(cls, offset_string):
+        """Return the shared FixedTimezone for an ISO 8601 UTC offset.
+
+        The offset is '+HH:MM', '+HHMM', '+HH', or 'Z' for UTC.  The
+        offsets have no names, so tzname() is 'UTC+HH:MM'.
+        """
+        if not isinstance(offset_string, str):
+            raise TypeError('fromisoformat: argument must be str')
+        key = (cls, offset_string)
+        tz = cls._parsed.get(key)
+        if tz is not None:
+            return tz
+        match = _ISOOFFSET(offset_string)
+        if match is None:
+            raise ValueError('Invalid isoformat string: %r' %
+                             (offset_string,))
+        sign, hours, minutes = match.groups()
+        us = (int(hours or 0) * 60 + int(minutes or 0)) * 60000000
+        if sign == '-':
+            us = -us
+        tz = cls.from_offset(Duration._from_microseconds(us))
+        return cls._parsed.setdefault(key, tz)
 
     def __getinitargs__(self):
         """pickle support"""
@@ -64,9 +158,7 @@ class FixedTimezone(object):
 
     def tzname(self, dt):
         if isinstance(dt, Datetime) or dt is None:
-            if self._name is None:
-                return self._name_from_offset(self._offset)
-            return self._name
+            return self._tzname
         raise TypeError("tzname() argument must be a Datetime instance"
                         " or None")
 
@@ -90,16 +182,427 @@ class FixedTimezone(object):
 
     @staticmethod
     def _name_from_offset(delta):
-        if delta < Duration(0):
+        minutes = delta.total_microseconds() // 60000000
+        if minutes < 0:
             sign = '-'
-            delta = -delta
+            minutes = -minutes
         else:
             sign = '+'
-        hours, rest = divmod(delta, Duration(hours=1))
-        minutes = rest // Duration(minutes=1)
+        hours, minutes = divmod(minutes, 60)
         return 'UTC{}{:02d}:{:02d}'.format(sign, hours, minutes)
 
 
-FixedTimezone.utc = FixedTimezone(Duration(0))
-FixedTimezone.min = FixedTimezone(FixedTimezone._minoffset)
-FixedTimezone.max = FixedTimezone(FixedTimezone._maxoffset)
+FixedTimezone.utc = FixedTimezone.from_offset(Duration(0))
+FixedTimezone.min = FixedTimezone.from_offset(FixedTimezone._minoffset)
+FixedTimezone.max = FixedTimezone.from_offset(FixedTimezone._maxoffset)
+
+
+def _wall_seconds(dt):
+    """The wall time of a Datetime -> seconds since the epoch."""
+    return dt._wall_microseconds() // 1000000
+
+
+def _year(seconds):
+    """Seconds since the epoch -> the year, clamped to the supported ones."""
+    ordinal = seconds // 86400 + _EPOCH_ORDINAL
+    return _ord2ymd(min(max(ordinal, 1), _MAXORDINAL))[0]
+
+
+def _find_tzfile(key):
+    if (not key or key.startswith(('/', '..')) or '\0' in key or
+            _os.path.normpath(key) != key):
+        raise ValueError('invalid timezone key: %r' % (key,))
+    for directory in TZPATH:
+        path = _os.path.join(directory, key)
+        if _os.path.isfile(path):
+            return path
+    raise ValueError('unknown timezone: %r' % (key,))
+
+
+class _RuleTimezone(object):
+    """The tzinfo protocol for timezones with a _find_utc() and a
+    _find_wall() that look up the ttinfo for a time.
+
+    A ttinfo is a (utoff, utcoffset(), dst(), tzname()) tuple, where utoff
+    is the offset in seconds.  A Datetime in this timezone is looked up by
+    its instant, and other Datetimes by their wall time.  Wall times that
+    are ambiguous or don't exist, because the clocks are set back or
+    forward, get the offset that was used before the transition.
+    """
+
+    def _find(self, dt):
+        if dt._tzinfo is self:
+            return self._find_utc(dt._us // 1000000)
+        return self._find_wall(_wall_seconds(dt))
+
+    def utcoffset(self, dt):
+        if dt is None:
+            return None
+        if isinstance(dt, Datetime):
+            return self._find(dt)[1]
+        raise TypeError("utcoffset() argument must be a Datetime instance"
+                        " or None")
+
+    def tzname(self, dt):
+        if dt is None:
+            return None
+        if isinstance(dt, Datetime):
+            return self._find(dt)[3]
+        raise TypeError("tzname() argument must be a Datetime instance"
+                        " or None")
+
+    def dst(self, dt):
+        if dt is None:
+            return None
+        if isinstance(dt, Datetime):
+            return self._find(dt)[2]
+        raise TypeError("dst() argument must be a Datetime instance"
+                        " or None")
+
+    def fromutc(self, dt):
+        if isinstance(dt, Datetime):
+            if dt.tzinfo is not self:
+                raise ValueError("fromutc: dt.tzinfo "
+                                 "is not self")
+            # The wall time of dt is the UTC time.
+            return Datetime._from_microseconds(dt._wall_microseconds(), self)
+        raise TypeError("fromutc() argument must be a Datetime instance"
+                        " or None")
+
+
+class ZoneInfoTimezone(_RuleTimezone):
+    """A timezone from the IANA timezone database.
+
+    ZoneInfoTimezone(key) reads the compiled TZif file for the key, for
+    example 'Europe/Stockholm', from the first directory in TZPATH that
+    has it.  ZoneInfoTimezone.from_file() reads it from a file object.
+
+    The transitions between the zone's offsets are kept in sorted arrays,
+    both as UTC and as wall time, and are looked up with bisect.  Times
+    after the last transition use the POSIX TZ string at the end of the
+    file, which gives the rules for daylight saving time, as a
+    PosixTimezone.
+    """
+
+    def __init__(self, key):
+        if not isinstance(key, str):
+            raise TypeError("key must be a string")
+        with open(_find_tzfile(key), 'rb') as f:
+            self._load(key, f.read())
+
+    @classmethod
+    def from_file(cls, fileobj, key=None):
+        """Construct a ZoneInfoTimezone from a TZif file object."""
+        self = object.__new__(cls)
+        self._load(key, fileobj.read())
+        return self
+
+    def _load(self, key, data):
+        transitions, types, ttinfos, footer = _load_tzif(data)
+        self._key = key
+
+        # TZif files don't say how large the daylight saving time
+        # adjustment is, so it is worked out for each type from the first
+        # transition to it that is next to a transition to standard time.
+        dstoffs = [0] * len(ttinfos)
+        for i in range(1, len(types)):
+            index = types[i]
+            utoff, isdst, abbr = ttinfos[index]
+            if not isdst or dstoffs[index]:
+                continue
+            # The transition before, or else the one after.
+            for j in (i - 1, i + 1):
+                if j < len(types):
+                    other, otherdst, abbr = ttinfos[types[j]]
+                    if not otherdst and other != utoff:
+                        dstoffs[index] = utoff - other
+                        break
+        # The ttinfos are (utoff, utcoffset(), dst(), tzname()).
+        self._ttinfos = tuple(
+            (utoff, Duration(0, utoff),
+             Duration(0, (dstoffs[i] or 3600) if isdst else 0), abbr)
+            for i, (utoff, isdst, abbr) in enumerate(ttinfos))
+        # RFC 8536 says that type 0 is used before the first transition.
+        self._ttinfo_before = self._ttinfos[0]
+
+        self._trans_utc = transitions
+        self._trans_types = types
+        # A wall time is before a transition if it is before the transition
+        # in both the old and the new offset.
+        wall = _array('q')
+        before = self._ttinfo_before[0]
+        for t, i in zip(transitions, types):
+            after = self._ttinfos[i][0]
+            wall.append(t + max(before, after))
+            before = after
+        self._trans_wall = wall
+
+        self._rule = None
+        if types:
+            self._ttinfo_after = self._ttinfos[types[-1]]
+        else:
+            self._ttinfo_after = self._ttinfo_before
+        if footer:
+            self._rule = PosixTimezone(footer)
+
+    # Lookups, where seconds are since the epoch.
+
+    def _find_utc(self, seconds):
+        """Return the ttinfo for a UTC time."""
+        trans = self._trans_utc
+        if trans and seconds < trans[-1]:
+            index = _bisect_right(trans, seconds)
+            if index:
+                return self._ttinfos[self._trans_types[index - 1]]
+            return self._ttinfo_before
+        if self._rule is None:
+            return self._ttinfo_after
+        return self._rule._find_utc(seconds)
+
+    def _find_wall(self, seconds):
+        """Return the ttinfo for a wall time."""
+        trans = self._trans_wall
+        if trans and seconds < trans[-1]:
+            index = _bisect_right(trans, seconds)
+            if index:
+                return self._ttinfos[self._trans_types[index - 1]]
+            return self._ttinfo_before
+        if self._rule is None:
+            return self._ttinfo_after
+        return self._rule._find_wall(seconds)
+
+    @property
+    def key(self):
+        """The key of the zone, like 'Europe/Stockholm'."""
+        return self._key
+
+    def __repr__(self):
+        return "tider.ZoneInfoTimezone(%r)" % (self._key,)
+
+    def __str__(self):
+        return str(self._key)
+
+    def __reduce__(self):
+        if self._key is None:
+            # Like zoneinfo, as the file can't be read again by key.
+            raise _pickle.PicklingError(
+                "Cannot pickle a ZoneInfoTimezone without a key")
+        if self.__class__ is ZoneInfoTimezone:
+            # Unpickle to the shared instance.
+            return (_get_zone, (self._key,))
+        return (self.__class__, (self._key,))
+
+
+class PosixTimezone(_RuleTimezone):
+    """A timezone from a POSIX TZ string, like 'EST5EDT,M3.2.0,M11.1.0'.
+
+    The TZ string gives the standard time and, optionally, the daylight
+    saving time and the rules for when it starts and ends, with the
+    extensions from RFC 8536.  The TZ strings without rules, which use
+    implementation defined defaults, are not supported.
+
+    The instants when daylight saving time starts and ends are worked out
+    once for each year and then remembered.  The period between the two
+    transitions around the last time that was looked up is remembered as
+    well, so finding the offset of a time near it is two comparisons.
+    """
+
+    def __init__(self, tzstring):
+        if not isinstance(tzstring, str):
+            raise TypeError("tzstring must be a string")
+        (std_abbr, std_offset, dst_abbr, dst_offset,
+         start, end) = _parse_posix_tz(tzstring)
+        self._tzstring = tzstring
+        self._std = (std_offset, Duration(0, std_offset), Duration(0),
+                     std_abbr)
+        self._dst = None
+        if dst_abbr is not None:
+            self._dst = (dst_offset, Duration(0, dst_offset),
+                         Duration(0, dst_offset - std_offset), dst_abbr)
+            self._start = start
+            self._end = end
+        # Year -> (start, end), in seconds since the epoch, both in UTC
+        # and as wall times.  There are at most 9999 years.
+        self._years = {}
+        # The (first, end, ttinfo) of the period between two transitions
+        # that was found last, in UTC and in wall time.
+        self._last_utc = self._last_wall = (0, 0, None)
+
+    def _transitions(self, year):
+        """Return when daylight saving time starts and ends in a year."""
+        try:
+            return self._years[year]
+        except KeyError:
+            pass
+        std = self._std[0]
+        dst = self._dst[0]
+        start, end = _posix_transitions(std, dst, self._start, self._end,
+                                        year)
+        # A wall time is before a transition if it is before the transition
+        # in both the old and the new offset.
+        shift = max(std, dst)
+        result = self._years[year] = (start, end, start + shift, end + shift)
+        return result
+
+    def _period(self, seconds, year, index):
+        """Return the (first, end, ttinfo) of the period between two
+        transitions that seconds is in.
+
+        index is 0 for UTC and 2 for wall times.
+        """
+        start, end = self._transitions(year)[index:index + 2]
+        std = self._std
+        dst = self._dst
+        if start < end:
+            if seconds < start:
+                first = (self._transitions(year - 1)[index + 1]
+                         if year > 1 else _MIN_SECONDS)
+                return (first, start, std)
+            if seconds < end:
+                return (start, end, dst)
+            last = (self._transitions(year + 1)[index]
+                    if year < 9999 else _MAX_SECONDS)
+            return (end, last, std)
+        # Daylight saving time over new year, as in the southern hemisphere.
+        if seconds < end:
+            first = (self._transitions(year - 1)[index]
+                     if year > 1 else _MIN_SECONDS)
+            return (first, end, dst)
+        if seconds < start:
+            return (end, start, std)
+        last = (self._transitions(year + 1)[index + 1]
+                if year < 9999 else _MAX_SECONDS)
+        return (start, last, dst)
+
+    # Lookups, where seconds are since the epoch.
+
+    def _find_utc(self, seconds):
+        """Return the ttinfo for a UTC time."""
+        first, end, ttinfo = self._last_utc
+        if first <= seconds < end:
+            return ttinfo
+        if self._dst is None:
+            return self._std
+        period = self._period(seconds, _year(seconds + self._std[0]), 0)
+        self._last_utc = period
+        return period[2]
+
+    def _find_wall(self, seconds):
+        """Return the ttinfo for a wall time."""
+        first, end, ttinfo = self._last_wall
+        if first <= seconds < end:
+            return ttinfo
+        if self._dst is None:
+            return self._std
+        period = self._period(seconds, _year(seconds), 2)
+        self._last_wall = period
+        return period[2]
+
+    def __repr__(self):
+        return "tider.PosixTimezone(%r)" % (self._tzstring,)
+
+    def __str__(self):
+        return self._tzstring
+
+    def __reduce__(self):
+        return (self.__class__, (self._tzstring,))
+
+
+# The registry of shared timezones.
+
+CacheInfo = _namedtuple('CacheInfo', 'hits misses maxsize currsize loadtime')
+
+
+class _TimezoneCache(object):
+    """A LRU cache of ZoneInfoTimezones, keyed by key.
+
+    The cache is shared by all threads.  Zones are loaded without holding
+    the lock, so loading one zone doesn't hold up lookups of others; when
+    threads load the same zone at once, the first one loaded is kept and
+    returned to all of them.  loadtime is the total time spent loading
+    zones, in seconds.
+    """
+
+    def __init__(self):
+        self.maxsize = 128
+        self.hits = 0
+        self.misses = 0
+        self.loadtime = 0.0
+        self.zones = _OrderedDict()
+        self.lock = _threading.Lock()
+
+    def get(self, key):
+        zones = self.zones
+        with self.lock:
+            tz = zones.get(key)
+            if tz is not None:
+                self.hits += 1
+                zones.move_to_end(key)
+                return tz
+            self.misses += 1
+        start = _time.perf_counter()
+        try:
+            tz = ZoneInfoTimezone(key)
+        finally:
+            elapsed = _time.perf_counter() - start
+            with self.lock:
+                self.loadtime += elapsed
+        with self.lock:
+            if not self.maxsize:
+                return tz
+            # Another thread may have loaded the zone in the meantime.
+            tz = zones.setdefault(key, tz)
+            zones.move_to_end(key)
+            if len(zones) > self.maxsize:
+                zones.popitem(last=False)
+            return tz
+
+
+_cache = _TimezoneCache()
+
+
+def _get_zone(key):
+    return _cache.get(key)
+
+
+def get(key):
+    """Return the shared timezone for a key, like 'Europe/Stockholm'.
+
+    The zone is loaded the first time, and then kept in a cache of the
+    most recently used zones, see set_cache_size().  'UTC' always returns
+    FixedTimezone.utc, without using the cache.
+    """
+    if key == 'UTC':
+        return FixedTimezone.utc
+    return _get_zone(key)
+
+
+def set_cache_size(maxsize):
+    """Set the number of zones to keep in the timezone cache.
+
+    The default is 128, and setting maxsize to 0 disables the cache.
+    """
+    if not isinstance(maxsize, int):
+        raise TypeError('int expected')
+    if maxsize < 0:
+        raise ValueError('maxsize must be 0 or more', maxsize)
+    with _cache.lock:
+        _cache.maxsize = maxsize
+        zones = _cache.zones
+        while len(zones) > maxsize:
+            zones.popitem(last=False)
+
+
+def cache_info():
+    """Return the statistics of the timezone cache as a CacheInfo tuple."""
+    with _cache.lock:
+        return CacheInfo(_cache.hits, _cache.misses, _cache.maxsize,
+                         len(_cache.zones), _cache.loadtime)
+
+
+def cache_clear():
+    """Empty the timezone cache and reset its statistics."""
+    with _cache.lock:
+        _cache.zones.clear()
+        _cache.hits = _cache.misses = 0
+        _cache.loadtime = 0.0